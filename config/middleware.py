@@ -1,11 +1,24 @@
-"""Middleware to ensure active membership."""
+"""Project middleware."""
+
+import json
+import logging
+import random
+import time
+from collections import Counter
 
 # Django
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
 from django.shortcuts import redirect
 from django.urls import reverse
 
+logger = logging.getLogger(__name__)
+
 
 class MembershipMiddleware:
+    """Middleware to ensure active membership."""
+
     def __init__(self, get_response):
         self.get_response = get_response
 
@@ -24,3 +37,85 @@ class MembershipMiddleware:
                         return redirect("users:pending")
         response = self.get_response(request)
         return response
+
+
+class QueryProfile:
+    """Database execute wrapper that counts and times every query."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            # SQL comes with placeholders, so N+1 lookups share one entry
+            self.statements[sql] += 1
+
+
+class QueryProfilingMiddleware:
+    """Profile the SQL of a sample of the API requests.
+
+    Enabled with ``QUERY_PROFILING_ENABLED``. Profiled requests get a
+    ``Server-Timing`` header and one JSON log line with the view name,
+    query count, DB time and the statements repeated more than
+    ``QUERY_PROFILING_MAX_REPEATS`` times. Profiles over a threshold are
+    logged as warnings.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (
+            not request.path.startswith(settings.QUERY_PROFILING_PATH_PREFIX)
+            or random.random() >= settings.QUERY_PROFILING_SAMPLE_RATE
+        ):
+            return self.get_response(request)
+
+        profile = QueryProfile()
+        started = time.perf_counter()
+        with connection.execute_wrapper(profile):
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = profile.duration * 1000
+
+        if settings.QUERY_PROFILING_SERVER_TIMING:
+            response["Server-Timing"] = (
+                f'db;dur={db_ms:.1f};desc="{profile.count} queries", '
+                f"total;dur={total_ms:.1f}"
+            )
+
+        repeated = [
+            {"sql": sql[:300], "count": count}
+            for sql, count in profile.statements.most_common()
+            if count > settings.QUERY_PROFILING_MAX_REPEATS
+        ]
+        match = request.resolver_match
+        record = {
+            "view": match.view_name if match else None,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": profile.count,
+            "db_ms": round(db_ms, 1),
+            "total_ms": round(total_ms, 1),
+            "repeated": repeated,
+        }
+        slow = (
+            repeated
+            or profile.count > settings.QUERY_PROFILING_MAX_QUERIES
+            or db_ms > settings.QUERY_PROFILING_MAX_DB_MS
+        )
+        logger.log(
+            logging.WARNING if slow else logging.INFO,
+            f"api_profile {json.dumps(record, sort_keys=True)}",
+        )
+        return response
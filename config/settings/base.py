@@ -119,6 +119,7 @@ AUTH_PASSWORD_VALIDATORS = [
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "config.middleware.QueryProfilingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -319,6 +320,36 @@ MESSAGE_TAGS = {
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Query profiling
+# ------------------------------------------------------------------------------
+# SQL profiling of API requests, see config.middleware.QueryProfilingMiddleware
+QUERY_PROFILING_ENABLED = env.bool("QUERY_PROFILING_ENABLED", default=False)
+QUERY_PROFILING_PATH_PREFIX = "/api/v1/"
+# Share of requests profiled, from 0 to 1
+QUERY_PROFILING_SAMPLE_RATE = env.float("QUERY_PROFILING_SAMPLE_RATE", default=0.05)
+# Profiles over any threshold are logged as warnings
+QUERY_PROFILING_MAX_QUERIES = env.int("QUERY_PROFILING_MAX_QUERIES", default=20)
+QUERY_PROFILING_MAX_DB_MS = env.int("QUERY_PROFILING_MAX_DB_MS", default=200)
+# Times the same SQL may run in one request before it is reported as N+1
+QUERY_PROFILING_MAX_REPEATS = env.int("QUERY_PROFILING_MAX_REPEATS", default=5)
+# Add a Server-Timing header to the profiled responses
+QUERY_PROFILING_SERVER_TIMING = env.bool("QUERY_PROFILING_SERVER_TIMING", default=True)
+
+# Notification retention
+# ------------------------------------------------------------------------------
+# Days notifications are kept per type, see neural.services.retention
+NOTIFICATION_RETENTION_DAYS = {
+    "default": env.int("NOTIFICATION_RETENTION_DAYS", default=180),
+    "training_reminder": 30,
+    "promotion": 60,
+    "community": 60,
+}
+# Days the Expo request and response payloads are kept
+NOTIFICATION_LOG_RETENTION_DAYS = env.int("NOTIFICATION_LOG_RETENTION_DAYS", default=30)
+NOTIFICATION_RETENTION_BATCH_SIZE = 1000
+# Save the purged rows as JSONL.gz files on the media storage before deleting
+NOTIFICATION_RETENTION_EXPORT = env.bool("NOTIFICATION_RETENTION_EXPORT", default=False)
+
 # BOLD
 BOLD_KEY = env("BOLD_KEY", default="mA6B-yZMWWEjM5Y5UJxiUz5vMx4MIBkORAh3_zk0o_k")
 BOLD_SECRET = env("BOLD_SECRET", default="B24ZRXiazgcgsr2T_30fKQ")
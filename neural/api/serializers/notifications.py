@@ -81,6 +81,14 @@ class SendNotificationSerializer(serializers.Serializer):
     )
     data = serializers.JSONField(required=False, default=dict)
     send_to_all = serializers.BooleanField(default=False, help_text="Send to all users")
+    scheduled_for = serializers.DateTimeField(
+        required=False, allow_null=True, help_text="Send later, at this time"
+    )
+
+    def validate_scheduled_for(self, value):
+        if value and value <= timezone.now():
+            raise serializers.ValidationError("La fecha programada debe ser futura")
+        return value
 
 
 class NotificationCountSerializer(serializers.Serializer):
@@ -55,6 +55,9 @@ class CalendarDaySerializer(serializers.Serializer):
     date = serializers.DateField()
     day_name = serializers.CharField()
     has_slots = serializers.BooleanField()
+    total_places = serializers.IntegerField()
+    available_places = serializers.IntegerField()
+    almost_full = serializers.BooleanField()
 
 
 class UserTrainingSerializer(serializers.ModelSerializer):
@@ -0,0 +1,409 @@
+"""API performance suite - Query counts and latency of the API v1 views.
+
+Seeds a realistic dataset once, calls each view through the DRF request
+factory and compares status, query counts, queued Celery tasks and p50/p95
+timings with the stored baseline. The dataset is rolled back after the
+last case and tasks are counted instead of sent, so the suite needs no
+external service and runs on SQLite or a local Postgres.
+
+Run with: pytest --benchmark [--update-baseline] neural/api/tests/test_performance.py
+"""
+
+import json
+import math
+import random
+import statistics
+import time
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from celery import Task
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from neural.api.views.community import FeedView
+from neural.api.views.dashboard import DashboardView
+from neural.api.views.notifications import NotificationCountView, NotificationListView
+from neural.api.views.training import (
+    BookView,
+    CalendarView,
+    CancelView,
+    MyTrainingsView,
+    SlotsView,
+)
+from neural.api.views.year_review import YearReviewView
+from neural.community.models import Comment, Post, Reaction
+from neural.services.booking import BookingService
+from neural.services.ranking import RankingService
+from neural.services.schedule import ScheduleService
+from neural.services.stats import StatsService
+from neural.services.year_review import YearReviewService
+from neural.training.models import Classes, Slot, TrainingType, UserTraining
+from neural.users.models import NotificationCounter, PushNotification, User
+
+pytestmark = pytest.mark.benchmark
+
+BASELINE = Path(__file__).parent / "benchmark_baseline.json"
+USERS = 2000
+POSTS = 3000
+# Timed calls per view
+ITERATIONS = 20
+# Allowed p95 slowdown over the baseline, 1.0 is twice as slow
+TOLERANCE = 1.0
+# Timing regressions below this are noise
+MIN_REGRESSION_MS = 10.0
+SEED_BATCH_SIZE = 2000
+
+
+def seed(rng):
+    """Create users, a year of bookings, posts and notifications."""
+    now = timezone.now()
+    today = timezone.localdate()
+
+    users = User.objects.bulk_create(
+        [
+            User(
+                email=f"benchmark{i}@neural.test",
+                username=f"benchmark{i}",
+                phone_number=f"+99{i:09d}",
+                first_name="Benchmark",
+                last_name=str(i),
+                password="!",
+                is_verified=True,
+                is_client=True,
+            )
+            for i in range(USERS)
+        ],
+        batch_size=SEED_BATCH_SIZE,
+    )
+    user = users[0]
+
+    training_types = TrainingType.objects.bulk_create(
+        [
+            TrainingType(name=name, slug_name=f"benchmark-{name}", max_places=60)
+            for name in ["funcional", "crossfit", "yoga", "hiit"]
+        ]
+    )
+    hours = [("06:00", "07:00"), ("12:00", "13:00"), ("18:00", "19:00")]
+    classes = Classes.objects.bulk_create(
+        [
+            Classes(
+                day=day,
+                training_type=training_type,
+                hour_init=hour_init,
+                hour_end=hour_end,
+            )
+            for training_type in training_types
+            for day in ScheduleService.WEEKDAYS[:6]
+            for hour_init, hour_end in hours
+        ]
+    )
+    # A year of past slots, which the materializer never creates
+    days = [today + timedelta(days=offset) for offset in range(-365, 0)]
+    Slot.objects.bulk_create(
+        [
+            Slot(date=day, class_training=session, max_places=session.capacity)
+            for day in days
+            for session in classes
+            if session.day == ScheduleService.WEEKDAYS[day.weekday()]
+        ],
+        batch_size=SEED_BATCH_SIZE,
+    )
+    ScheduleService.materialize(days=14)
+
+    slots_by_week = {}
+    for slot_id, day in Slot.objects.filter(
+        class_training__training_type__in=training_types
+    ).values_list("id", "date"):
+        slots_by_week.setdefault(StatsService.week_of(day), []).append((slot_id, day))
+
+    # About two trainings a week per user, the first user trains more
+    trainings = []
+    for member in users:
+        per_week = 4 if member is user else rng.randint(0, 3)
+        for week_slots in slots_by_week.values():
+            for slot_id, day in rng.sample(week_slots, min(per_week, len(week_slots))):
+                status = (
+                    UserTraining.Status.DONE
+                    if day < today
+                    else UserTraining.Status.CONFIRMED
+                )
+                trainings.append(
+                    UserTraining(
+                        user=member,
+                        slot_id=slot_id,
+                        status=status,
+                        created=now,
+                        modified=now,
+                    )
+                )
+    UserTraining.objects.bulk_create(trainings, batch_size=SEED_BATCH_SIZE)
+    BookingService.reconcile_confirmed_counts(Slot.objects.filter(date__gte=today))
+
+    StatsService.rebuild(today.isocalendar()[0])
+    RankingService.generate(today.year)
+    YearReviewService.build(today.year, user_ids=[user.id])
+
+    posts = Post.objects.bulk_create(
+        [
+            Post(author=rng.choice(users), content="Entrenamiento de hoy")
+            for _ in range(POSTS)
+        ],
+        batch_size=SEED_BATCH_SIZE,
+    )
+    reaction_types = Reaction.ReactionType.values
+    Reaction.objects.bulk_create(
+        [
+            Reaction(post=post, user=member, reaction_type=rng.choice(reaction_types))
+            for post in posts
+            for member in rng.sample(users, min(len(users), rng.randint(0, 10)))
+        ],
+        batch_size=SEED_BATCH_SIZE,
+    )
+    Comment.objects.bulk_create(
+        [
+            Comment(post=post, author=rng.choice(users), content="Bien hecho")
+            for post in posts
+            for _ in range(rng.randint(0, 4))
+        ],
+        batch_size=SEED_BATCH_SIZE,
+    )
+    Post.repair_counters()
+
+    statuses = [
+        status
+        for status in PushNotification.Status.values
+        if status != PushNotification.Status.SCHEDULED
+    ]
+    PushNotification.objects.bulk_create(
+        [
+            PushNotification(
+                user=member,
+                title="Recordatorio",
+                body="Tu entrenamiento es mañana",
+                status=rng.choice(statuses),
+            )
+            for member in users
+            for _ in range(200 if member is user else 20)
+        ],
+        batch_size=SEED_BATCH_SIZE,
+    )
+    NotificationCounter.reconcile()
+
+    # Free future day for the booking cases
+    booked_days = set(
+        UserTraining.objects.filter(
+            user=user, status=UserTraining.Status.CONFIRMED
+        ).values_list("slot__date", flat=True)
+    )
+    free_slot = (
+        Slot.objects.filter(
+            date__gt=today, class_training__training_type__in=training_types
+        )
+        .exclude(date__in=booked_days)
+        .order_by("date")
+        .first()
+    )
+    assert free_slot is not None, "No free slot left for the booking benchmark"
+    return SimpleNamespace(user=user, free_slot=free_slot, today=today)
+
+
+def booking(data):
+    return UserTraining.objects.get(user=data.user, slot=data.free_slot)
+
+
+# Requests to benchmark, with optional setup and teardown
+CASES = {
+    "dashboard": {"view": DashboardView, "path": "/api/v1/dashboard/"},
+    "calendar": {"view": CalendarView, "path": "/api/v1/training/calendar/"},
+    "slots": {
+        "view": SlotsView,
+        "path": "/api/v1/training/slots/",
+        "params": lambda data: {"date": (data.today + timedelta(days=1)).isoformat()},
+    },
+    "my_trainings": {
+        "view": MyTrainingsView,
+        "path": "/api/v1/training/my-trainings/",
+        "params": lambda data: {"include_past": "true"},
+    },
+    "book": {
+        "view": BookView,
+        "method": "post",
+        "path": "/api/v1/training/book/",
+        "data": lambda data: {"slot_id": data.free_slot.id},
+        "after": lambda data: BookingService.cancel(booking(data)),
+    },
+    "cancel": {
+        "view": CancelView,
+        "method": "post",
+        "path": "/api/v1/training/cancel/",
+        "data": lambda data: {"training_id": booking(data).id},
+        "before": lambda data: BookingService.book(data.user, data.free_slot),
+    },
+    "feed": {"view": FeedView, "path": "/api/v1/community/feed/"},
+    "year_review": {
+        "view": YearReviewView,
+        "path": "/api/v1/year-review/",
+        "kwargs": lambda data: {"year": data.today.year},
+    },
+    "notifications": {
+        "view": NotificationListView,
+        "path": "/api/v1/notifications/",
+    },
+    "notification_count": {
+        "view": NotificationCountView,
+        "path": "/api/v1/notifications/count/",
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def queued_tasks():
+    """Names of the Celery tasks queued, instead of sending them."""
+    tasks = []
+
+    def queue(task, *args, **kwargs):
+        tasks.append(task.name)
+
+    with mock.patch.object(Task, "apply_async", autospec=True, side_effect=queue):
+        yield tasks
+
+
+@pytest.fixture(scope="module")
+def dataset(django_db_setup, django_db_blocker, queued_tasks):
+    """Seed the dataset once, it is rolled back after the last case."""
+    with django_db_blocker.unblock(), transaction.atomic():
+        yield seed(random.Random(42))
+        transaction.set_rollback(True)
+
+
+@pytest.fixture(scope="module")
+def report(request, benchmark_results):
+    """Results of every case, written as the baseline on --update-baseline."""
+    yield benchmark_results
+
+    if request.config.getoption("--update-baseline") and benchmark_results:
+        with open(BASELINE, "w") as baseline_file:
+            json.dump(
+                {
+                    "vendor": connection.vendor,
+                    "users": USERS,
+                    "posts": POSTS,
+                    "results": benchmark_results,
+                },
+                baseline_file,
+                indent=2,
+                sort_keys=True,
+            )
+            baseline_file.write("\n")
+
+
+def measure(case, data, queued_tasks, capture_on_commit_callbacks):
+    """
+    Call a view ``ITERATIONS`` times, each with a cold cache.
+
+    The commit callbacks of each call run after its timing, so the tasks
+    they queue are counted as they would be in production.
+    """
+    factory = APIRequestFactory()
+    view = case["view"].as_view()
+    method = case.get("method", "get")
+    kwargs = case["kwargs"](data) if case.get("kwargs") else {}
+    timings = []
+    queries = status_code = None
+    queued_tasks.clear()
+
+    for _ in range(ITERATIONS):
+        if case.get("before"):
+            case["before"](data)
+        cache.clear()
+        body = case["data"](data) if case.get("data") else None
+        params = case["params"](data) if case.get("params") else None
+        request = getattr(factory, method)(
+            case["path"],
+            body if method == "post" else params,
+            format="json" if method == "post" else None,
+        )
+        force_authenticate(request, user=data.user)
+
+        with capture_on_commit_callbacks(execute=True):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = view(request, **kwargs)
+                if hasattr(response, "render"):
+                    response.render()
+                timings.append((time.perf_counter() - started) * 1000)
+
+        # Savepoints only exist because of the test transaction
+        count = sum(
+            1
+            for query in captured.captured_queries
+            if not query["sql"].startswith(("SAVEPOINT", "RELEASE SAVEPOINT"))
+        )
+        queries = count if queries is None else max(queries, count)
+        status_code = response.status_code
+        if case.get("after"):
+            case["after"](data)
+
+    timings.sort()
+    return {
+        "status": status_code,
+        "queries": queries,
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(timings[math.ceil(len(timings) * 0.95) - 1], 2),
+        # Tasks queued per call
+        "tasks": len(queued_tasks) // ITERATIONS,
+    }
+
+
+def regressions(name, result, expected, same_dataset):
+    """List the regressions of a case against its baseline."""
+    found = []
+    if result["status"] != expected["status"]:
+        found.append(f"{name}: status {expected['status']} -> {result['status']}")
+    if result["queries"] > expected["queries"]:
+        found.append(f"{name}: {expected['queries']} -> {result['queries']} queries")
+    if result["tasks"] > expected["tasks"]:
+        found.append(f"{name}: {expected['tasks']} -> {result['tasks']} tasks")
+    limit = max(
+        expected["p95_ms"] * (1 + TOLERANCE),
+        expected["p95_ms"] + MIN_REGRESSION_MS,
+    )
+    # Timings are only comparable on the same database and dataset size
+    if same_dataset and result["p95_ms"] > limit:
+        found.append(
+            f"{name}: p95 {expected['p95_ms']:.1f} -> {result['p95_ms']:.1f} ms"
+        )
+    return found
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("name", CASES)
+def test_api_performance(
+    name, dataset, report, queued_tasks, django_capture_on_commit_callbacks, request
+):
+    result = measure(
+        CASES[name], dataset, queued_tasks, django_capture_on_commit_callbacks
+    )
+    report[name] = result
+    if request.config.getoption("--update-baseline"):
+        return
+
+    if not BASELINE.exists():
+        pytest.fail("No baseline found, run with --update-baseline")
+    baseline = json.loads(BASELINE.read_text())
+    expected = baseline["results"].get(name)
+    if expected is None:
+        pytest.fail(f"No baseline for {name}, run with --update-baseline")
+    same_dataset = (baseline["vendor"], baseline["users"], baseline["posts"]) == (
+        connection.vendor,
+        USERS,
+        POSTS,
+    )
+    assert not regressions(name, result, expected, same_dataset)
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from neural.api.views.training import SlotDetailView, SlotsView
+from neural.services.booking import BookingService
+from neural.training.models import Slot
+from neural.training.tests.factories import SlotFactory
+from neural.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def get_slots(user, date):
+    request = APIRequestFactory().get(
+        "/api/v1/training/slots/", {"date": date.isoformat()}
+    )
+    force_authenticate(request, user=user)
+    return SlotsView.as_view()(request)
+
+
+@pytest.mark.parametrize("size", [1, 15])
+def test_slot_list_query_count_does_not_grow_with_slots(
+    user, django_assert_num_queries, size
+):
+    date = timezone.localdate() + timedelta(days=1)
+    for slot in SlotFactory.create_batch(size, date=date):
+        BookingService.book(UserFactory(), slot)
+
+    # The user's booking check and the slots with their class and type
+    with django_assert_num_queries(2):
+        response = get_slots(user, date)
+
+    assert response.status_code == 200
+    assert len(response.data["slots"]) == size
+    assert {slot["available_places"] for slot in response.data["slots"]} == {19}
+
+
+@pytest.mark.parametrize("size", [1, 15])
+def test_slot_detail_query_count_does_not_grow_with_bookings(
+    user, slot, django_assert_num_queries, size
+):
+    for booker in UserFactory.create_batch(size):
+        BookingService.book(booker, slot)
+    request = APIRequestFactory().get(f"/api/v1/training/slots/{slot.pk}/")
+    force_authenticate(request, user=user)
+
+    # The slot, its confirmed users and the user's booking check
+    with django_assert_num_queries(3):
+        response = SlotDetailView.as_view()(request, pk=slot.pk)
+
+    assert response.status_code == 200
+    assert len(response.data["confirmed_users"]) == size
+
+
+def test_with_availability_is_a_single_query(django_assert_num_queries):
+    SlotFactory.create_batch(3)
+
+    with django_assert_num_queries(1):
+        slots = list(Slot.objects.with_availability())
+        places = [
+            (slot.remaining_places, slot.class_training.training_type.name)
+            for slot in slots
+        ]
+
+    assert len(places) == 3
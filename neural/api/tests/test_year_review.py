@@ -0,0 +1,52 @@
+from datetime import date
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from neural.api.views.year_review import YearReviewView
+from neural.services.booking import BookingService
+from neural.training.tests.factories import SlotFactory
+from neural.users.models import YearReviewSnapshot
+
+pytestmark = pytest.mark.django_db
+
+
+def get_year_review(user, year):
+    request = APIRequestFactory().get(f"/api/v1/year-review/{year}/")
+    force_authenticate(request, user=user)
+    return YearReviewView.as_view()(request, year=year)
+
+
+def test_year_review_of_the_current_year(user):
+    year = timezone.localdate().year
+
+    response = get_year_review(user, year)
+
+    assert response.status_code == 200
+    assert YearReviewSnapshot.objects.filter(user=user, year=year).exists()
+
+
+@pytest.mark.parametrize("offset", [1, -1, -50])
+def test_year_review_out_of_range_stores_nothing(user, offset):
+    year = timezone.localdate().year + offset
+
+    response = get_year_review(user, year)
+
+    assert response.status_code == 200
+    assert response.data["year"] == year
+    assert response.data["total_trainings"] == 0
+    assert response.data["message"] == (
+        "No tienes entrenamientos registrados para este año"
+    )
+    assert not YearReviewSnapshot.objects.filter(user=user).exists()
+
+
+def test_year_review_of_a_past_year_with_trainings(user):
+    year = timezone.localdate().year - 1
+    BookingService.book(user, SlotFactory(date=date(year, 3, 1)))
+
+    response = get_year_review(user, year)
+
+    assert response.status_code == 200
+    assert response.data["total_trainings"] == 1
@@ -14,6 +14,7 @@ from neural.api.views.membership import (
     CreatePaymentView,
     MembershipView,
     PaymentWebhookView,
+    PlansView,
     VerifyPaymentView,
 )
 from neural.api.views.training import (
@@ -71,6 +72,7 @@ urlpatterns = [
     path("training/types/", TrainingTypesView.as_view(), name="training_types"),
     # Membership
     path("membership/", MembershipView.as_view(), name="membership"),
+    path("membership/plans/", PlansView.as_view(), name="plans"),
     path(
         "membership/create-payment/", CreatePaymentView.as_view(), name="create_payment"
     ),
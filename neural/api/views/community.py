@@ -7,7 +7,9 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
 from neural.community.models import Post, Reaction, Comment
 from neural.users.models import User, Profile, UserStrike
@@ -24,6 +26,7 @@ from neural.services.push_notifications import (
 )
 from neural.users.models import PushNotification
 from neural.users.tasks import send_community_notification_to_all
+from neural.utils.pagination import InvalidCursor, keyset_paginate
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +38,17 @@ REACTION_EMOJIS = {
     "heart": "❤️",
 }
 
+INVALID_CURSOR_MESSAGE = "cursor inválido"
+
+# Relations PostSerializer reads, loaded in the post query itself
+POST_RELATED = [
+    "author",
+    "training",
+    "training__slot",
+    "training__slot__class_training",
+    "training__slot__class_training__training_type",
+]
+
 
 class FeedView(APIView):
     """Get community feed with pagination."""
@@ -42,31 +56,36 @@ class FeedView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
+        cursor = request.query_params.get("cursor")
         page = int(request.query_params.get("page", 1))
         page_size = 20
-        offset = (page - 1) * page_size
-
-        posts = (
-            Post.objects.filter(is_active=True)
-            .select_related("author", "training", "training__slot")
-            .prefetch_related("reactions")
-            .order_by("-created")[offset : offset + page_size + 1]
-        )
 
-        # Check if there are more posts
-        has_more = len(posts) > page_size
-        posts = posts[:page_size]
+        # "page" is kept for older app versions, new ones follow next_cursor
+        try:
+            posts, next_cursor = keyset_paginate(
+                Post.objects.filter(is_active=True).select_related(*POST_RELATED),
+                page_size,
+                cursor=cursor,
+                offset=(page - 1) * page_size,
+            )
+        except InvalidCursor:
+            return Response(
+                {"error": INVALID_CURSOR_MESSAGE},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
+        has_more = next_cursor is not None
         serializer = PostSerializer(
             posts,
             many=True,
-            context={"request": request},
+            context=PostSerializer.viewer_context(request, posts),
         )
 
         return Response(
             {
                 "posts": serializer.data,
-                "next_page": page + 1 if has_more else None,
+                "next_page": page + 1 if has_more and not cursor else None,
+                "next_cursor": next_cursor,
                 "has_more": has_more,
             }
         )
@@ -132,19 +151,22 @@ class PostDetailView(APIView):
 
     def get(self, request, pk):
         post = get_object_or_404(
-            Post.objects.select_related(
-                "author", "training", "training__slot"
-            ).prefetch_related("reactions"),
+            Post.objects.select_related(*POST_RELATED),
             pk=pk,
             is_active=True,
         )
-        serializer = PostSerializer(post, context={"request": request})
+        serializer = PostSerializer(
+            post, context=PostSerializer.viewer_context(request, [post])
+        )
         return Response({"post": serializer.data})
 
     def delete(self, request, pk):
-        post = get_object_or_404(Post, pk=pk, author=request.user, is_active=True)
-        post.is_active = False
-        post.save(update_fields=["is_active", "modified"])
+        # Single conditional UPDATE, no read-modify-write of the post row
+        deactivated = Post.objects.filter(
+            pk=pk, author=request.user, is_active=True
+        ).update(is_active=False, modified=timezone.now())
+        if not deactivated:
+            raise Http404
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -190,24 +212,14 @@ class PostReactionView(APIView):
                 except Exception as e:
                     logger.error(f"Error sending reaction notification: {e}")
 
-            # Get updated summary
-            from django.db.models import Count
-
-            summary = {"fire": 0, "muscle": 0, "clap": 0, "heart": 0}
-            reactions = (
-                post.reactions.values("reaction_type")
-                .annotate(count=Count("id"))
-                .order_by()
-            )
-            for r in reactions:
-                if r["reaction_type"] in summary:
-                    summary[r["reaction_type"]] = r["count"]
+            # Counters were updated with F() expressions, reload them
+            post.refresh_from_db()
 
             return Response(
                 {
                     "success": True,
                     "reactions_count": post.reactions_count,
-                    "reactions_summary": summary,
+                    "reactions_summary": post.reactions_summary,
                 }
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -215,26 +227,17 @@ class PostReactionView(APIView):
     def delete(self, request, pk):
         """Remove reaction."""
         post = get_object_or_404(Post, pk=pk, is_active=True)
-        Reaction.objects.filter(post=post, user=request.user).delete()
-
-        # Get updated summary
-        from django.db.models import Count
-
-        summary = {"fire": 0, "muscle": 0, "clap": 0, "heart": 0}
-        reactions = (
-            post.reactions.values("reaction_type")
-            .annotate(count=Count("id"))
-            .order_by()
-        )
-        for r in reactions:
-            if r["reaction_type"] in summary:
-                summary[r["reaction_type"]] = r["count"]
+        reaction = Reaction.objects.filter(post=post, user=request.user).first()
+        if reaction:
+            # Delete through the model so the post counters are updated
+            reaction.delete()
+            post.refresh_from_db()
 
         return Response(
             {
                 "success": True,
                 "reactions_count": post.reactions_count,
-                "reactions_summary": summary,
+                "reactions_summary": post.reactions_summary,
             }
         )
 
@@ -244,16 +247,36 @@ class PostCommentsView(APIView):
 
     permission_classes = [IsAuthenticated]
 
+    page_size = 50
+
     def get(self, request, pk):
-        """Get all comments for a post."""
+        """Get the comments of a post, oldest first."""
         post = get_object_or_404(Post, pk=pk, is_active=True)
-        comments = post.comments.filter(is_active=True).select_related("author")
+        try:
+            comments, next_cursor = keyset_paginate(
+                post.comments.filter(is_active=True).select_related("author"),
+                self.page_size,
+                cursor=request.query_params.get("cursor"),
+                descending=False,
+            )
+        except InvalidCursor:
+            return Response(
+                {"error": INVALID_CURSOR_MESSAGE},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         serializer = CommentSerializer(
             comments,
             many=True,
             context={"request": request},
         )
-        return Response({"comments": serializer.data})
+        return Response(
+            {
+                "comments": serializer.data,
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+            }
+        )
 
     def post(self, request, pk):
         """Add a comment to a post."""
@@ -313,8 +336,7 @@ class CommentDetailView(APIView):
             author=request.user,
             is_active=True,
         )
-        comment.is_active = False
-        comment.save(update_fields=["is_active", "modified"])
+        comment.soft_delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -395,13 +417,20 @@ class UserPublicProfileView(APIView):
         # Get user's posts count
         posts_count = Post.objects.filter(author=user, is_active=True).count()
 
-        # Get user's recent posts (last 5)
-        recent_posts = (
-            Post.objects.filter(author=user, is_active=True)
-            .select_related("training", "training__slot")
-            .prefetch_related("reactions")
-            .order_by("-created")[:5]
-        )
+        # Get user's recent posts (5 per page)
+        try:
+            recent_posts, next_cursor = keyset_paginate(
+                Post.objects.filter(author=user, is_active=True).select_related(
+                    *POST_RELATED
+                ),
+                5,
+                cursor=request.query_params.get("cursor"),
+            )
+        except InvalidCursor:
+            return Response(
+                {"error": INVALID_CURSOR_MESSAGE},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         # Build photo URL
         photo_url = None
@@ -426,8 +455,11 @@ class UserPublicProfileView(APIView):
                 "posts_count": posts_count,
             },
             "recent_posts": PostSerializer(
-                recent_posts, many=True, context={"request": request}
+                recent_posts,
+                many=True,
+                context=PostSerializer.viewer_context(request, recent_posts),
             ).data,
+            "next_cursor": next_cursor,
         }
 
         return Response(data)
@@ -5,16 +5,18 @@ import random
 import string
 
 from django.conf import settings
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from neural.api.serializers.membership import (
-    NeuralPlanSerializer,
-    UserMembershipSerializer,
-)
-from neural.users.models import NeuralPlan, UserMembership, UserPaymentReference
+from neural.api.serializers.membership import NeuralPlanSerializer
+from neural.services.catalog import CatalogService
+from neural.services.membership import MembershipService
+from neural.users.models import NeuralPlan, UserPaymentReference
 
 
 class MembershipView(APIView):
@@ -25,27 +27,45 @@ class MembershipView(APIView):
     def get(self, request):
         user = request.user
 
-        # Current membership
-        current_membership = None
-        active = (
-            UserMembership.objects.filter(user=user, is_active=True)
-            .select_related("plan")
-            .first()
-        )
-        if active:
-            current_membership = UserMembershipSerializer(active).data
-
         # Available plans
-        plans = NeuralPlan.objects.all().order_by("duration")
+        available_plans = CatalogService.plans()
+
+        # Current membership, its plan is one of the available ones
+        current_membership = None
+        state = MembershipService.get_state(user.id)
+        if state:
+            plans_by_id = {plan["id"]: plan for plan in available_plans}
+            current_membership = {
+                "id": state.id,
+                "membership_type": state.membership_type,
+                "plan": plans_by_id.get(state.plan_id),
+                "is_active": state.is_active,
+                "init_date": state.init_date.isoformat(),
+                "expiration_date": state.expiration_date.isoformat()
+                if state.expiration_date
+                else None,
+                "days_left": state.days_left,
+            }
 
         return Response(
             {
                 "current_membership": current_membership,
-                "available_plans": NeuralPlanSerializer(plans, many=True).data,
+                "available_plans": available_plans,
             }
         )
 
 
+class PlansView(APIView):
+    """Get available plans."""
+
+    permission_classes = [IsAuthenticated]
+
+    @method_decorator(cache_control(private=True, max_age=CatalogService.MAX_AGE))
+    @method_decorator(condition(etag_func=lambda request: CatalogService.etag("plans")))
+    def get(self, request):
+        return Response({"plans": CatalogService.plans()})
+
+
 class CreatePaymentView(APIView):
     """Create a payment reference for BOLD."""
 
@@ -134,20 +154,14 @@ class VerifyPaymentView(APIView):
             payment_ref.apply_membership()
 
             # Get updated membership
-            membership = (
-                UserMembership.objects.filter(user=request.user, is_active=True)
-                .select_related("plan")
-                .first()
-            )
+            membership = MembershipService.get_state(request.user.id)
 
             return Response(
                 {
                     "success": True,
                     "message": "Membresía activada exitosamente",
                     "membership": {
-                        "plan_name": membership.plan.name
-                        if membership and membership.plan
-                        else None,
+                        "plan_name": membership.plan_name if membership else None,
                         "expiration_date": membership.expiration_date.isoformat()
                         if membership
                         else None,
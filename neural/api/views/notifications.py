@@ -4,9 +4,10 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.db import transaction
 from django.utils import timezone
 
-from neural.users.models import PushNotification, User
+from neural.users.models import NotificationCounter, PushNotification, User
 from neural.api.serializers.notifications import (
     NotificationSerializer,
     NotificationDetailSerializer,
@@ -29,25 +30,13 @@ class NotificationListView(APIView):
         # Exclude FAILED notifications
         notifications = PushNotification.objects.filter(
             user=request.user,
-            status__in=[
-                PushNotification.Status.PENDING,
-                PushNotification.Status.SENT,
-                PushNotification.Status.DELIVERED,
-                PushNotification.Status.READ,
-            ],
+            status__in=PushNotification.VISIBLE_STATUSES,
         ).order_by("-created")[:50]  # Last 50 notifications
 
         serializer = NotificationSerializer(notifications, many=True)
 
-        # Get unread count (PENDING, SENT, DELIVERED are considered unread)
-        unread_count = PushNotification.objects.filter(
-            user=request.user,
-            status__in=[
-                PushNotification.Status.PENDING,
-                PushNotification.Status.SENT,
-                PushNotification.Status.DELIVERED,
-            ],
-        ).count()
+        # PENDING, SENT and DELIVERED are considered unread
+        unread_count = NotificationCounter.for_user(request.user.id).unread
 
         return Response(
             {
@@ -68,6 +57,7 @@ class NotificationDetailView(APIView):
             notification = PushNotification.objects.get(
                 pk=pk,
                 user=request.user,
+                status__in=PushNotification.VISIBLE_STATUSES,
             )
         except PushNotification.DoesNotExist:
             return Response(
@@ -80,18 +70,22 @@ class NotificationDetailView(APIView):
 
     def delete(self, request, pk):
         """Delete a notification."""
-        try:
-            notification = PushNotification.objects.get(
-                pk=pk,
-                user=request.user,
-            )
-        except PushNotification.DoesNotExist:
-            return Response(
-                {"error": "Notificación no encontrada"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        # Locked so its status cannot change before the counters move
+        with transaction.atomic():
+            try:
+                notification = PushNotification.objects.select_for_update().get(
+                    pk=pk,
+                    user=request.user,
+                    status__in=PushNotification.VISIBLE_STATUSES,
+                )
+            except PushNotification.DoesNotExist:
+                return Response(
+                    {"error": "Notificación no encontrada"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
 
-        notification.delete()
+            notification.delete()
+            NotificationCounter.track(notification.user_id, notification.status)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -108,6 +102,7 @@ class MarkNotificationReadView(APIView):
                 notification = PushNotification.objects.get(
                     pk=pk,
                     user=request.user,
+                    status__in=PushNotification.VISIBLE_STATUSES,
                 )
             except PushNotification.DoesNotExist:
                 return Response(
@@ -119,17 +114,16 @@ class MarkNotificationReadView(APIView):
             return Response({"message": "Notificación marcada como leída"})
         else:
             # Mark all notifications as read
-            PushNotification.objects.filter(
+            now = timezone.now()
+            updated = PushNotification.objects.filter(
                 user=request.user,
-                status__in=[
-                    PushNotification.Status.PENDING,
-                    PushNotification.Status.SENT,
-                    PushNotification.Status.DELIVERED,
-                ],
+                status__in=PushNotification.UNREAD_STATUSES,
             ).update(
                 status=PushNotification.Status.READ,
-                read_at=timezone.now(),
+                read_at=now,
+                modified=now,
             )
+            NotificationCounter.adjust([request.user.id], unread=-updated)
             return Response(
                 {"message": "Todas las notificaciones marcadas como leídas"}
             )
@@ -142,29 +136,12 @@ class NotificationCountView(APIView):
 
     def get(self, request):
         """Get notification counts."""
-        total = PushNotification.objects.filter(
-            user=request.user,
-            status__in=[
-                PushNotification.Status.PENDING,
-                PushNotification.Status.SENT,
-                PushNotification.Status.DELIVERED,
-                PushNotification.Status.READ,
-            ],
-        ).count()
-
-        unread = PushNotification.objects.filter(
-            user=request.user,
-            status__in=[
-                PushNotification.Status.PENDING,
-                PushNotification.Status.SENT,
-                PushNotification.Status.DELIVERED,
-            ],
-        ).count()
+        counter = NotificationCounter.for_user(request.user.id)
 
         return Response(
             {
-                "total": total,
-                "unread": unread,
+                "total": counter.total,
+                "unread": counter.unread,
             }
         )
 
@@ -187,7 +164,14 @@ class SendNotificationView(APIView):
             data=data.get("data"),
         )
 
+        scheduled_for = data.get("scheduled_for")
+
         if data.get("send_to_all"):
+            if scheduled_for:
+                return self._schedule(
+                    PushNotificationService.recipient_ids(), payload, scheduled_for
+                )
+
             # Send to all users
             count = PushNotificationService.send_to_all_users(payload)
             return Response(
@@ -206,6 +190,9 @@ class SendNotificationView(APIView):
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
+            if scheduled_for:
+                return self._schedule([user.id], payload, scheduled_for)
+
             notification = PushNotificationService.send_to_user(user, payload)
             if notification:
                 return Response(
@@ -224,3 +211,18 @@ class SendNotificationView(APIView):
                 {"error": "Debe especificar user_id o send_to_all"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+
+    def _schedule(self, user_ids, payload, scheduled_for):
+        """Queue a campaign for the scheduled notifications dispatcher."""
+        campaign_key = PushNotificationService.schedule(
+            user_ids, payload, scheduled_for
+        )
+        return Response(
+            {
+                "message": f"Notificación programada para {len(user_ids)} usuarios",
+                "count": len(user_ids),
+                "campaign_key": campaign_key,
+                "scheduled_for": scheduled_for,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
@@ -2,8 +2,10 @@
 
 from datetime import timedelta
 
-from django.db.models import F
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -13,8 +15,10 @@ from neural.api.serializers.training import (
     SlotSerializer,
     UserTrainingSerializer,
 )
-from neural.training.models import Slot, TrainingType, UserTraining
-from neural.users.models import UserStats, UserStrike
+from neural.services.booking import BookingError, BookingService
+from neural.services.calendar import CalendarService
+from neural.services.catalog import CatalogService
+from neural.training.models import Slot, UserTraining
 
 
 class CalendarView(APIView):
@@ -36,9 +40,9 @@ class CalendarView(APIView):
             6: "Domingo",
         }
 
-        for i in range(7):
+        availability = CalendarService.get_availability(today)
+        for i, day in enumerate(availability):
             date = today + timedelta(days=i)
-            has_slots = Slot.objects.filter(date=date).exists()
 
             if i == 0:
                 day_name = "Hoy"
@@ -47,13 +51,7 @@ class CalendarView(APIView):
             else:
                 day_name = day_names.get(date.weekday(), "")
 
-            days.append(
-                {
-                    "date": date.isoformat(),
-                    "day_name": day_name,
-                    "has_slots": has_slots,
-                }
-            )
+            days.append({**day, "day_name": day_name})
 
         return Response({"days": days})
 
@@ -91,9 +89,7 @@ class SlotsView(APIView):
         ).exists()
 
         # Get slots for the date
-        slots = Slot.objects.filter(date=date).select_related(
-            "class_training", "class_training__training_type"
-        )
+        slots = Slot.objects.filter(date=date).with_availability()
 
         # Filter by training type if provided
         if training_type_slug:
@@ -138,9 +134,7 @@ class SlotDetailView(APIView):
 
     def get(self, request, pk):
         try:
-            slot = Slot.objects.select_related(
-                "class_training", "class_training__training_type"
-            ).get(id=pk)
+            slot = Slot.objects.with_availability().get(id=pk)
         except Slot.DoesNotExist:
             return Response(
                 {"error": "Slot no encontrado"},
@@ -166,7 +160,7 @@ class SlotDetailView(APIView):
         ]
 
         # Check if current user already booked this slot
-        user_has_booked = confirmed_trainings.filter(user=request.user).exists()
+        user_has_booked = any(u["id"] == request.user.id for u in confirmed_users)
 
         # Check if user has any booking for this date
         already_scheduled = UserTraining.objects.filter(
@@ -230,53 +224,15 @@ class BookView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Check availability
-        if slot.available_places <= 0:
+        # Reserve a seat and create booking
+        try:
+            booking = BookingService.book(user, slot)
+        except BookingError as e:
             return Response(
-                {"error": "Este horario ya no tiene cupo disponible"},
+                {"error": str(e)},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Create booking
-        booking = UserTraining.objects.create(
-            user=user,
-            slot=slot,
-            status=UserTraining.Status.CONFIRMED,
-        )
-
-        # Update stats
-        now = timezone.localtime()
-        current_week = now.isocalendar()[1]
-
-        stats, created = UserStats.objects.get_or_create(
-            user=user,
-            week=current_week,
-            year=now.year,
-            defaults={"trainings": 0, "calories": 0, "hours": 0},
-        )
-        stats.trainings = F("trainings") + 1
-        stats.calories = F("calories") + 400
-        stats.hours = F("hours") + 1
-        stats.save()
-
-        # Update strike
-        strike, created = UserStrike.objects.get_or_create(
-            user=user,
-            is_current=True,
-            defaults={"weeks": 0, "last_week": 0},
-        )
-
-        if strike.last_week != current_week:
-            # Check if consecutive week
-            if strike.last_week == current_week - 1 or strike.last_week == 0:
-                strike.weeks = F("weeks") + 1
-            else:
-                # Reset strike
-                strike.weeks = 1
-
-            strike.last_week = current_week
-            strike.save()
-
         return Response(
             {
                 "success": True,
@@ -406,7 +362,9 @@ class CancelView(APIView):
             )
 
         try:
-            training = UserTraining.objects.get(id=training_id, user=request.user)
+            training = UserTraining.objects.select_related("slot").get(
+                id=training_id, user=request.user
+            )
         except UserTraining.DoesNotExist:
             return Response(
                 {"error": "Entrenamiento no encontrado"},
@@ -420,24 +378,11 @@ class CancelView(APIView):
             )
 
         # Cancel the training
-        training.status = UserTraining.Status.CANCELLED
-        training.save()
-
-        # Update stats
-        now = timezone.localtime()
-        current_week = now.isocalendar()[1]
-
-        try:
-            stats = UserStats.objects.get(
-                user=request.user, week=current_week, year=now.year
+        if not BookingService.cancel(training):
+            return Response(
+                {"error": "Solo puedes cancelar entrenamientos confirmados"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-            if stats.trainings > 0:
-                stats.trainings = F("trainings") - 1
-                stats.calories = F("calories") - 400
-                stats.hours = F("hours") - 1
-                stats.save()
-        except UserStats.DoesNotExist:
-            pass
 
         return Response(
             {"success": True, "message": "Entrenamiento cancelado exitosamente"},
@@ -450,14 +395,9 @@ class TrainingTypesView(APIView):
 
     permission_classes = [IsAuthenticated]
 
+    @method_decorator(cache_control(private=True, max_age=CatalogService.MAX_AGE))
+    @method_decorator(
+        condition(etag_func=lambda request: CatalogService.etag("training_types"))
+    )
     def get(self, request):
-        from neural.api.serializers.training import TrainingTypeSerializer
-
-        training_types = TrainingType.objects.all()
-        return Response(
-            {
-                "training_types": TrainingTypeSerializer(
-                    training_types, many=True
-                ).data,
-            }
-        )
+        return Response({"training_types": CatalogService.training_types()})
@@ -1,16 +1,35 @@
 """Year in Review views for API v1."""
 
-from collections import Counter
-
-from django.db.models import Count
-from django.db.models.functions import ExtractMonth, ExtractWeekDay
 from django.utils import timezone
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from neural.training.models import UserTraining
-from neural.users.models import Ranking, UserStats, UserStrike
+from neural.services.year_review import YearReviewService
+
+MONTH_NAMES = [
+    "Enero",
+    "Febrero",
+    "Marzo",
+    "Abril",
+    "Mayo",
+    "Junio",
+    "Julio",
+    "Agosto",
+    "Septiembre",
+    "Octubre",
+    "Noviembre",
+    "Diciembre",
+]
+DAY_NAMES = [
+    "Lunes",
+    "Martes",
+    "Miércoles",
+    "Jueves",
+    "Viernes",
+    "Sábado",
+    "Domingo",
+]
 
 
 class YearReviewView(APIView):
@@ -30,23 +49,21 @@ class YearReviewView(APIView):
         except (TypeError, ValueError):
             year = timezone.localtime().year
 
-        # Get all trainings for the year
-        trainings = UserTraining.objects.filter(
-            user=user,
-            status=UserTraining.Status.CONFIRMED,
-            slot__date__year=year,
-        ).select_related(
-            "slot", "slot__class_training", "slot__class_training__training_type"
-        )
-
-        total_trainings = trainings.count()
+        snapshot = YearReviewService.get_snapshot(user, year)
+        data = snapshot.data
+        freshness = {
+            "computed_at": snapshot.computed_at,
+            "is_stale": snapshot.is_stale,
+        }
 
+        total_trainings = data["total_trainings"]
         if total_trainings == 0:
             return Response(
                 {
                     "year": year,
                     "total_trainings": 0,
                     "message": "No tienes entrenamientos registrados para este año",
+                    **freshness,
                 }
             )
 
@@ -55,98 +72,38 @@ class YearReviewView(APIView):
         total_hours = total_trainings
 
         # Active weeks
-        weekly_stats = UserStats.objects.filter(user=user, year=year, trainings__gt=0)
-        active_weeks = weekly_stats.count()
+        active_weeks = data["stats"]["active_weeks"]
         avg_trainings_per_week = (
             total_trainings / active_weeks if active_weeks > 0 else 0
         )
 
-        # Monthly distribution
-        monthly_data = [0] * 12
-        monthly_counts = (
-            trainings.annotate(month=ExtractMonth("slot__date"))
-            .values("month")
-            .annotate(count=Count("id"))
-        )
-        for item in monthly_counts:
-            monthly_data[item["month"] - 1] = item["count"]
-
         # Best month
+        monthly_data = data["monthly"]
         best_month_idx = monthly_data.index(max(monthly_data))
-        month_names = [
-            "Enero",
-            "Febrero",
-            "Marzo",
-            "Abril",
-            "Mayo",
-            "Junio",
-            "Julio",
-            "Agosto",
-            "Septiembre",
-            "Octubre",
-            "Noviembre",
-            "Diciembre",
-        ]
         best_month = {
-            "name": month_names[best_month_idx],
+            "name": MONTH_NAMES[best_month_idx],
             "trainings": monthly_data[best_month_idx],
         }
 
         # Favorite training type
-        training_types = []
-        for t in trainings:
-            if t.slot and t.slot.class_training:
-                training_types.append(t.slot.class_training.training_type.name)
-
-        if training_types:
-            type_counter = Counter(training_types)
-            favorite_type, favorite_count = type_counter.most_common(1)[0]
-            favorite_training = {"type": favorite_type, "count": favorite_count}
-        else:
-            favorite_training = {"type": "N/A", "count": 0}
-
-        # Favorite day of week
-        weekday_data = [0] * 7
-        day_counts = (
-            trainings.annotate(weekday=ExtractWeekDay("slot__date"))
-            .values("weekday")
-            .annotate(count=Count("id"))
-        )
-        for item in day_counts:
-            # Django weekday: 1=Sunday, 2=Monday, ..., 7=Saturday
-            # Convert to 0=Monday, ..., 6=Sunday
-            idx = (item["weekday"] - 2) % 7
-            weekday_data[idx] = item["count"]
-
-        day_names = [
-            "Lunes",
-            "Martes",
-            "Miércoles",
-            "Jueves",
-            "Viernes",
-            "Sábado",
-            "Domingo",
-        ]
+        favorite_training = {
+            "type": data["favorite_type"]["name"] or "N/A",
+            "count": data["favorite_type"]["count"],
+        }
+
+        # Favorite day of week (0=Monday, ..., 6=Sunday)
+        weekday_data = data["weekday"]
         favorite_day_idx = weekday_data.index(max(weekday_data))
         favorite_day = {
-            "name": day_names[favorite_day_idx],
+            "name": DAY_NAMES[favorite_day_idx],
             "count": weekday_data[favorite_day_idx],
         }
 
         # Favorite time of day
-        morning_count = 0  # 5am - 12pm
-        afternoon_count = 0  # 12pm - 6pm
-        evening_count = 0  # 6pm - 10pm
-
-        for t in trainings:
-            if t.slot and t.slot.class_training:
-                hour = t.slot.class_training.hour_init.hour
-                if 5 <= hour < 12:
-                    morning_count += 1
-                elif 12 <= hour < 18:
-                    afternoon_count += 1
-                else:
-                    evening_count += 1
+        hourly = data["hourly"]
+        morning_count = sum(hourly[5:12])  # 5am - 12pm
+        afternoon_count = sum(hourly[12:18])  # 12pm - 6pm
+        evening_count = sum(hourly) - morning_count - afternoon_count
 
         time_periods = [
             ("Mañana", morning_count, "sunrise"),
@@ -159,25 +116,6 @@ class YearReviewView(APIView):
             "emoji": favorite_time_data[2],
         }
 
-        # Streaks
-        best_strike = UserStrike.objects.filter(user=user).order_by("-weeks").first()
-        current_strike = UserStrike.objects.filter(user=user, is_current=True).first()
-
-        streaks = {
-            "best": best_strike.weeks if best_strike else 0,
-            "current": current_strike.weeks if current_strike else 0,
-        }
-
-        # Ranking
-        ranking_data = {"position": None, "total_users": 0}
-        user_ranking = Ranking.objects.filter(user=user).first()
-        if user_ranking:
-            total_ranked = Ranking.objects.count()
-            ranking_data = {
-                "position": user_ranking.position,
-                "total_users": total_ranked,
-            }
-
         # Fun metrics
         pizzas_burned = round(total_calories / 2000, 1)  # ~2000 cal per pizza
         marathons_equivalent = round(
@@ -196,13 +134,14 @@ class YearReviewView(APIView):
                 "favorite_training": favorite_training,
                 "favorite_day": favorite_day,
                 "favorite_time": favorite_time,
-                "streaks": streaks,
-                "ranking": ranking_data,
+                "streaks": data["streaks"],
+                "ranking": data["ranking"],
                 "fun_metrics": {
                     "pizzas_burned": pizzas_burned,
                     "marathons_equivalent": marathons_equivalent,
                 },
                 "monthly_data": monthly_data,
                 "weekday_data": weekday_data,
+                **freshness,
             }
         )
@@ -0,0 +1,58 @@
+# Generated by Django 4.2 on 2026-10-18 19:14
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_reaction_counts(apps, schema_editor):
+    Post = apps.get_model("community", "Post")
+    Reaction = apps.get_model("community", "Reaction")
+
+    def count(**filters):
+        reactions = (
+            Reaction.objects.filter(post=OuterRef("pk"), **filters)
+            .order_by()
+            .values("post")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        return Coalesce(Subquery(reactions), 0)
+
+    Post.objects.update(
+        reactions_count=count(),
+        fire_count=count(reaction_type="fire"),
+        muscle_count=count(reaction_type="muscle"),
+        clap_count=count(reaction_type="clap"),
+        heart_count=count(reaction_type="heart"),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("community", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="clap_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="fire_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="heart_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="muscle_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_reaction_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-18 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("community", "0002_post_reaction_type_counts"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["post", "created", "id"],
+                name="comment_post_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-created", "-id"],
+                name="post_feed_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["author", "-created", "-id"],
+                name="post_author_feed_idx",
+            ),
+        ),
+    ]
@@ -1,6 +1,8 @@
 """Community models for posts, reactions, and comments."""
 
 from django.db import models
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
 from django.utils import timezone
 from datetime import timedelta
 
@@ -44,6 +46,10 @@ class Post(NeuralBaseModel):
     # Denormalized counters for performance
     reactions_count = models.PositiveIntegerField(default=0)
     comments_count = models.PositiveIntegerField(default=0)
+    fire_count = models.PositiveIntegerField(default=0)
+    muscle_count = models.PositiveIntegerField(default=0)
+    clap_count = models.PositiveIntegerField(default=0)
+    heart_count = models.PositiveIntegerField(default=0)
 
     is_active = models.BooleanField(default=True)
 
@@ -51,6 +57,19 @@ class Post(NeuralBaseModel):
         verbose_name = "Publicación"
         verbose_name_plural = "Publicaciones"
         ordering = ["-created"]
+        indexes = [
+            # Keyset pagination of the feed and of each author's posts
+            models.Index(
+                fields=["-created", "-id"],
+                condition=models.Q(is_active=True),
+                name="post_feed_idx",
+            ),
+            models.Index(
+                fields=["author", "-created", "-id"],
+                condition=models.Q(is_active=True),
+                name="post_author_feed_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.author.get_full_name()} - {self.post_type} - {self.created}"
@@ -78,15 +97,80 @@ class Post(NeuralBaseModel):
         else:
             return self.created.strftime("%d/%m/%Y")
 
-    def update_reaction_count(self):
-        """Update the reactions_count field."""
-        self.reactions_count = self.reactions.count()
-        self.save(update_fields=["reactions_count", "modified"])
+    @property
+    def reactions_summary(self):
+        """Return the count of each reaction type."""
+        return {
+            reaction_type: getattr(self, f"{reaction_type}_count")
+            for reaction_type in Reaction.ReactionType.values
+        }
+
+    @classmethod
+    def adjust_counters(cls, post_id, **deltas):
+        """
+        Atomically add ``deltas`` to the counters of a post.
+
+        The arithmetic runs in the UPDATE itself so concurrent writers do
+        not overwrite each other, and counters never go below zero.
+        """
+        values = {
+            field: F(field) + delta if delta > 0 else Greatest(F(field) + delta, 0)
+            for field, delta in deltas.items()
+            if delta
+        }
+        if values:
+            cls.objects.filter(pk=post_id).update(modified=timezone.now(), **values)
+
+    @classmethod
+    def counter_expressions(cls):
+        """Subqueries recounting every counter from reactions and comments."""
+
+        def count(model, **filters):
+            rows = (
+                model.objects.filter(post=OuterRef("pk"), **filters)
+                .order_by()
+                .values("post")
+                .annotate(total=Count("id"))
+                .values("total")
+            )
+            return Coalesce(Subquery(rows), 0)
+
+        expressions = {
+            "reactions_count": count(Reaction),
+            "comments_count": count(Comment, is_active=True),
+        }
+        for reaction_type in Reaction.ReactionType.values:
+            expressions[f"{reaction_type}_count"] = count(
+                Reaction, reaction_type=reaction_type
+            )
+        return expressions
+
+    @classmethod
+    def repair_counters(cls, queryset=None):
+        """
+        Recount the counters of the posts that drifted.
+
+        One aggregate query finds the drifted posts, and a single UPDATE
+        recounts them inside the database.
 
-    def update_comment_count(self):
-        """Update the comments_count field."""
-        self.comments_count = self.comments.filter(is_active=True).count()
-        self.save(update_fields=["comments_count", "modified"])
+        Returns:
+            Number of posts repaired
+        """
+        queryset = queryset if queryset is not None else cls.objects.all()
+        expressions = cls.counter_expressions()
+        actual = {f"actual_{field}": expr for field, expr in expressions.items()}
+        drifted = Q()
+        for field in expressions:
+            drifted |= ~Q(**{field: F(f"actual_{field}")})
+
+        post_ids = list(
+            queryset.annotate(**actual).filter(drifted).values_list("id", flat=True)
+        )
+        if post_ids:
+            cls.objects.filter(id__in=post_ids).update(
+                modified=timezone.now(), **expressions
+            )
+        return len(post_ids)
 
 
 class Reaction(NeuralBaseModel):
@@ -122,14 +206,38 @@ class Reaction(NeuralBaseModel):
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.reaction_type} on {self.post.id}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored type to move the counters when it changes
+        instance._stored_reaction_type = instance.__dict__.get("reaction_type")
+        return instance
+
     def save(self, *args, **kwargs):
+        adding = self._state.adding
+        previous_type = getattr(self, "_stored_reaction_type", None)
         super().save(*args, **kwargs)
-        self.post.update_reaction_count()
+
+        if adding:
+            Post.adjust_counters(
+                self.post_id, reactions_count=1, **{f"{self.reaction_type}_count": 1}
+            )
+        elif previous_type and previous_type != self.reaction_type:
+            Post.adjust_counters(
+                self.post_id,
+                **{f"{previous_type}_count": -1, f"{self.reaction_type}_count": 1},
+            )
+        self._stored_reaction_type = self.reaction_type
 
     def delete(self, *args, **kwargs):
-        post = self.post
-        super().delete(*args, **kwargs)
-        post.update_reaction_count()
+        result = super().delete(*args, **kwargs)
+        # Only the delete that removed the row moves the counters
+        if result[1].get(self._meta.label):
+            reaction_type = getattr(self, "_stored_reaction_type", self.reaction_type)
+            Post.adjust_counters(
+                self.post_id, reactions_count=-1, **{f"{reaction_type}_count": -1}
+            )
+        return result
 
 
 class Comment(NeuralBaseModel):
@@ -152,6 +260,14 @@ class Comment(NeuralBaseModel):
         verbose_name = "Comentario"
         verbose_name_plural = "Comentarios"
         ordering = ["created"]
+        indexes = [
+            # Keyset pagination of a post's comments
+            models.Index(
+                fields=["post", "created", "id"],
+                condition=models.Q(is_active=True),
+                name="comment_post_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.author.get_full_name()} on {self.post.id}"
@@ -176,11 +292,45 @@ class Comment(NeuralBaseModel):
         else:
             return self.created.strftime("%d/%m/%Y")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._stored_is_active = instance.__dict__.get("is_active")
+        return instance
+
     def save(self, *args, **kwargs):
+        was_active = (
+            False if self._state.adding else getattr(self, "_stored_is_active", None)
+        )
         super().save(*args, **kwargs)
-        self.post.update_comment_count()
+
+        if was_active is not None and was_active != self.is_active:
+            Post.adjust_counters(
+                self.post_id, comments_count=1 if self.is_active else -1
+            )
+        self._stored_is_active = self.is_active
 
     def delete(self, *args, **kwargs):
-        post = self.post
-        super().delete(*args, **kwargs)
-        post.update_comment_count()
+        result = super().delete(*args, **kwargs)
+        if getattr(self, "_stored_is_active", self.is_active):
+            Post.adjust_counters(self.post_id, comments_count=-1)
+        return result
+
+    def soft_delete(self):
+        """
+        Deactivate the comment.
+
+        The conditional UPDATE lets only one of several concurrent deletes
+        decrement the post's comments_count.
+
+        Returns:
+            True if this call deactivated the comment
+        """
+        deactivated = Comment.objects.filter(pk=self.pk, is_active=True).update(
+            is_active=False, modified=timezone.now()
+        )
+        if deactivated:
+            Post.adjust_counters(self.post_id, comments_count=-1)
+        self.is_active = False
+        self._stored_is_active = False
+        return bool(deactivated)
@@ -1,7 +1,6 @@
 """Serializers for community app."""
 
 from rest_framework import serializers
-from django.db.models import Count
 
 from neural.community.models import Post, Reaction, Comment
 
@@ -123,8 +122,29 @@ class PostSerializer(serializers.ModelSerializer):
             return obj.image.url
         return None
 
+    @staticmethod
+    def viewer_context(request, posts):
+        """
+        Build the serializer context for a list of posts.
+
+        The current user's reactions on all the posts are loaded with one
+        query and looked up by ``get_user_reaction``.
+        """
+        user_reactions = {}
+        if request and request.user.is_authenticated:
+            user_reactions = dict(
+                Reaction.objects.filter(
+                    user=request.user, post_id__in=[post.id for post in posts]
+                ).values_list("post_id", "reaction_type")
+            )
+        return {"request": request, "user_reactions": user_reactions}
+
     def get_user_reaction(self, obj):
         """Get current user's reaction on this post."""
+        user_reactions = self.context.get("user_reactions")
+        if user_reactions is not None:
+            return user_reactions.get(obj.id)
+
         request = self.context.get("request")
         if request and request.user.is_authenticated:
             reaction = obj.reactions.filter(user=request.user).first()
@@ -134,14 +154,7 @@ class PostSerializer(serializers.ModelSerializer):
 
     def get_reactions_summary(self, obj):
         """Get count of each reaction type."""
-        summary = {"fire": 0, "muscle": 0, "clap": 0, "heart": 0}
-        reactions = (
-            obj.reactions.values("reaction_type").annotate(count=Count("id")).order_by()
-        )
-        for r in reactions:
-            if r["reaction_type"] in summary:
-                summary[r["reaction_type"]] = r["count"]
-        return summary
+        return obj.reactions_summary
 
 
 class CreatePostSerializer(serializers.ModelSerializer):
@@ -0,0 +1,29 @@
+import logging
+
+# Celery
+from config import celery_app
+from celery.schedules import crontab
+
+# Models
+from neural.community.models import Post
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.on_after_finalize.connect
+def setup_periodic_tasks(sender, **kwargs):
+    # Repair drifted post counters - daily at 3am
+    sender.add_periodic_task(
+        crontab(day_of_week="*", hour=3, minute=0),
+        repair_post_counters.s(),
+        name="repair_post_counters",
+    )
+
+
+@celery_app.task
+def repair_post_counters():
+    """Recount reaction and comment counters of posts that drifted."""
+    repaired = Post.repair_counters()
+    if repaired:
+        logger.warning(f"Repaired counters of {repaired} posts")
+    return repaired
@@ -0,0 +1,13 @@
+from factory import Faker, SubFactory
+from factory.django import DjangoModelFactory
+
+from neural.community.models import Post
+from neural.users.tests.factories import UserFactory
+
+
+class PostFactory(DjangoModelFactory):
+    author = SubFactory(UserFactory)
+    content = Faker("sentence")
+
+    class Meta:
+        model = Post
@@ -0,0 +1,45 @@
+import pytest
+
+from neural.community.models import Post, Reaction
+from neural.community.tests.factories import PostFactory
+from neural.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_reaction_counters_follow_create_change_and_delete(user):
+    post = PostFactory()
+    reaction = Reaction.objects.create(
+        post=post, user=user, reaction_type=Reaction.ReactionType.FIRE
+    )
+    reaction = Reaction.objects.get(pk=reaction.pk)
+    reaction.reaction_type = Reaction.ReactionType.HEART
+    reaction.save()
+
+    post.refresh_from_db()
+    assert (post.reactions_count, post.fire_count, post.heart_count) == (1, 0, 1)
+
+    reaction.delete()
+
+    post.refresh_from_db()
+    assert (post.reactions_count, post.heart_count) == (0, 0)
+
+
+def test_deleting_a_reaction_twice_moves_the_counters_once(user):
+    post = PostFactory()
+    Reaction.objects.create(
+        post=post, user=UserFactory(), reaction_type=Reaction.ReactionType.FIRE
+    )
+    reaction = Reaction.objects.create(
+        post=post, user=user, reaction_type=Reaction.ReactionType.FIRE
+    )
+    first, second = (
+        Reaction.objects.get(pk=reaction.pk),
+        Reaction.objects.get(pk=reaction.pk),
+    )
+
+    first.delete()
+    second.delete()
+
+    post = Post.objects.get(pk=post.pk)
+    assert (post.reactions_count, post.fire_count) == (1, 1)
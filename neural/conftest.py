@@ -0,0 +1,74 @@
+import pytest
+from django.core.cache import cache
+
+from neural.services.catalog import CatalogService
+from neural.training.models import Slot
+from neural.training.tests.factories import SlotFactory
+from neural.users.models import User
+from neural.users.tests.factories import UserFactory
+
+
+BENCHMARK_RESULTS = pytest.StashKey[dict]()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark", action="store_true", help="Run the API performance suite"
+    )
+    parser.addoption(
+        "--update-baseline",
+        action="store_true",
+        help="Run the API performance suite and store its results as the baseline",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark") or config.getoption("--update-baseline"):
+        return
+    skip = pytest.mark.skip(reason="API performance suite, run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.stash.get(BENCHMARK_RESULTS, None)
+    if not results:
+        return
+    terminalreporter.section("API performance")
+    for name, result in results.items():
+        terminalreporter.write_line(
+            f"{name:<18} {result['status']}  {result['queries']:>3} queries  "
+            f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  "
+            f"{result['tasks']} tasks"
+        )
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(request) -> dict:
+    """Results of the API performance suite, shown in the terminal summary."""
+    return request.config.stash.setdefault(BENCHMARK_RESULTS, {})
+
+
+@pytest.fixture(autouse=True)
+def media_storage(settings, tmpdir):
+    settings.MEDIA_ROOT = tmpdir.strpath
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    # Also drops the catalogs kept in this process
+    CatalogService._bump()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user(db) -> User:
+    return UserFactory()
+
+
+@pytest.fixture
+def slot(db) -> Slot:
+    return SlotFactory()
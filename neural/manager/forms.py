@@ -2,6 +2,7 @@
 
 from django import forms
 from django.contrib.auth import authenticate
+from django.utils import timezone
 
 from neural.users.models import User, PushNotification, Device
 
@@ -74,6 +75,7 @@ class SendNotificationForm(forms.Form):
         .distinct()
         .order_by("first_name", "last_name"),
         label="Usuario",
+        required=False,
         widget=forms.Select(
             attrs={
                 "class": "form-select select2-user",
@@ -112,6 +114,28 @@ class SendNotificationForm(forms.Form):
         ),
     )
 
+    send_to_all = forms.BooleanField(
+        label="Enviar a todos los usuarios",
+        required=False,
+        widget=forms.CheckboxInput(
+            attrs={
+                "class": "form-checkbox",
+            }
+        ),
+    )
+    scheduled_for = forms.DateTimeField(
+        label="Programar para",
+        required=False,
+        input_formats=["%Y-%m-%dT%H:%M"],
+        widget=forms.DateTimeInput(
+            format="%Y-%m-%dT%H:%M",
+            attrs={
+                "class": "form-input",
+                "type": "datetime-local",
+            },
+        ),
+    )
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Update queryset to show user info
@@ -119,6 +143,20 @@ class SendNotificationForm(forms.Form):
             lambda obj: f"{obj.first_name} {obj.last_name} ({obj.email})"
         )
 
+    def clean_scheduled_for(self):
+        scheduled_for = self.cleaned_data.get("scheduled_for")
+        if scheduled_for and scheduled_for <= timezone.now():
+            raise forms.ValidationError("La fecha programada debe ser futura.")
+        return scheduled_for
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get("user") and not cleaned_data.get("send_to_all"):
+            raise forms.ValidationError(
+                "Selecciona un usuario o envía la notificación a todos."
+            )
+        return cleaned_data
+
 
 class DeviceForm(forms.ModelForm):
     """Form to edit device token."""
@@ -26,6 +26,8 @@ from neural.services.push_notifications import (
     PushNotificationService,
     NotificationPayload,
 )
+from neural.services.dashboard import DashboardService
+from neural.users.tasks import send_push_notification_to_all
 from neural.manager.forms import ManagerLoginForm, SendNotificationForm, DeviceForm
 
 
@@ -92,6 +94,8 @@ class DashboardView(SuperStaffRequiredMixin, TemplateView):
         context["notifications_today"] = PushNotification.objects.filter(
             created__date=today
         ).count()
+        context["dashboard_cache"] = DashboardService.get_metrics()
+        context["notification_backlog"] = PushNotificationService.scheduled_backlog()
 
         # Recent users
         context["recent_users"] = User.objects.filter(is_client=True).order_by(
@@ -268,6 +272,39 @@ class SendNotificationView(SuperStaffRequiredMixin, FormView):
         title = form.cleaned_data["title"]
         body = form.cleaned_data["body"]
         notification_type = form.cleaned_data["notification_type"]
+        scheduled_for = form.cleaned_data["scheduled_for"]
+
+        payload = NotificationPayload(
+            title=title,
+            body=body,
+            notification_type=notification_type,
+        )
+
+        if form.cleaned_data["send_to_all"]:
+            if scheduled_for:
+                user_ids = PushNotificationService.recipient_ids()
+                PushNotificationService.schedule(user_ids, payload, scheduled_for)
+                messages.success(
+                    self.request,
+                    f"Notificación programada para {len(user_ids)} usuarios el "
+                    f"{timezone.localtime(scheduled_for):%d/%m/%Y %H:%M}.",
+                )
+            else:
+                send_push_notification_to_all.delay(title, body, notification_type)
+                messages.success(
+                    self.request,
+                    "Notificación en cola para todos los usuarios.",
+                )
+            return super().form_valid(form)
+
+        if scheduled_for:
+            PushNotificationService.schedule([user.id], payload, scheduled_for)
+            messages.success(
+                self.request,
+                f"Notificación programada para {user.first_name} {user.last_name} el "
+                f"{timezone.localtime(scheduled_for):%d/%m/%Y %H:%M}.",
+            )
+            return super().form_valid(form)
 
         # Check if user has devices
         if not Device.objects.filter(user=user, is_active=True).exists():
@@ -278,12 +315,6 @@ class SendNotificationView(SuperStaffRequiredMixin, FormView):
             return self.form_invalid(form)
 
         # Send notification
-        payload = NotificationPayload(
-            title=title,
-            body=body,
-            notification_type=notification_type,
-        )
-
         notification = PushNotificationService.send_to_user(user, payload)
 
         if notification and notification.status == PushNotification.Status.SENT:
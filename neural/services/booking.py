@@ -0,0 +1,183 @@
+"""Booking Service for training slots."""
+
+from typing import Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from neural.services.calendar import CalendarService
+from neural.services.dashboard import DashboardService
+from neural.services.reminders import ReminderService
+from neural.services.stats import StatsService
+from neural.training.models import Slot, UserTraining
+from neural.users.models import User
+
+
+class BookingError(Exception):
+    """Raised when a booking cannot be completed."""
+
+
+class BookingService:
+    """Service for reserving and releasing seats on training slots.
+
+    Seats are tracked in ``Slot.confirmed_count`` and reserved with a single
+    conditional UPDATE, so concurrent bookings can never push a slot past
+    ``max_places`` and no row has to be locked before the write.
+
+    Weekly stats and streaks are refreshed in the background after every
+    booking or cancellation, see ``StatsService.record_training_event``,
+    and the booking's push reminder is scheduled or revoked with it.
+    """
+
+    SLOT_FULL_MESSAGE = "Este horario ya no tiene cupo disponible"
+    ALREADY_BOOKED_MESSAGE = "Ya tienes una reserva para este horario"
+
+    @classmethod
+    def reserve_seat(cls, slot_id: int) -> bool:
+        """
+        Take one seat on a slot if there is still room.
+
+        Returns:
+            True if the seat was reserved, False if the slot is full
+        """
+        updated = Slot.objects.filter(
+            pk=slot_id, confirmed_count__lt=F("max_places")
+        ).update(confirmed_count=F("confirmed_count") + 1)
+        return updated == 1
+
+    @classmethod
+    def release_seat(cls, slot_id: int) -> bool:
+        """Give back one seat on a slot."""
+        updated = Slot.objects.filter(pk=slot_id, confirmed_count__gt=0).update(
+            confirmed_count=F("confirmed_count") - 1
+        )
+        return updated == 1
+
+    @classmethod
+    def book(cls, user: User, slot: Slot) -> UserTraining:
+        """
+        Book a slot for a user.
+
+        A previously cancelled booking for the same slot is confirmed again
+        instead of creating a new row. A user has at most one booking per
+        slot, so concurrent requests of the same user take a single seat.
+
+        Args:
+            user: The user booking the slot
+            slot: The slot to book
+
+        Returns:
+            The confirmed UserTraining
+
+        Raises:
+            BookingError: If the slot is full or already booked by the user
+        """
+        with transaction.atomic():
+            if not cls.reserve_seat(slot.pk):
+                raise BookingError(cls.SLOT_FULL_MESSAGE)
+
+            # Locked, so concurrent rebookings of a cancelled row wait here
+            booking = (
+                UserTraining.objects.select_for_update()
+                .filter(user=user, slot=slot)
+                .first()
+            )
+            if booking is None:
+                try:
+                    booking = UserTraining.objects.create(
+                        user=user,
+                        slot=slot,
+                        status=UserTraining.Status.CONFIRMED,
+                    )
+                except IntegrityError:
+                    # A concurrent request of the user inserted it first,
+                    # raising rolls back the reserved seat
+                    raise BookingError(cls.ALREADY_BOOKED_MESSAGE)
+            elif booking.status != UserTraining.Status.CONFIRMED:
+                booking.status = UserTraining.Status.CONFIRMED
+                booking.save(update_fields=["status", "modified"])
+            else:
+                # Rolls back the reserved seat
+                raise BookingError(cls.ALREADY_BOOKED_MESSAGE)
+
+            ReminderService.schedule([booking])
+            transaction.on_commit(lambda: CalendarService.invalidate([slot.date]))
+            StatsService.record_training_event(user.id, slot.date)
+
+        slot.confirmed_count += 1
+        return booking
+
+    @classmethod
+    def cancel(cls, training: UserTraining, clear_space: bool = False) -> bool:
+        """
+        Cancel a confirmed booking and release its seat.
+
+        Args:
+            training: The booking to cancel
+            clear_space: Whether to also release the assigned space
+
+        Returns:
+            True if the booking was cancelled, False if it was not confirmed
+        """
+        fields = {
+            "status": UserTraining.Status.CANCELLED,
+            "modified": timezone.now(),
+        }
+        if clear_space:
+            fields["space"] = None
+
+        with transaction.atomic():
+            updated = UserTraining.objects.filter(
+                pk=training.pk, status=UserTraining.Status.CONFIRMED
+            ).update(**fields)
+            if updated:
+                cls.release_seat(training.slot_id)
+                ReminderService.revoke([training.pk])
+                slot_date = training.slot.date
+                transaction.on_commit(lambda: CalendarService.invalidate([slot_date]))
+                # Queryset updates do not send post_save
+                transaction.on_commit(
+                    lambda: DashboardService.invalidate(training.user_id)
+                )
+                StatsService.record_training_event(training.user_id, slot_date)
+
+        if not updated:
+            return False
+
+        training.status = UserTraining.Status.CANCELLED
+        if clear_space:
+            training.space = None
+        return True
+
+    @classmethod
+    def reconcile_confirmed_counts(cls, slots: Optional[QuerySet] = None) -> int:
+        """
+        Rebuild ``confirmed_count`` from the UserTraining table.
+
+        Args:
+            slots: Slots to rebuild, all slots if not provided
+
+        Returns:
+            Number of slots updated
+        """
+        if slots is None:
+            slots = Slot.objects.all()
+
+        confirmed = (
+            UserTraining.objects.filter(
+                slot=OuterRef("pk"), status=UserTraining.Status.CONFIRMED
+            )
+            .order_by()
+            .values("slot")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        updated = slots.update(confirmed_count=Coalesce(Subquery(confirmed), 0))
+        CalendarService.invalidate(
+            slots.filter(date__gte=timezone.localdate())
+            .values_list("date", flat=True)
+            .distinct()
+        )
+        return updated
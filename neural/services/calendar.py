@@ -0,0 +1,88 @@
+"""Calendar availability service."""
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, List
+
+from django.core.cache import cache
+from django.db.models import Count, F, Sum
+
+from neural.training.models import Slot
+
+
+class CalendarService:
+    """Service for the per-day availability map shown in the calendar.
+
+    The map for a date range is built with one grouped query and cached
+    under a key per range. Any change to a day's capacity must call
+    ``invalidate`` with that day so every cached range containing it
+    is dropped.
+    """
+
+    DAYS = 7
+    CACHE_TIMEOUT = 60 * 60
+    # Days with less than this share of places left are "almost full"
+    ALMOST_FULL_RATIO = 0.2
+
+    @classmethod
+    def _cache_key(cls, start: date) -> str:
+        end = start + timedelta(days=cls.DAYS - 1)
+        return f"calendar_availability_{start.isoformat()}_{end.isoformat()}"
+
+    @classmethod
+    def get_availability(cls, start: date) -> List[Dict]:
+        """
+        Get availability for ``DAYS`` days starting at ``start``.
+
+        Returns:
+            One dict per day with slot count, capacity and remaining places
+        """
+        cache_key = cls._cache_key(start)
+        days = cache.get(cache_key)
+        if days is None:
+            days = cls._build_availability(start)
+            cache.set(cache_key, days, timeout=cls.CACHE_TIMEOUT)
+        return days
+
+    @classmethod
+    def _build_availability(cls, start: date) -> List[Dict]:
+        end = start + timedelta(days=cls.DAYS - 1)
+        rows = (
+            Slot.objects.filter(date__range=(start, end))
+            .values("date")
+            .annotate(
+                slots=Count("id"),
+                capacity=Sum("max_places"),
+                remaining=Sum(F("max_places") - F("confirmed_count")),
+            )
+            .order_by("date")
+        )
+        by_date = {row["date"]: row for row in rows}
+
+        days = []
+        for i in range(cls.DAYS):
+            day = start + timedelta(days=i)
+            row = by_date.get(day)
+            capacity = row["capacity"] if row else 0
+            remaining = max(row["remaining"], 0) if row else 0
+            days.append(
+                {
+                    "date": day.isoformat(),
+                    "has_slots": bool(row),
+                    "total_places": capacity,
+                    "available_places": remaining,
+                    "almost_full": bool(row)
+                    and remaining <= capacity * cls.ALMOST_FULL_RATIO,
+                }
+            )
+        return days
+
+    @classmethod
+    def invalidate(cls, dates: Iterable[date]) -> None:
+        """Drop every cached range that contains one of ``dates``."""
+        keys = {
+            cls._cache_key(day - timedelta(days=offset))
+            for day in dates
+            for offset in range(cls.DAYS)
+        }
+        if keys:
+            cache.delete_many(list(keys))
@@ -0,0 +1,162 @@
+"""Reference data catalog service."""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Models are resolved when a catalog loads, neural.users.models imports
+# this module
+
+
+def _load_training_types() -> List[Dict[str, Any]]:
+    TrainingType = apps.get_model("training", "TrainingType")
+    return list(
+        TrainingType.objects.order_by("id").values(
+            "id", "name", "slug_name", "is_group"
+        )
+    )
+
+
+def _load_plans() -> List[Dict[str, Any]]:
+    NeuralPlan = apps.get_model("users", "NeuralPlan")
+    plans = NeuralPlan.objects.order_by("duration", "id").values(
+        "id", "name", "slug_name", "description", "price", "duration"
+    )
+    # Same shape as NeuralPlanSerializer
+    return [{**plan, "price": int(plan["price"])} for plan in plans]
+
+
+def _load_spaces() -> List[Dict[str, Any]]:
+    Space = apps.get_model("training", "Space")
+    return list(
+        Space.objects.order_by("id").values("id", "slug_name", "name", "description")
+    )
+
+
+class CatalogService:
+    """Service for the reference data that changes a few times a year.
+
+    Each catalog is a list of plain dicts, shaped like its API serializer,
+    stored in the cache under the current catalog version and kept in a
+    per-process LRU in front of it. The version is a random token in the
+    shared cache, re-read at most every ``VERSION_TTL`` seconds, so a warm
+    process serves the catalogs without a cache round trip or a query.
+
+    ``bump`` replaces the version once the transaction that changed a
+    ``TrainingType``, ``NeuralPlan`` or ``Space`` commits, which retires
+    every copy at once. It is called by the admin save and delete signals.
+
+    Classes are not cached: every reader joins them into its slot query,
+    and the timetable import writes them in bulk without signals.
+    """
+
+    VERSION_KEY = "catalog_version"
+    # Catalogs outlive any version, stale ones are never read again
+    CACHE_TIMEOUT = 60 * 60 * 24 * 30
+    VERSION_TTL = 5
+    LOCAL_SIZE = 16
+    # Client cache lifetime of the catalog endpoints, revalidated by ETag
+    MAX_AGE = 60 * 60
+
+    LOADERS: Dict[str, Callable[[], List[Dict[str, Any]]]] = {
+        "training_types": _load_training_types,
+        "plans": _load_plans,
+        "spaces": _load_spaces,
+    }
+
+    _local: "OrderedDict[tuple, List[Dict[str, Any]]]" = OrderedDict()
+    _version: Optional[str] = None
+    _version_read_at = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def version(cls) -> str:
+        """Current catalog version, created on first use."""
+        now = time.monotonic()
+        if cls._version is not None and now - cls._version_read_at < cls.VERSION_TTL:
+            return cls._version
+        version = cache.get(cls.VERSION_KEY)
+        if version is None:
+            version = uuid.uuid4().hex[:12]
+            # Another process may have created it first
+            cache.add(cls.VERSION_KEY, version, timeout=None)
+            version = cache.get(cls.VERSION_KEY) or version
+        cls._version, cls._version_read_at = version, now
+        return version
+
+    @classmethod
+    def get(cls, name: str) -> List[Dict[str, Any]]:
+        """
+        Get a catalog.
+
+        Args:
+            name: One of ``LOADERS``
+
+        Returns:
+            The catalog rows, shared with other callers, do not mutate them
+        """
+        version = cls.version()
+        local_key = (name, version)
+        with cls._lock:
+            if local_key in cls._local:
+                cls._local.move_to_end(local_key)
+                return cls._local[local_key]
+
+        cache_key = f"catalog_{name}_{version}"
+        rows = cache.get(cache_key)
+        if rows is None:
+            rows = cls.LOADERS[name]()
+            cache.set(cache_key, rows, timeout=cls.CACHE_TIMEOUT)
+
+        with cls._lock:
+            cls._local[local_key] = rows
+            while len(cls._local) > cls.LOCAL_SIZE:
+                cls._local.popitem(last=False)
+        return rows
+
+    @classmethod
+    def etag(cls, name: str) -> str:
+        """ETag of a catalog, it changes with every bump."""
+        return f'"{name}-{cls.version()}"'
+
+    @classmethod
+    def bump(cls) -> None:
+        """Retire every cached catalog once the current transaction commits."""
+        transaction.on_commit(cls._bump)
+
+    @classmethod
+    def _bump(cls) -> None:
+        version = uuid.uuid4().hex[:12]
+        cache.set(cls.VERSION_KEY, version, timeout=None)
+        with cls._lock:
+            cls._local.clear()
+        cls._version, cls._version_read_at = version, time.monotonic()
+        logger.info(f"Catalog version bumped to {version}")
+
+    @classmethod
+    def training_types(cls) -> List[Dict[str, Any]]:
+        return cls.get("training_types")
+
+    @classmethod
+    def plans(cls) -> List[Dict[str, Any]]:
+        """Plans ordered by duration."""
+        return cls.get("plans")
+
+    @classmethod
+    def plan_id(cls, name: str) -> Optional[int]:
+        """ID of the plan with a name, None if there is none."""
+        return next((plan["id"] for plan in cls.plans() if plan["name"] == name), None)
+
+    @classmethod
+    def spaces(cls) -> List[Dict[str, Any]]:
+        """Spaces that can be assigned to a booking."""
+        return cls.get("spaces")
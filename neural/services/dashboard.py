@@ -0,0 +1,180 @@
+"""Dashboard snapshot service."""
+
+import logging
+from typing import Any, Dict, Optional
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from neural.services.membership import MembershipService
+from neural.training.models import UserTraining
+from neural.users.models import User, UserStats, UserStrike
+
+logger = logging.getLogger(__name__)
+
+DAY_NAMES = {
+    0: "Lunes",
+    1: "Martes",
+    2: "Miércoles",
+    3: "Jueves",
+    4: "Viernes",
+    5: "Sábado",
+    6: "Domingo",
+}
+
+
+class DashboardService:
+    """Service for the per-user dashboard snapshot.
+
+    The snapshot holds everything the app dashboard needs except the
+    request dependent photo URL and the membership, which is read from
+    ``MembershipService`` on every request. It is cached per user and
+    local day, and dropped through ``invalidate`` whenever bookings,
+    stats or strikes of the user change.
+    """
+
+    CACHE_TIMEOUT = 60 * 60
+    HITS_KEY = "dashboard_cache_hits"
+    MISSES_KEY = "dashboard_cache_misses"
+
+    @classmethod
+    def _cache_key(cls, user_id: int) -> str:
+        return f"dashboard_{user_id}_{timezone.localdate().isoformat()}"
+
+    @classmethod
+    def get_snapshot(cls, user: User) -> Dict[str, Any]:
+        """Get the dashboard snapshot for a user, building it on a miss."""
+        cache_key = cls._cache_key(user.id)
+        snapshot = cache.get(cache_key)
+        if snapshot is not None:
+            cls._record(cls.HITS_KEY)
+        else:
+            cls._record(cls.MISSES_KEY)
+            snapshot = cls.build_snapshot(user)
+            cache.set(cache_key, snapshot, timeout=cls.CACHE_TIMEOUT)
+
+        snapshot["membership"] = cls._membership_data(user.id)
+        return snapshot
+
+    @classmethod
+    def _membership_data(cls, user_id: int) -> Optional[Dict[str, Any]]:
+        """Dashboard summary of the active membership of a user."""
+        state = MembershipService.get_state(user_id)
+        if state is None:
+            return None
+        return {
+            "plan_name": state.plan_name or state.membership_type,
+            "days_left": state.days_left,
+            "is_active": True,
+            "expiration_date": state.expiration_date.isoformat()
+            if state.expiration_date
+            else None,
+        }
+
+    @classmethod
+    def invalidate(cls, user_id: int) -> None:
+        """Drop the cached snapshot of a user."""
+        cache.delete(cls._cache_key(user_id))
+
+    @classmethod
+    def get_metrics(cls) -> Dict[str, Any]:
+        """Get cache hit/miss counters."""
+        values = cache.get_many([cls.HITS_KEY, cls.MISSES_KEY])
+        hits = values.get(cls.HITS_KEY, 0)
+        misses = values.get(cls.MISSES_KEY, 0)
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 3) if total else None,
+        }
+
+    @classmethod
+    def _record(cls, key: str) -> None:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Counter does not exist yet
+            cache.add(key, 0, timeout=None)
+            cache.incr(key)
+
+    @classmethod
+    def build_snapshot(cls, user: User) -> Dict[str, Any]:
+        """Build the dashboard snapshot from the database."""
+        now = timezone.localtime()
+        today = now.date()
+
+        # Next training
+        next_training = None
+        upcoming = (
+            UserTraining.objects.filter(
+                user=user,
+                status=UserTraining.Status.CONFIRMED,
+                slot__date__gte=today,
+            )
+            .select_related(
+                "slot", "slot__class_training", "slot__class_training__training_type"
+            )
+            .order_by("slot__date", "slot__class_training__hour_init")
+            .first()
+        )
+
+        if upcoming:
+            slot = upcoming.slot
+            training_type = slot.class_training.training_type.name
+
+            # Determine day name
+            if slot.date == today:
+                day_name = "Hoy"
+            elif slot.date == today + timezone.timedelta(days=1):
+                day_name = "Mañana"
+            else:
+                day_name = DAY_NAMES.get(slot.date.weekday(), "")
+
+            hour = slot.class_training.hour_init.strftime("%I:%M %p")
+
+            next_training = {
+                "id": upcoming.id,
+                "day_name": day_name,
+                "hour": hour,
+                "training_type": training_type,
+                "message": f"Recuerda: Tu próximo entrenamiento es {training_type} {day_name} a las {hour}",
+            }
+
+        # Current strike
+        strike_data = {"weeks": 0, "is_current": False}
+        current_strike = UserStrike.objects.filter(user=user, is_current=True).first()
+        if current_strike:
+            strike_data = {
+                "weeks": current_strike.weeks,
+                "is_current": True,
+            }
+
+        # Weekly stats
+        # Stats are keyed by ISO year, see StatsService.week_of
+        current_year, current_week = now.isocalendar()[:2]
+        stats_data = {"trainings": 0, "calories": 0, "hours": 0}
+        weekly_stats = UserStats.objects.filter(
+            user=user, week=current_week, year=current_year
+        ).first()
+        if weekly_stats:
+            stats_data = {
+                "trainings": weekly_stats.trainings,
+                "calories": weekly_stats.calories,
+                "hours": weekly_stats.hours,
+            }
+
+        # Has year review
+        has_year_review = UserTraining.objects.filter(
+            user=user,
+            status=UserTraining.Status.CONFIRMED,
+            slot__date__year=now.year,
+        ).exists()
+
+        return {
+            "next_training": next_training,
+            "strike": strike_data,
+            "stats": stats_data,
+            "membership": None,
+            "has_year_review": has_year_review,
+        }
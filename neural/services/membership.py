@@ -0,0 +1,91 @@
+"""Membership state service."""
+
+import logging
+from dataclasses import astuple, dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from neural.users.models import UserMembership
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MembershipState:
+    """Cached summary of the active membership of a user."""
+
+    id: int
+    membership_type: str
+    plan_id: Optional[int]
+    plan_name: Optional[str]
+    init_date: date
+    expiration_date: Optional[date]
+    is_active: bool = True
+
+    @property
+    def days_left(self) -> int:
+        if self.expiration_date is None:
+            return 0
+        return (self.expiration_date - timezone.localdate()).days + 1
+
+    def get_membership_type_display(self) -> str:
+        return UserMembership.MembershipType(self.membership_type).label
+
+
+class MembershipService:
+    """Service for the active membership of the users.
+
+    Every surface reads the membership through ``get_state``, which keeps
+    a compact tuple per user and local day, so the day a membership
+    expires never serves a state cached the day before. Users without an
+    active membership are cached too.
+
+    The state is cached under ``UserMembership.cache_key`` and dropped by
+    ``UserMembership.invalidate_cache``. The model signals call it on
+    ``save`` and ``UserPaymentReference.apply_membership``, and
+    ``UserMembership.expire`` calls it for the bulk expiry.
+    """
+
+    # Cached value of the users without an active membership
+    NO_MEMBERSHIP = ()
+
+    @staticmethod
+    def _seconds_until_midnight() -> int:
+        """Seconds left in the local day, the lifetime of a state."""
+        now = timezone.localtime()
+        midnight = timezone.make_aware(
+            datetime.combine(now.date() + timedelta(days=1), time.min)
+        )
+        return max(int((midnight - now).total_seconds()), 1)
+
+    @classmethod
+    def get_state(cls, user_id: int) -> Optional[MembershipState]:
+        """Get the active membership of a user, None if there is none."""
+        cache_key = UserMembership.cache_key(user_id, timezone.localdate())
+        value = cache.get(cache_key)
+        if value is None:
+            membership = (
+                UserMembership.objects.filter(user_id=user_id, is_active=True)
+                .select_related("plan")
+                .first()
+            )
+            value = (
+                astuple(cls._to_state(membership)) if membership else cls.NO_MEMBERSHIP
+            )
+            cache.set(cache_key, value, timeout=cls._seconds_until_midnight())
+        return MembershipState(*value) if value else None
+
+    @staticmethod
+    def _to_state(membership: UserMembership) -> MembershipState:
+        return MembershipState(
+            id=membership.id,
+            membership_type=membership.membership_type,
+            plan_id=membership.plan_id,
+            plan_name=membership.plan.name if membership.plan else None,
+            init_date=membership.init_date,
+            expiration_date=membership.expiration_date,
+            is_active=membership.is_active,
+        )
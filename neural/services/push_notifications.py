@@ -1,15 +1,22 @@
 """Push Notification Service for Expo Push API."""
 
 import logging
+import uuid
 import requests
-from typing import List, Optional, Dict, Any
+from collections import Counter
+from typing import List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass
+from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
 
+from django.db import transaction
+from django.db.models import Count, Min, Q
 from django.utils import timezone
 
 from neural.users.models import (
     User,
     Device,
+    NotificationCounter,
     PushNotification,
     PushNotificationLog,
 )
@@ -19,6 +26,21 @@ logger = logging.getLogger(__name__)
 EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
 EXPO_RECEIPTS_URL = "https://exp.host/--/api/v2/push/getReceipts"
 
+# Expo accepts up to 100 messages per push request
+EXPO_BATCH_SIZE = 100
+USER_BATCH_SIZE = 500
+LOG_BATCH_SIZE = 500
+# Scheduled notifications claimed per transaction
+SCHEDULED_BATCH_SIZE = 500
+# Claimed notifications still PENDING after this were left by a dispatcher
+# that died, they are claimed again
+SCHEDULED_LEASE = timedelta(minutes=10)
+# Expo accepts up to 1000 receipt IDs per request, receipts become
+# available after ~15 minutes and are kept for 24 hours
+RECEIPT_BATCH_SIZE = 1000
+RECEIPT_DELAY = timedelta(minutes=15)
+RECEIPT_TTL = timedelta(hours=24)
+
 
 @dataclass
 class NotificationPayload:
@@ -36,6 +58,8 @@ class NotificationPayload:
 class PushNotificationService:
     """Service for sending push notifications via Expo Push API."""
 
+    _session: Optional[requests.Session] = None
+
     @classmethod
     def send_to_user(
         cls,
@@ -54,67 +78,30 @@ class PushNotificationService:
         Returns:
             The created PushNotification object or None if no devices found
         """
-        devices = Device.objects.filter(user=user, is_active=True)
-
-        if not devices.exists():
-            logger.warning(f"No active devices found for user {user.id}")
-            return None
-
-        # Create the notification record
-        notification = None
-        if save_notification:
-            notification = PushNotification.objects.create(
-                user=user,
-                title=payload.title,
-                body=payload.body,
-                data=payload.data,
-                notification_type=payload.notification_type,
-                status=PushNotification.Status.PENDING,
-            )
-
-        # Send to all devices
-        success_count = 0
-        for device in devices:
-            success = cls._send_to_device(
-                device=device,
-                payload=payload,
-                notification=notification,
-            )
-            if success:
-                success_count += 1
-
-        # Update notification status
-        if notification:
-            if success_count > 0:
-                notification.status = PushNotification.Status.SENT
-                notification.sent_at = timezone.now()
-            else:
-                notification.status = PushNotification.Status.FAILED
-            notification.save()
-
-        return notification
+        notifications = cls.send_bulk([user.id], payload, save_notification)
+        return notifications[0] if notifications else None
 
     @classmethod
     def send_to_users(
         cls,
-        users: List[User],
+        user_ids: List[int],
         payload: NotificationPayload,
     ) -> List[PushNotification]:
         """
         Send a push notification to multiple users.
 
         Args:
-            users: List of users to send the notification to
+            user_ids: IDs of the users to send the notification to
             payload: The notification payload
 
         Returns:
             List of created PushNotification objects
         """
         notifications = []
-        for user in users:
-            notification = cls.send_to_user(user, payload)
-            if notification:
-                notifications.append(notification)
+        for start in range(0, len(user_ids), USER_BATCH_SIZE):
+            notifications.extend(
+                cls.send_bulk(user_ids[start : start + USER_BATCH_SIZE], payload)
+            )
         return notifications
 
     @classmethod
@@ -133,38 +120,363 @@ class PushNotificationService:
         Returns:
             Number of notifications sent
         """
-        users_with_devices = User.objects.filter(devices__is_active=True).distinct()
+        user_ids = cls.recipient_ids(exclude_users)
+
+        count = 0
+        for start in range(0, len(user_ids), USER_BATCH_SIZE):
+            notifications = cls.send_bulk(
+                user_ids[start : start + USER_BATCH_SIZE], payload
+            )
+            count += len(notifications)
+
+        return count
+
+    @classmethod
+    def recipient_ids(cls, exclude_users: Optional[List[int]] = None) -> List[int]:
+        """IDs of the users with active devices, in order."""
+        users_with_devices = User.objects.filter(devices__is_active=True)
 
         if exclude_users:
             users_with_devices = users_with_devices.exclude(id__in=exclude_users)
 
-        count = 0
-        for user in users_with_devices:
-            notification = cls.send_to_user(user, payload)
-            if notification:
-                count += 1
+        return list(
+            users_with_devices.order_by("id").values_list("id", flat=True).distinct()
+        )
 
-        return count
+    @classmethod
+    def send_bulk(
+        cls,
+        user_ids: List[int],
+        payload: NotificationPayload,
+        save_notification: bool = True,
+        broadcast_key: Optional[str] = None,
+    ) -> List[PushNotification]:
+        """
+        Send the same push notification to the active devices of many users.
+
+        Notifications and logs are written with bulk queries and messages
+        are sent to Expo in batches of EXPO_BATCH_SIZE.
+
+        Args:
+            user_ids: IDs of the users to send the notification to
+            payload: The notification payload
+            save_notification: Whether to save the notifications to the database
+            broadcast_key: Broadcast the notifications belong to, users whose
+                notification for it was already sent or failed are skipped
+
+        Returns:
+            List of PushNotification objects, one per user with devices
+        """
+        # Left PENDING by an attempt that died before recording its result
+        unsent: Dict[int, PushNotification] = {}
+        if broadcast_key:
+            done = set()
+            for notification in PushNotification.objects.filter(
+                broadcast_key=broadcast_key, user_id__in=user_ids
+            ):
+                if notification.status == PushNotification.Status.PENDING:
+                    unsent[notification.user_id] = notification
+                else:
+                    done.add(notification.user_id)
+            user_ids = [i for i in user_ids if i not in done]
+            if not user_ids:
+                return []
+
+        devices = list(
+            Device.objects.filter(user_id__in=user_ids, is_active=True)
+            .only("id", "user_id", "token")
+            .order_by("user_id", "id")
+        )
+
+        if not devices and not unsent:
+            logger.warning(f"No active devices found for users {user_ids[:10]}")
+            return []
+
+        # Create the notification records, the unsent ones are sent again
+        # and fail if their user has no device left
+        notifications = list(unsent.values())
+        if save_notification:
+            recipient_ids = [
+                user_id
+                for user_id in dict.fromkeys(device.user_id for device in devices)
+                if user_id not in unsent
+            ]
+            created = PushNotification.objects.bulk_create(
+                [
+                    PushNotification(
+                        user_id=user_id,
+                        title=payload.title,
+                        body=payload.body,
+                        data=payload.data,
+                        notification_type=payload.notification_type,
+                        status=PushNotification.Status.PENDING,
+                        broadcast_key=broadcast_key,
+                    )
+                    for user_id in recipient_ids
+                ]
+            )
+            NotificationCounter.track(
+                recipient_ids, new_status=PushNotification.Status.PENDING
+            )
+            notifications += created
+
+        # Send to all devices
+        success_by_user = cls._dispatch(
+            devices=devices,
+            payload=payload,
+            notifications={n.user_id: n for n in notifications},
+        )
+
+        cls._record_results(notifications, success_by_user)
+        return notifications
 
     @classmethod
-    def _send_to_device(
+    def schedule(
         cls,
-        device: Device,
+        user_ids: List[int],
         payload: NotificationPayload,
-        notification: Optional[PushNotification] = None,
-    ) -> bool:
+        scheduled_for: datetime,
+    ) -> str:
         """
-        Send a push notification to a specific device.
+        Queue a notification campaign to be sent at a given time.
+
+        Devices are checked when the campaign is sent, users without an
+        active device by then get a failed notification.
 
         Args:
-            device: The device to send the notification to
+            user_ids: IDs of the users to send the notification to
             payload: The notification payload
-            notification: The associated notification record (for logging)
+            scheduled_for: When to send the notification
 
         Returns:
-            True if sent successfully, False otherwise
+            Key of the campaign, shared by all its notifications
+        """
+        campaign_key = uuid.uuid4().hex
+        now = timezone.now()
+        PushNotification.objects.bulk_create(
+            [
+                PushNotification(
+                    user_id=user_id,
+                    title=payload.title,
+                    body=payload.body,
+                    data=payload.data,
+                    notification_type=payload.notification_type,
+                    status=PushNotification.Status.SCHEDULED,
+                    scheduled_for=scheduled_for,
+                    broadcast_key=campaign_key,
+                    created=now,
+                    modified=now,
+                )
+                for user_id in dict.fromkeys(user_ids)
+            ],
+            batch_size=USER_BATCH_SIZE,
+        )
+        logger.info(
+            f"Campaign {campaign_key} scheduled for {scheduled_for} "
+            f"to {len(user_ids)} users: {payload.title}"
+        )
+        return campaign_key
+
+    @classmethod
+    def scheduled_backlog(cls) -> Dict[str, Any]:
+        """
+        Get the size of the scheduled notifications queue.
+
+        Returns:
+            Dict with the ``scheduled`` notifications, the ``due`` ones, the
+            ``expired`` claims to send again and the seconds the oldest due
+            one has been waiting, ``lag_seconds``
+        """
+        now = timezone.now()
+        backlog = PushNotification.objects.filter(
+            status=PushNotification.Status.SCHEDULED
+        ).aggregate(
+            scheduled=Count("id"),
+            due=Count("id", filter=Q(scheduled_for__lte=now)),
+            oldest=Min("scheduled_for"),
+        )
+        backlog["expired"] = cls._expired_claims(now).count()
+        oldest = backlog.pop("oldest")
+        backlog["lag_seconds"] = (
+            int((now - oldest).total_seconds()) if oldest and oldest <= now else 0
+        )
+        return backlog
+
+    @staticmethod
+    def _expired_claims(now: datetime):
+        """Scheduled notifications claimed longer than ``SCHEDULED_LEASE`` ago."""
+        return PushNotification.objects.filter(
+            status=PushNotification.Status.PENDING,
+            scheduled_for__isnull=False,
+            modified__lt=now - SCHEDULED_LEASE,
+        )
+
+    @classmethod
+    def send_due(cls, batch_size: int = SCHEDULED_BATCH_SIZE) -> int:
+        """
+        Send the scheduled notifications whose due time has passed.
+
+        Each batch is claimed by moving it to PENDING while its rows are
+        locked. Rows locked by another dispatcher are skipped, so several
+        workers can drain the queue at once without sending one twice.
+        The claim is a lease, rows still PENDING ``SCHEDULED_LEASE`` after
+        it are claimed again, so a dispatcher dying mid-batch loses none.
+
+        Args:
+            batch_size: Notifications claimed and sent at a time
+
+        Returns:
+            Number of notifications sent
+        """
+        now = timezone.now()
+        total = 0
+        while True:
+            with transaction.atomic():
+                expired = list(
+                    cls._expired_claims(now)
+                    .select_for_update(skip_locked=True)
+                    .order_by("scheduled_for", "id")[:batch_size]
+                )
+                claimed = list(
+                    PushNotification.objects.select_for_update(skip_locked=True)
+                    .filter(
+                        status=PushNotification.Status.SCHEDULED,
+                        scheduled_for__lte=now,
+                    )
+                    .order_by("scheduled_for", "id")[: batch_size - len(expired)]
+                )
+                notifications = expired + claimed
+                # Renews the lease of the expired ones
+                PushNotification.objects.filter(
+                    id__in=[notification.id for notification in notifications]
+                ).update(status=PushNotification.Status.PENDING, modified=now)
+                NotificationCounter.track(
+                    [notification.user_id for notification in claimed],
+                    PushNotification.Status.SCHEDULED,
+                    PushNotification.Status.PENDING,
+                )
+            if not notifications:
+                return total
+            for notification in notifications:
+                notification.status = PushNotification.Status.PENDING
+            cls.send_stored(notifications)
+            total += len(notifications)
+
+    @classmethod
+    def send_stored(
+        cls, notifications: List[PushNotification]
+    ) -> List[PushNotification]:
+        """
+        Send notifications that are already saved, like the scheduled ones.
+
+        Notifications with the same title and body are sent together, each
+        send holding at most one notification per user so logs match it.
+        Every message keeps the data of its own notification.
+
+        Args:
+            notifications: The notifications to send
+
+        Returns:
+            The notifications, marked as sent or failed
+        """
+        devices_by_user: Dict[int, List[Device]] = {}
+        for device in (
+            Device.objects.filter(
+                user_id__in={notification.user_id for notification in notifications},
+                is_active=True,
+            )
+            .only("id", "user_id", "token")
+            .order_by("user_id", "id")
+        ):
+            devices_by_user.setdefault(device.user_id, []).append(device)
+
+        sends: Dict[Tuple, List[Dict[int, PushNotification]]] = {}
+        for notification in notifications:
+            content = (
+                notification.title,
+                notification.body,
+                notification.notification_type,
+            )
+            batches = sends.setdefault(content, [])
+            batch = next((b for b in batches if notification.user_id not in b), None)
+            if batch is None:
+                batch = {}
+                batches.append(batch)
+            batch[notification.user_id] = notification
+
+        for batches in sends.values():
+            for batch in batches:
+                first = next(iter(batch.values()))
+                payload = NotificationPayload(
+                    title=first.title,
+                    body=first.body,
+                    notification_type=first.notification_type,
+                )
+                devices = [
+                    device
+                    for user_id in batch
+                    for device in devices_by_user.get(user_id, [])
+                ]
+                success_by_user = (
+                    cls._dispatch(devices=devices, payload=payload, notifications=batch)
+                    if devices
+                    else Counter()
+                )
+                cls._record_results(list(batch.values()), success_by_user)
+
+        return notifications
+
+    @classmethod
+    def _record_results(
+        cls, notifications: List[PushNotification], success_by_user: Counter
+    ) -> None:
         """
-        # Build the Expo push message
+        Mark PENDING notifications as sent or failed after their dispatch.
+
+        Rows are only updated while still PENDING, so one read during the
+        dispatch stays read. They were counted when they became PENDING,
+        only the failed ones move the counters.
+        """
+        now = timezone.now()
+        sent_ids, failed_ids = [], []
+        for notification in notifications:
+            if success_by_user[notification.user_id] > 0:
+                notification.status = PushNotification.Status.SENT
+                notification.sent_at = now
+                sent_ids.append(notification.id)
+            else:
+                notification.status = PushNotification.Status.FAILED
+                failed_ids.append(notification.id)
+            notification.modified = now
+
+        pending = PushNotification.objects.filter(
+            status=PushNotification.Status.PENDING
+        )
+        if sent_ids:
+            pending.filter(id__in=sent_ids).update(
+                status=PushNotification.Status.SENT, sent_at=now, modified=now
+            )
+        if failed_ids:
+            failed_rows = list(
+                pending.filter(id__in=failed_ids).values_list("id", "user_id")
+            )
+            pending.filter(
+                id__in=[notification_id for notification_id, _ in failed_rows]
+            ).update(status=PushNotification.Status.FAILED, modified=now)
+            NotificationCounter.track(
+                [user_id for _, user_id in failed_rows],
+                PushNotification.Status.PENDING,
+                PushNotification.Status.FAILED,
+            )
+
+    @classmethod
+    def _build_message(
+        cls,
+        device: Device,
+        payload: NotificationPayload,
+        notification: Optional[PushNotification] = None,
+    ) -> Dict[str, Any]:
+        """Build the Expo push message for a device."""
         message = {
             "to": device.token,
             "title": payload.title,
@@ -173,8 +485,10 @@ class PushNotificationService:
             "channelId": payload.channel_id,
         }
 
-        if payload.data:
-            message["data"] = payload.data
+        # A stored notification may carry its own data, like its booking
+        data = notification.data if notification else payload.data
+        if data:
+            message["data"] = dict(data)
 
         if payload.badge is not None:
             message["badge"] = payload.badge
@@ -185,71 +499,151 @@ class PushNotificationService:
                 message["data"] = {}
             message["data"]["notification_id"] = notification.id
 
-        try:
-            response = requests.post(
-                EXPO_PUSH_URL,
-                json=[message],
-                headers={
-                    "Accept": "application/json",
-                    "Content-Type": "application/json",
-                },
-                timeout=10,
+        return message
+
+    @classmethod
+    def _dispatch(
+        cls,
+        devices: List[Device],
+        payload: NotificationPayload,
+        notifications: Dict[int, PushNotification],
+    ) -> Counter:
+        """
+        Send a push notification to devices in Expo batches.
+
+        Args:
+            devices: The devices to send the notification to
+            payload: The notification payload
+            notifications: Notification records by user ID (for logging)
+
+        Returns:
+            Number of successful deliveries per user ID
+        """
+        outgoing = [
+            (
+                device,
+                notifications.get(device.user_id),
+                cls._build_message(device, payload, notifications.get(device.user_id)),
             )
+            for device in devices
+        ]
 
-            response_data = response.json()
+        logs = []
+        dead_device_ids = []
+        success_by_user = Counter()
 
-            # Log the request/response
-            log_status = PushNotificationLog.Status.SUCCESS
-            error_message = None
-            expo_receipt_id = None
+        for start in range(0, len(outgoing), EXPO_BATCH_SIZE):
+            batch = outgoing[start : start + EXPO_BATCH_SIZE]
+            tickets, response_data, batch_error = cls._post_messages(
+                [message for _, _, message in batch]
+            )
 
-            if response.status_code == 200 and "data" in response_data:
-                ticket = response_data["data"][0]
-                if ticket.get("status") == "ok":
-                    expo_receipt_id = ticket.get("id")
+            for index, (device, notification, message) in enumerate(batch):
+                log_status = PushNotificationLog.Status.SUCCESS
+                error_message = None
+                expo_receipt_id = None
+                response_payload = response_data
+
+                if tickets is not None and index < len(tickets):
+                    ticket = tickets[index]
+                    response_payload = ticket
+                    if ticket.get("status") == "ok":
+                        expo_receipt_id = ticket.get("id")
+                    else:
+                        log_status = PushNotificationLog.Status.ERROR
+                        error_message = ticket.get("message", "Unknown error")
+
+                        # Handle invalid token
+                        if (ticket.get("details") or {}).get(
+                            "error"
+                        ) == "DeviceNotRegistered":
+                            dead_device_ids.append(device.id)
                 else:
                     log_status = PushNotificationLog.Status.ERROR
-                    error_message = ticket.get("message", "Unknown error")
-
-                    # Handle invalid token
-                    if ticket.get("details", {}).get("error") == "DeviceNotRegistered":
-                        device.is_active = False
-                        device.save()
-                        logger.info(f"Deactivated device {device.id} - not registered")
-            else:
-                log_status = PushNotificationLog.Status.ERROR
-                error_message = response_data.get("error", "HTTP error")
-
-            # Save log
-            if notification:
-                PushNotificationLog.objects.create(
-                    notification=notification,
-                    device=device,
-                    expo_push_token=device.token,
-                    request_payload=message,
-                    response_payload=response_data,
-                    status=log_status,
-                    expo_receipt_id=expo_receipt_id,
-                    error_message=error_message,
-                )
+                    error_message = batch_error or "Missing ticket"
+
+                if log_status == PushNotificationLog.Status.SUCCESS:
+                    success_by_user[device.user_id] += 1
+
+                # Save log
+                if notification:
+                    logs.append(
+                        PushNotificationLog(
+                            notification=notification,
+                            device_id=device.id,
+                            expo_push_token=device.token,
+                            request_payload=message,
+                            response_payload=response_payload,
+                            status=log_status,
+                            expo_receipt_id=expo_receipt_id,
+                            error_message=error_message,
+                        )
+                    )
+
+        PushNotificationLog.objects.bulk_create(logs, batch_size=LOG_BATCH_SIZE)
+
+        if dead_device_ids:
+            Device.objects.filter(id__in=dead_device_ids).update(is_active=False)
+            logger.info(f"Deactivated {len(dead_device_ids)} devices - not registered")
+
+        return success_by_user
 
-            return log_status == PushNotificationLog.Status.SUCCESS
+    @classmethod
+    def _post_messages(
+        cls, messages: List[Dict[str, Any]]
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Post a batch of messages to Expo.
 
-        except requests.RequestException as e:
+        Returns:
+            Tuple of (tickets in message order, raw response, error message)
+        """
+        try:
+            response = cls._get_session().post(
+                EXPO_PUSH_URL,
+                json=messages,
+                timeout=10,
+            )
+            response_data = response.json()
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Error sending push notification: {e}")
+            return None, None, str(e)
 
-            if notification:
-                PushNotificationLog.objects.create(
-                    notification=notification,
-                    device=device,
-                    expo_push_token=device.token,
-                    request_payload=message,
-                    response_payload=None,
-                    status=PushNotificationLog.Status.ERROR,
-                    error_message=str(e),
-                )
+        if not isinstance(response_data, dict):
+            return None, None, "Invalid response"
+
+        if response.status_code == 200 and isinstance(response_data.get("data"), list):
+            return response_data["data"], response_data, None
+
+        return None, response_data, str(response_data.get("errors", "HTTP error"))
 
-            return False
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Get the keep-alive HTTP session shared by this process."""
+        if cls._session is None:
+            session = requests.Session()
+            session.headers.update(
+                {
+                    "Accept": "application/json",
+                    "Accept-Encoding": "gzip, deflate",
+                    "Content-Type": "application/json",
+                }
+            )
+            session.mount("https://", HTTPAdapter(pool_maxsize=10))
+            cls._session = session
+        return cls._session
+
+    @staticmethod
+    def training_reminder_payload(
+        training_type: str, time: str, data: Optional[Dict[str, Any]] = None
+    ) -> NotificationPayload:
+        """Payload of a training reminder."""
+        return NotificationPayload(
+            title="Recordatorio de entrenamiento",
+            body=f"Tu clase de {training_type} comienza a las {time}. ¡No llegues tarde!",
+            notification_type=PushNotification.NotificationType.TRAINING_REMINDER,
+            data={"type": "training_reminder", **(data or {})},
+        )
 
     @classmethod
     def send_training_reminder(
@@ -259,12 +653,7 @@ class PushNotificationService:
         time: str,
     ) -> Optional[PushNotification]:
         """Send a training reminder notification."""
-        payload = NotificationPayload(
-            title="Recordatorio de entrenamiento",
-            body=f"Tu clase de {training_type} comienza a las {time}. ¡No llegues tarde!",
-            notification_type=PushNotification.NotificationType.TRAINING_REMINDER,
-            data={"type": "training_reminder"},
-        )
+        payload = cls.training_reminder_payload(training_type, time)
         return cls.send_to_user(user, payload)
 
     @classmethod
@@ -286,10 +675,10 @@ class PushNotificationService:
     @classmethod
     def send_membership_expiring(
         cls,
-        user: User,
+        user_ids: List[int],
         days_left: int,
-    ) -> Optional[PushNotification]:
-        """Send a membership expiring notification."""
+    ) -> List[PushNotification]:
+        """Send a membership expiring notification to some users."""
         if days_left == 1:
             body = "Tu membresía vence mañana. ¡Renuévala para seguir entrenando!"
         else:
@@ -301,21 +690,21 @@ class PushNotificationService:
             notification_type=PushNotification.NotificationType.MEMBERSHIP_EXPIRING,
             data={"type": "membership_expiring", "days_left": days_left},
         )
-        return cls.send_to_user(user, payload)
+        return cls.send_to_users(user_ids, payload)
 
     @classmethod
     def send_membership_expired(
         cls,
-        user: User,
-    ) -> Optional[PushNotification]:
-        """Send a membership expired notification."""
+        user_ids: List[int],
+    ) -> List[PushNotification]:
+        """Send a membership expired notification to some users."""
         payload = NotificationPayload(
             title="Membresía vencida",
             body="Tu membresía ha vencido. Renuévala para continuar con tus entrenamientos.",
             notification_type=PushNotification.NotificationType.MEMBERSHIP_EXPIRED,
             data={"type": "membership_expired"},
         )
-        return cls.send_to_user(user, payload)
+        return cls.send_to_users(user_ids, payload)
 
     @classmethod
     def send_achievement(
@@ -345,16 +734,151 @@ class PushNotificationService:
             Dictionary with receipt statuses
         """
         try:
-            response = requests.post(
+            response = cls._get_session().post(
                 EXPO_RECEIPTS_URL,
                 json={"ids": receipt_ids},
-                headers={
-                    "Accept": "application/json",
-                    "Content-Type": "application/json",
-                },
                 timeout=10,
             )
             return response.json()
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Error checking receipts: {e}")
             return {}
+
+    @classmethod
+    def process_receipts(cls) -> Dict[str, int]:
+        """
+        Fetch the Expo receipts of sent tickets and apply them.
+
+        Notifications with at least one delivered ticket become DELIVERED,
+        the ones whose tickets all failed become FAILED, and devices
+        reported as DeviceNotRegistered are deactivated. Receipts Expo has
+        not produced yet are left pending for the next run.
+
+        Returns:
+            Counts of checked receipts, delivered and failed notifications
+            and deactivated devices
+        """
+        now = timezone.now()
+        pending = PushNotificationLog.objects.filter(
+            expo_receipt_id__isnull=False,
+            receipt_checked_at__isnull=True,
+        )
+
+        # Expo drops receipts after RECEIPT_TTL, nothing left to ask for
+        pending.filter(created__lt=now - RECEIPT_TTL).update(
+            receipt_checked_at=now, modified=now
+        )
+
+        pending = pending.filter(
+            created__gte=now - RECEIPT_TTL, created__lte=now - RECEIPT_DELAY
+        ).only(
+            "id",
+            "notification_id",
+            "device_id",
+            "expo_receipt_id",
+            "status",
+            "error_message",
+        )
+
+        totals = Counter()
+        last_id = 0
+        while True:
+            logs = list(
+                pending.filter(id__gt=last_id).order_by("id")[:RECEIPT_BATCH_SIZE]
+            )
+            if not logs:
+                break
+            last_id = logs[-1].id
+            totals.update(cls._apply_receipts(logs, now))
+
+        if totals["checked"]:
+            logger.info(
+                f"Processed {totals['checked']} receipts: "
+                f"{totals['delivered']} delivered, {totals['failed']} failed, "
+                f"{totals['deactivated']} devices deactivated"
+            )
+        return {
+            "checked": totals["checked"],
+            "delivered": totals["delivered"],
+            "failed": totals["failed"],
+            "deactivated": totals["deactivated"],
+        }
+
+    @classmethod
+    def _apply_receipts(cls, logs: List[PushNotificationLog], now) -> Counter:
+        """Query the receipts of a batch of logs and write the outcome."""
+        response = cls.check_receipts([log.expo_receipt_id for log in logs])
+        receipts = response.get("data") if isinstance(response, dict) else None
+        if not isinstance(receipts, dict):
+            return Counter()
+
+        checked = []
+        delivered_ids = set()
+        failed_ids = set()
+        dead_device_ids = set()
+        for log in logs:
+            receipt = receipts.get(log.expo_receipt_id)
+            if receipt is None:
+                continue
+
+            log.receipt_checked_at = now
+            log.modified = now
+            checked.append(log)
+            if receipt.get("status") == "ok":
+                delivered_ids.add(log.notification_id)
+                continue
+
+            log.status = PushNotificationLog.Status.ERROR
+            log.error_message = receipt.get("message", "Unknown error")
+            failed_ids.add(log.notification_id)
+            if (receipt.get("details") or {}).get("error") == "DeviceNotRegistered":
+                if log.device_id:
+                    dead_device_ids.add(log.device_id)
+
+        if not checked:
+            return Counter()
+
+        PushNotificationLog.objects.bulk_update(
+            checked,
+            ["status", "error_message", "receipt_checked_at", "modified"],
+            batch_size=LOG_BATCH_SIZE,
+        )
+
+        # Only SENT notifications move, READ ones keep their status
+        delivered = PushNotification.objects.filter(
+            id__in=delivered_ids, status=PushNotification.Status.SENT
+        ).update(status=PushNotification.Status.DELIVERED, modified=now)
+
+        # Failed once no ticket is left delivered or waiting for a receipt
+        failed_rows = list(
+            PushNotification.objects.filter(
+                id__in=failed_ids - delivered_ids,
+                status=PushNotification.Status.SENT,
+            )
+            .exclude(logs__status=PushNotificationLog.Status.SUCCESS)
+            .values_list("id", "user_id")
+        )
+        failed = 0
+        if failed_rows:
+            failed = PushNotification.objects.filter(
+                id__in=[notification_id for notification_id, _ in failed_rows],
+                status=PushNotification.Status.SENT,
+            ).update(status=PushNotification.Status.FAILED, modified=now)
+            NotificationCounter.track(
+                [user_id for _, user_id in failed_rows],
+                PushNotification.Status.SENT,
+                PushNotification.Status.FAILED,
+            )
+
+        deactivated = 0
+        if dead_device_ids:
+            deactivated = Device.objects.filter(
+                id__in=dead_device_ids, is_active=True
+            ).update(is_active=False, modified=now)
+
+        return Counter(
+            checked=len(checked),
+            delivered=delivered,
+            failed=failed,
+            deactivated=deactivated,
+        )
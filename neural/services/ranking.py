@@ -0,0 +1,76 @@
+"""Yearly ranking service."""
+
+import logging
+from typing import List
+
+from django.db import transaction
+from django.db.models import Count, F, Window
+from django.db.models.functions import Rank
+from django.utils import timezone
+
+from neural.training.models import UserTraining
+from neural.users.models import Ranking
+
+logger = logging.getLogger(__name__)
+
+RANKING_BATCH_SIZE = 500
+
+
+class RankingService:
+    """Service for the yearly training ranking."""
+
+    COUNTED_STATUSES = [UserTraining.Status.CONFIRMED, UserTraining.Status.DONE]
+
+    @classmethod
+    def compute(cls, year: int) -> List[dict]:
+        """
+        Rank users by trainings in a year with a single window query.
+
+        Users with the same number of trainings share a position.
+
+        Returns:
+            Rows with user_id, trainings and position, best first
+        """
+        return list(
+            UserTraining.objects.filter(
+                slot__date__year=year, status__in=cls.COUNTED_STATUSES
+            )
+            .values("user_id")
+            .annotate(
+                trainings=Count("id"),
+                position=Window(expression=Rank(), order_by=F("trainings").desc()),
+            )
+            .order_by("position", "user_id")
+        )
+
+    @classmethod
+    def generate(cls, year: int) -> List[Ranking]:
+        """
+        Replace the rankings of a year.
+
+        The old rows are swapped for the new ones in one transaction, so
+        readers see either the previous or the new ranking, never an
+        empty one. Other years are not touched.
+
+        Returns:
+            The created rankings
+        """
+        now = timezone.now()
+        rankings = [
+            Ranking(
+                user_id=row["user_id"],
+                year=year,
+                position=row["position"],
+                trainings=row["trainings"],
+                created=now,
+                modified=now,
+            )
+            for row in cls.compute(year)
+        ]
+
+        with transaction.atomic():
+            Ranking.objects.filter(year=year).delete()
+            Ranking.objects.bulk_create(rankings, batch_size=RANKING_BATCH_SIZE)
+
+        logger.info(f"Generated {len(rankings)} rankings for {year}")
+        return rankings
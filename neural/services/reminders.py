@@ -0,0 +1,143 @@
+"""Training reminder scheduling service."""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable, List
+
+from django.utils import timezone
+
+from neural.services.push_notifications import PushNotificationService
+from neural.training.models import UserTraining
+from neural.users.models import PushNotification
+
+logger = logging.getLogger(__name__)
+
+REMINDER_BATCH_SIZE = 500
+
+
+class ReminderService:
+    """Service that schedules one push reminder per confirmed booking.
+
+    Reminders are stored as SCHEDULED notifications due ``LEAD`` before
+    the class starts and sent by ``PushNotificationService.send_due``.
+    Each one is keyed by its booking in ``broadcast_key``, so a booking
+    can never get two reminders.
+    """
+
+    LEAD = timedelta(hours=1)
+    # Upcoming bookings checked by the sync
+    SYNC_WINDOW = timedelta(days=2)
+
+    @staticmethod
+    def key(training_id: int) -> str:
+        """Reminder key of a booking."""
+        return f"reminder-{training_id}"
+
+    @classmethod
+    def schedule(cls, trainings: Iterable[UserTraining]) -> List[PushNotification]:
+        """
+        Schedule the reminders of some confirmed bookings.
+
+        Bookings of classes that already started get none, and the ones
+        starting within ``LEAD`` get theirs right away.
+
+        Args:
+            trainings: Bookings with their slot, class and training type
+
+        Returns:
+            The reminders to create, existing ones are left as they are
+        """
+        now = timezone.now()
+        reminders = []
+        for training in trainings:
+            session = training.slot.class_training
+            if session is None:
+                continue
+            starts_at = timezone.make_aware(
+                datetime.combine(training.slot.date, session.hour_init)
+            )
+            if starts_at <= now:
+                continue
+            payload = PushNotificationService.training_reminder_payload(
+                session.training_type.name,
+                session.hour_init.strftime("%H:%M"),
+                data={"user_training_id": training.id},
+            )
+            reminders.append(
+                PushNotification(
+                    user_id=training.user_id,
+                    title=payload.title,
+                    body=payload.body,
+                    data=payload.data,
+                    notification_type=payload.notification_type,
+                    status=PushNotification.Status.SCHEDULED,
+                    scheduled_for=max(starts_at - cls.LEAD, now),
+                    broadcast_key=cls.key(training.id),
+                    created=now,
+                    modified=now,
+                )
+            )
+        # Conflicts are bookings that already have their reminder
+        PushNotification.objects.bulk_create(
+            reminders, batch_size=REMINDER_BATCH_SIZE, ignore_conflicts=True
+        )
+        return reminders
+
+    @classmethod
+    def revoke(cls, training_ids: Iterable[int]) -> int:
+        """
+        Drop the reminders of cancelled bookings that were not sent yet.
+
+        Returns:
+            Number of reminders revoked
+        """
+        revoked, _ = PushNotification.objects.filter(
+            broadcast_key__in=[cls.key(training_id) for training_id in training_ids],
+            status=PushNotification.Status.SCHEDULED,
+        ).delete()
+        return revoked
+
+    @classmethod
+    def sync(cls) -> dict:
+        """
+        Match the pending reminders with the upcoming confirmed bookings.
+
+        Covers bookings changed outside ``BookingService``, like admin
+        edits, and the ones made before reminders were scheduled.
+
+        Returns:
+            Number of reminders scheduled and revoked
+        """
+        today = timezone.localdate()
+        upcoming = list(
+            UserTraining.objects.filter(
+                status=UserTraining.Status.CONFIRMED,
+                slot__date__range=(today, today + cls.SYNC_WINDOW),
+            ).select_related("slot__class_training__training_type")
+        )
+        existing = set(
+            PushNotification.objects.filter(
+                broadcast_key__in=[cls.key(training.id) for training in upcoming]
+            ).values_list("broadcast_key", flat=True)
+        )
+        scheduled = cls.schedule(
+            [training for training in upcoming if cls.key(training.id) not in existing]
+        )
+
+        pending_ids = set(
+            PushNotification.objects.filter(
+                status=PushNotification.Status.SCHEDULED,
+                notification_type=PushNotification.NotificationType.TRAINING_REMINDER,
+            ).values_list("data__user_training_id", flat=True)
+        )
+        confirmed_ids = set(
+            UserTraining.objects.filter(
+                id__in=pending_ids, status=UserTraining.Status.CONFIRMED
+            ).values_list("id", flat=True)
+        )
+        revoked = cls.revoke(pending_ids - confirmed_ids)
+
+        logger.info(
+            f"Training reminders synced: {len(scheduled)} scheduled, {revoked} revoked"
+        )
+        return {"scheduled": len(scheduled), "revoked": revoked}
@@ -0,0 +1,179 @@
+"""Notification retention service."""
+
+import gzip
+import json
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, Q, QuerySet
+from django.utils import timezone
+
+from neural.users.models import (
+    NotificationCounter,
+    PushNotification,
+    PushNotificationLog,
+)
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DIR = "retention"
+
+
+class RetentionService:
+    """Service that purges old push notifications and their Expo logs.
+
+    Notifications are kept ``NOTIFICATION_RETENTION_DAYS[type]`` days, or
+    the ``"default"`` entry for types without their own TTL, counted from
+    the due time of the scheduled ones. SCHEDULED ones are kept until they
+    are sent, however far ahead they were queued. Logs carry the full Expo
+    payloads and are kept ``NOTIFICATION_LOG_RETENTION_DAYS`` days,
+    whatever their notification.
+
+    Rows are deleted by primary key in chunks of
+    ``NOTIFICATION_RETENTION_BATCH_SIZE``, each one in its own transaction,
+    so no lock is held for longer than a chunk.
+    """
+
+    @classmethod
+    def cutoffs(cls, now: Optional[datetime] = None) -> Dict[str, datetime]:
+        """Return the creation date before which each notification type expires."""
+        now = now or timezone.now()
+        days = settings.NOTIFICATION_RETENTION_DAYS
+        return {
+            notification_type: now
+            - timedelta(days=days.get(notification_type, days["default"]))
+            for notification_type in PushNotification.NotificationType.values
+        }
+
+    @classmethod
+    def purge(
+        cls,
+        dry_run: bool = False,
+        export: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+    ) -> Dict:
+        """
+        Delete the expired notification logs and notifications.
+
+        Logs go first, so deleting a notification chunk does not cascade
+        into a large number of logs.
+
+        Args:
+            dry_run: Only count the expired rows
+            export: Save each chunk as a JSONL.gz file on the media storage
+                before deleting it, ``NOTIFICATION_RETENTION_EXPORT`` when None
+            batch_size: Rows per chunk, ``NOTIFICATION_RETENTION_BATCH_SIZE``
+                when None
+
+        Returns:
+            Report with the rows deleted per table and type and the
+            exported files
+        """
+        now = timezone.now()
+        if export is None:
+            export = settings.NOTIFICATION_RETENTION_EXPORT
+        batch_size = batch_size or settings.NOTIFICATION_RETENTION_BATCH_SIZE
+
+        log_cutoff = now - timedelta(days=settings.NOTIFICATION_LOG_RETENTION_DAYS)
+        logs = PushNotificationLog.objects.filter(created__lt=log_cutoff)
+
+        by_type = Q()
+        for notification_type, cutoff in cls.cutoffs(now).items():
+            # Scheduled ones age from their due time, created is before it
+            by_type |= Q(notification_type=notification_type, created__lt=cutoff) & (
+                Q(scheduled_for__isnull=True) | Q(scheduled_for__lt=cutoff)
+            )
+        notifications = PushNotification.objects.filter(by_type).exclude(
+            status=PushNotification.Status.SCHEDULED
+        )
+
+        report = {"logs": 0, "notifications": {}, "files": [], "dry_run": dry_run}
+        if dry_run:
+            report["logs"] = logs.count()
+            report["notifications"] = dict(
+                notifications.values_list("notification_type")
+                .annotate(count=Count("id"))
+                .order_by()
+            )
+            return report
+
+        for rows in cls._chunks(logs, batch_size, now, export, report):
+            PushNotificationLog.objects.filter(
+                id__in=[row["id"] for row in rows]
+            ).delete()
+            report["logs"] += len(rows)
+
+        deleted = Counter()
+        for rows in cls._chunks(notifications, batch_size, now, export, report):
+            with transaction.atomic():
+                # Statuses may have changed since the chunk was read, lock
+                # the rows so the counters move by the ones being deleted
+                locked = list(
+                    notifications.select_for_update()
+                    .filter(id__in=[row["id"] for row in rows])
+                    .values_list("id", "user_id", "status", "notification_type")
+                )
+                PushNotification.objects.filter(
+                    id__in=[notification_id for notification_id, *_ in locked]
+                ).delete()
+                # Deletes bypass the counters, take each notification out
+                for status in {status for _, _, status, _ in locked}:
+                    NotificationCounter.track(
+                        [user_id for _, user_id, other, _ in locked if other == status],
+                        old_status=status,
+                    )
+            deleted.update(notification_type for *_, notification_type in locked)
+        report["notifications"] = dict(deleted)
+
+        logger.info(
+            f"Notification retention: {report['logs']} logs and "
+            f"{sum(report['notifications'].values())} notifications deleted, "
+            f"{len(report['files'])} files exported"
+        )
+        return report
+
+    @classmethod
+    def _chunks(
+        cls,
+        queryset: QuerySet,
+        batch_size: int,
+        now: datetime,
+        export: bool,
+        report: Dict,
+    ):
+        """
+        Yield the expired rows in primary key order, one chunk at a time.
+
+        Each chunk is exported before it is yielded, so a failed upload
+        stops the purge before anything is lost.
+        """
+        last_id = 0
+        while True:
+            rows = list(
+                queryset.filter(id__gt=last_id).order_by("id").values()[:batch_size]
+            )
+            if not rows:
+                return
+            last_id = rows[-1]["id"]
+            if export:
+                report["files"].append(cls._export(queryset.model, rows, now))
+            yield rows
+
+    @staticmethod
+    def _export(model, rows: List[Dict], now: datetime) -> str:
+        """Save rows as a gzipped JSON lines file and return its storage name."""
+        lines = "".join(json.dumps(row, cls=DjangoJSONEncoder) + "\n" for row in rows)
+        name = (
+            f"{EXPORT_DIR}/{model._meta.model_name}/{now:%Y-%m-%d}/"
+            f"{rows[0]['id']}-{rows[-1]['id']}.jsonl.gz"
+        )
+        return default_storage.save(
+            name, ContentFile(gzip.compress(lines.encode("utf-8")))
+        )
@@ -0,0 +1,100 @@
+"""Schedule materialization service."""
+
+import logging
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from django.utils import timezone
+
+from neural.services.calendar import CalendarService
+from neural.training.models import Classes, Slot
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_BATCH_SIZE = 500
+
+
+class ScheduleService:
+    """Service that turns the weekly ``Classes`` timetable into ``Slot`` rows.
+
+    Slots are unique per date and class, so materializing the same range
+    twice only creates what is missing.
+    """
+
+    # Days ahead that always have slots, besides today
+    HORIZON_DAYS = 7
+
+    # Classes.day of each date.weekday()
+    WEEKDAYS = [
+        Classes.DaysChoices.MONDAY,
+        Classes.DaysChoices.TUESDAY,
+        Classes.DaysChoices.WEDNESDAY,
+        Classes.DaysChoices.THURSDAY,
+        Classes.DaysChoices.FRIDAY,
+        Classes.DaysChoices.SATURDAY,
+        Classes.DaysChoices.SUNDAY,
+    ]
+
+    @classmethod
+    def materialize(
+        cls,
+        start: Optional[date] = None,
+        days: int = HORIZON_DAYS,
+        catch_up: bool = False,
+    ) -> List[Slot]:
+        """
+        Create the missing slots from ``start`` up to ``days`` days ahead.
+
+        Past days are never filled, nobody can book their slots.
+
+        Args:
+            start: First day to fill, today when not provided
+            days: Days after ``start`` to fill
+            catch_up: Fill from today even when ``start`` is later, so the
+                days an outage left without slots get them
+
+        Returns:
+            The created slots
+        """
+        today = timezone.localdate()
+        start = start or today
+        end = start + timedelta(days=days)
+        first = today if catch_up else max(start, today)
+        days_to_fill = [
+            first + timedelta(days=offset) for offset in range((end - first).days + 1)
+        ]
+        if not days_to_fill:
+            return []
+
+        classes_by_day: Dict[str, List[Classes]] = {}
+        for session in Classes.objects.select_related("training_type"):
+            classes_by_day.setdefault(session.day, []).append(session)
+
+        existing = set(
+            Slot.objects.filter(
+                date__range=(days_to_fill[0], end), class_training__isnull=False
+            ).values_list("date", "class_training_id")
+        )
+
+        now = timezone.now()
+        slots = [
+            Slot(
+                date=day,
+                class_training=session,
+                max_places=session.capacity,
+                created=now,
+                modified=now,
+            )
+            for day in days_to_fill
+            for session in classes_by_day.get(cls.WEEKDAYS[day.weekday()], [])
+            if (day, session.id) not in existing
+        ]
+
+        # Conflicts come from a concurrent run, those slots already exist
+        Slot.objects.bulk_create(
+            slots, batch_size=SCHEDULE_BATCH_SIZE, ignore_conflicts=True
+        )
+        CalendarService.invalidate(sorted({slot.date for slot in slots}))
+
+        logger.info(f"Materialized {len(slots)} slots from {days_to_fill[0]} to {end}")
+        return slots
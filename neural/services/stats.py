@@ -0,0 +1,281 @@
+"""Weekly stats and streaks service."""
+
+import logging
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models.functions import ExtractIsoYear, ExtractWeek
+from django.utils import timezone
+
+from neural.services.dashboard import DashboardService
+from neural.services.year_review import YearReviewService
+from neural.training.models import UserTraining
+from neural.users.models import User, UserStats, UserStrike, YearReviewSnapshot
+
+logger = logging.getLogger(__name__)
+
+STATS_BATCH_SIZE = 1000
+
+
+class StatsService:
+    """Service for the weekly ``UserStats`` and the ``UserStrike`` streaks.
+
+    Weeks are ISO weeks keyed by their ISO year, so the last days of
+    December that belong to week 1 count for the next year.
+    """
+
+    COUNTED_STATUSES = [UserTraining.Status.CONFIRMED, UserTraining.Status.DONE]
+    CALORIES_PER_TRAINING = 400
+    HOURS_PER_TRAINING = 1
+
+    @staticmethod
+    def week_of(day: date) -> Tuple[int, int]:
+        """Return the ``(year, week)`` stats key of a day."""
+        iso = day.isocalendar()
+        return iso[0], iso[1]
+
+    @staticmethod
+    def _week_index(year: int, week: int) -> int:
+        """Monotonic week number, consecutive weeks differ by one."""
+        return date.fromisocalendar(year, week, 1).toordinal() // 7
+
+    @classmethod
+    def rebuild(
+        cls,
+        year: int,
+        user_ids: Optional[List[int]] = None,
+        dry_run: bool = False,
+    ) -> Dict:
+        """
+        Rebuild the weekly stats of a year and the streaks of its users.
+
+        Trainings of the year are loaded with one query and bucketed by ISO
+        week in memory. Streaks are derived from the distinct active weeks
+        of the whole history, loaded with a second query, so they carry
+        over year boundaries.
+
+        Args:
+            year: ISO year to rebuild
+            user_ids: Users to rebuild, every user with trainings or stats
+                in the year when None
+            dry_run: Compute everything without writing
+
+        Returns:
+            Report with counts and the time spent in each phase
+        """
+        timings = {}
+        started = time.monotonic()
+
+        trainings = UserTraining.objects.filter(status__in=cls.COUNTED_STATUSES)
+        stats = UserStats.objects.filter(year=year)
+        if user_ids is not None:
+            trainings = trainings.filter(user_id__in=user_ids)
+            stats = stats.filter(user_id__in=user_ids)
+
+        # Trainings per user and ISO week of the year
+        weeks_in_year = date(year, 12, 28).isocalendar()[1]
+        counts: Dict[int, List[int]] = {}
+        for user_id, day in trainings.filter(slot__date__iso_year=year).values_list(
+            "user_id", "slot__date"
+        ):
+            buckets = counts.setdefault(user_id, [0] * (weeks_in_year + 1))
+            buckets[day.isocalendar()[1]] += 1
+
+        scope = set(counts) | set(user_ids or [])
+        if user_ids is None:
+            scope |= set(stats.values_list("user_id", flat=True).distinct())
+        timings["load"] = time.monotonic() - started
+
+        # Active weeks of the whole history for the streaks
+        step = time.monotonic()
+        active_weeks = cls._active_weeks(trainings)
+
+        now = timezone.now()
+        current_index = cls._week_index(*cls.week_of(timezone.localdate()))
+        stats_rows = [
+            UserStats(
+                user_id=user_id,
+                year=year,
+                week=week,
+                trainings=count,
+                calories=count * cls.CALORIES_PER_TRAINING,
+                hours=count * cls.HOURS_PER_TRAINING,
+                created=now,
+                modified=now,
+            )
+            for user_id, buckets in counts.items()
+            for week, count in enumerate(buckets)
+            if count
+        ]
+        strikes = [
+            strike
+            for user_id in scope
+            for strike in cls._streaks(
+                user_id, sorted(active_weeks.get(user_id, [])), current_index
+            )
+        ]
+        timings["compute"] = time.monotonic() - step
+
+        step = time.monotonic()
+        if not dry_run:
+            with transaction.atomic():
+                # Weeks without trainings keep no counts
+                UserStats.objects.filter(year=year, user_id__in=scope).exclude(
+                    trainings=0, calories=0, hours=0
+                ).update(trainings=0, calories=0, hours=0, modified=now)
+                UserStats.objects.bulk_create(
+                    stats_rows,
+                    batch_size=STATS_BATCH_SIZE,
+                    update_conflicts=True,
+                    unique_fields=["user", "year", "week"],
+                    update_fields=["trainings", "calories", "hours", "modified"],
+                )
+                UserStrike.objects.filter(user_id__in=scope).delete()
+                UserStrike.objects.bulk_create(strikes, batch_size=STATS_BATCH_SIZE)
+                YearReviewSnapshot.objects.filter(
+                    year=year, user_id__in=scope, is_stale=False
+                ).update(is_stale=True)
+        timings["write"] = time.monotonic() - step
+        timings["total"] = time.monotonic() - started
+
+        report = {
+            "year": year,
+            "users": len(scope),
+            "stats": len(stats_rows),
+            "strikes": len(strikes),
+            "current_strikes": sum(1 for strike in strikes if strike.is_current),
+            "dry_run": dry_run,
+            "timings": timings,
+        }
+        logger.info(f"Stats rebuild: {report}")
+        return report
+
+    @classmethod
+    def record_training_event(cls, user_id: int, day: date) -> None:
+        """
+        Queue the stats refresh for a booking or cancellation.
+
+        The refresh runs in Celery once the surrounding transaction
+        commits, so it always sees the booking change.
+        """
+        from neural.training.tasks import refresh_training_stats
+
+        transaction.on_commit(
+            lambda: refresh_training_stats.delay(user_id, day.isoformat())
+        )
+
+    @classmethod
+    def refresh_user_week(cls, user_id: int, day: date) -> UserStats:
+        """
+        Recompute the stats of the week of ``day`` and the user's streaks.
+
+        Both are derived from the stored trainings rather than adjusted by
+        a delta, so running the same event twice gives the same result.
+
+        Returns:
+            The stats of the week
+        """
+        year, week = cls.week_of(day)
+        count = UserTraining.objects.filter(
+            user_id=user_id,
+            status__in=cls.COUNTED_STATUSES,
+            slot__date__iso_year=year,
+            slot__date__week=week,
+        ).count()
+
+        now = timezone.now()
+        stats = UserStats(
+            user_id=user_id,
+            year=year,
+            week=week,
+            trainings=count,
+            calories=count * cls.CALORIES_PER_TRAINING,
+            hours=count * cls.HOURS_PER_TRAINING,
+            created=now,
+            modified=now,
+        )
+        UserStats.objects.bulk_create(
+            [stats],
+            update_conflicts=True,
+            unique_fields=["user", "year", "week"],
+            update_fields=["trainings", "calories", "hours", "modified"],
+        )
+        cls.refresh_streaks(user_id)
+
+        # Bulk writes do not send post_save
+        DashboardService.invalidate(user_id)
+        YearReviewService.mark_stale(user_id, [year])
+        return stats
+
+    @classmethod
+    def refresh_streaks(cls, user_id: int) -> List[UserStrike]:
+        """
+        Replace the strikes of a user with the ones of their history.
+
+        The user row is locked first, so concurrent refreshes of one user
+        rebuild one at a time, each from the history the previous one
+        left, instead of both inserting a current strike.
+        """
+        current_index = cls._week_index(*cls.week_of(timezone.localdate()))
+        with transaction.atomic():
+            # Serializes the refreshes of this user
+            list(User.objects.select_for_update().filter(pk=user_id).values("pk"))
+            trainings = UserTraining.objects.filter(
+                user_id=user_id, status__in=cls.COUNTED_STATUSES
+            )
+            strikes = cls._streaks(
+                user_id,
+                sorted(cls._active_weeks(trainings).get(user_id, [])),
+                current_index,
+            )
+            UserStrike.objects.filter(user_id=user_id).delete()
+            UserStrike.objects.bulk_create(strikes)
+        return strikes
+
+    @classmethod
+    def _active_weeks(cls, trainings) -> Dict[int, List[int]]:
+        """Distinct active week indexes per user, from one query."""
+        active_weeks: Dict[int, List[int]] = {}
+        history = (
+            trainings.annotate(
+                iso_year=ExtractIsoYear("slot__date"), week=ExtractWeek("slot__date")
+            )
+            .values_list("user_id", "iso_year", "week")
+            .order_by()
+            .distinct()
+        )
+        for user_id, iso_year, week in history:
+            active_weeks.setdefault(user_id, []).append(cls._week_index(iso_year, week))
+        return active_weeks
+
+    @classmethod
+    def _streaks(
+        cls, user_id: int, week_indexes: List[int], current_index: int
+    ) -> List[UserStrike]:
+        """
+        Build one strike per run of consecutive active weeks.
+
+        The last run stays current while it reaches this week or the
+        previous one, since the current week may have no training yet.
+        """
+        runs = []
+        for index in week_indexes:
+            if runs and index == runs[-1][1] + 1:
+                runs[-1][1] = index
+            else:
+                runs.append([index, index])
+
+        strikes = []
+        for position, (first, last) in enumerate(runs):
+            is_last = position == len(runs) - 1
+            strikes.append(
+                UserStrike(
+                    user_id=user_id,
+                    weeks=last - first + 1,
+                    is_current=is_last and last >= current_index - 1,
+                    last_week=date.fromordinal(last * 7 + 1).isocalendar()[1],
+                )
+            )
+        return strikes
@@ -0,0 +1,215 @@
+"""Weekly timetable import service."""
+
+import json
+import logging
+from datetime import datetime, time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+from django.db import transaction
+from django.db.models import Case, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from neural.services.calendar import CalendarService
+from neural.training.models import Classes, Slot, TrainingType
+
+logger = logging.getLogger(__name__)
+
+TIMETABLE_BATCH_SIZE = 500
+
+# (day, training type id, hour init, hour end), as in unique_class_combination
+ClassKey = Tuple[str, int, time, time]
+
+
+class TimetableError(Exception):
+    """Raised when a timetable file is not valid."""
+
+
+class TimetableService:
+    """Service that syncs the ``Classes`` rows with a timetable file.
+
+    The file maps each day to training type slugs and their classes::
+
+        MONDAY:
+          funcional-training:
+            - "05:00-06:00"
+            - {init: "06:00", end: "07:00", max_places: 12}
+
+    Classes are matched on day, training type and hours. The file is the
+    source of truth: missing classes are created, changed places updated
+    and classes no longer listed deleted, unless they have bookings.
+    """
+
+    @classmethod
+    def load(cls, path: str) -> Dict[ClassKey, Optional[int]]:
+        """
+        Read a YAML or JSON timetable file.
+
+        Returns:
+            The places override of each class, keyed like ``Classes``
+
+        Raises:
+            TimetableError: If the file cannot be read or is not valid
+        """
+        try:
+            content = Path(path).read_text()
+            if path.endswith(".json"):
+                data = json.loads(content)
+            else:
+                data = yaml.safe_load(content)
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            raise TimetableError(f"Cannot read {path}: {e}")
+        if not isinstance(data, dict):
+            raise TimetableError("The timetable must map days to training types")
+
+        days = set(Classes.DaysChoices.values)
+        unknown_days = sorted(set(data) - days)
+        if unknown_days:
+            raise TimetableError(f"Unknown days: {', '.join(unknown_days)}")
+
+        slugs = {slug for types in data.values() for slug in (types or {})}
+        type_ids = dict(
+            TrainingType.objects.filter(slug_name__in=slugs).values_list(
+                "slug_name", "id"
+            )
+        )
+        unknown_types = sorted(slugs - set(type_ids))
+        if unknown_types:
+            raise TimetableError(f"Unknown training types: {', '.join(unknown_types)}")
+
+        timetable = {}
+        for day, types in data.items():
+            for slug, entries in (types or {}).items():
+                for entry in entries or []:
+                    hour_init, hour_end, max_places = cls._parse_entry(entry)
+                    key = (day, type_ids[slug], hour_init, hour_end)
+                    if key in timetable:
+                        raise TimetableError(f"Duplicated class: {day} {slug} {entry}")
+                    timetable[key] = max_places
+        return timetable
+
+    @classmethod
+    def diff(cls, timetable: Dict[ClassKey, Optional[int]]) -> Dict[str, List]:
+        """
+        Compare a timetable with the stored classes.
+
+        Returns:
+            Dict with the classes to ``create``, the ``(class, old places)``
+            pairs to ``update``, the classes to ``delete`` and the ones
+            ``kept`` because they have bookings
+        """
+        current = {
+            (c.day, c.training_type_id, c.hour_init, c.hour_end): c
+            for c in Classes.objects.select_related("training_type")
+        }
+        booked = set(
+            Classes.objects.filter(slots__user_trainings__isnull=False)
+            .values_list("id", flat=True)
+            .distinct()
+        )
+
+        training_types = TrainingType.objects.in_bulk({key[1] for key in timetable})
+
+        changes = {"create": [], "update": [], "delete": [], "kept": []}
+        for key, max_places in timetable.items():
+            session = current.get(key)
+            if session is None:
+                day, training_type_id, hour_init, hour_end = key
+                changes["create"].append(
+                    Classes(
+                        day=day,
+                        training_type=training_types[training_type_id],
+                        hour_init=hour_init,
+                        hour_end=hour_end,
+                        max_places=max_places,
+                    )
+                )
+            elif session.max_places != max_places:
+                changes["update"].append((session, session.max_places))
+                session.max_places = max_places
+
+        for key, session in current.items():
+            if key not in timetable:
+                bucket = "kept" if session.id in booked else "delete"
+                changes[bucket].append(session)
+        return changes
+
+    @classmethod
+    def apply(cls, changes: Dict[str, List]) -> None:
+        """
+        Write a diff in one transaction.
+
+        Upcoming slots of updated classes take their new places, never
+        less than the places already booked.
+        """
+        now = timezone.now()
+        updated = [session for session, _ in changes["update"]]
+        for session in changes["create"] + updated:
+            session.modified = now
+
+        # Upcoming days whose capacity changes
+        touched = Slot.objects.filter(
+            class_training__in=updated + changes["delete"],
+            date__gte=timezone.localdate(),
+        )
+
+        with transaction.atomic():
+            dates = set(touched.values_list("date", flat=True))
+            Classes.objects.bulk_create(
+                changes["create"], batch_size=TIMETABLE_BATCH_SIZE
+            )
+            Classes.objects.bulk_update(
+                updated, ["max_places", "modified"], batch_size=TIMETABLE_BATCH_SIZE
+            )
+            Classes.objects.filter(
+                id__in=[session.id for session in changes["delete"]]
+            ).delete()
+            if updated:
+                touched.filter(class_training__in=updated).update(
+                    max_places=Greatest(
+                        Case(
+                            *[
+                                When(
+                                    class_training_id=session.id,
+                                    then=Value(session.capacity),
+                                )
+                                for session in updated
+                            ]
+                        ),
+                        "confirmed_count",
+                    ),
+                    modified=now,
+                )
+
+        CalendarService.invalidate(dates)
+        logger.info(
+            f"Timetable applied: {len(changes['create'])} created, "
+            f"{len(updated)} updated, {len(changes['delete'])} deleted"
+        )
+
+    @staticmethod
+    def _parse_entry(entry) -> Tuple[time, time, Optional[int]]:
+        """Parse a ``"HH:MM-HH:MM"`` string or an init/end mapping."""
+        max_places = None
+        if isinstance(entry, str):
+            init, _, end = entry.partition("-")
+        elif isinstance(entry, dict):
+            init, end = entry.get("init", ""), entry.get("end", "")
+            max_places = entry.get("max_places")
+        else:
+            raise TimetableError(f"Invalid class: {entry}")
+
+        try:
+            hour_init = datetime.strptime(str(init).strip(), "%H:%M").time()
+            hour_end = datetime.strptime(str(end).strip(), "%H:%M").time()
+        except ValueError:
+            raise TimetableError(f"Invalid hours, use HH:MM: {entry}")
+        if hour_end <= hour_init:
+            raise TimetableError(f"Class ends before it starts: {entry}")
+        if max_places is not None and (
+            not isinstance(max_places, int) or max_places < 0
+        ):
+            raise TimetableError(f"Invalid max_places: {entry}")
+        return hour_init, hour_end, max_places
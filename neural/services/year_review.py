@@ -0,0 +1,281 @@
+"""Year in review snapshot service."""
+
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from django.core.cache import cache
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import ExtractHour, ExtractMonth, ExtractWeekDay
+from django.utils import timezone
+
+from neural.training.models import Slot, UserTraining
+from neural.users.models import (
+    Ranking,
+    User,
+    UserStats,
+    UserStrike,
+    YearReviewSnapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+COUNTED_STATUSES = [UserTraining.Status.CONFIRMED, UserTraining.Status.DONE]
+SNAPSHOT_BATCH_SIZE = 500
+
+
+class YearReviewService:
+    """Service for the precomputed year in review of each user.
+
+    Snapshots are built for every user of a year at once with a handful of
+    grouped queries and stored in ``YearReviewSnapshot``. Views read the
+    stored data, build it on demand when it is missing, and report when it
+    is stale because trainings or stats changed after it was computed.
+    """
+
+    # Seconds to wait before queueing another rebuild of a stale snapshot
+    REBUILD_LOCK_TIMEOUT = 5 * 60
+
+    @classmethod
+    def get_snapshot(cls, user: User, year: int) -> YearReviewSnapshot:
+        """
+        Get the snapshot of a user, building it on a miss.
+
+        Only years from the first training of the user to the current one
+        are built. Any other year gets an empty snapshot that is not
+        stored, so a request for an arbitrary year stores nothing.
+        """
+        current_year = timezone.localdate().year
+        if year > current_year:
+            return cls._empty_snapshot(user, year)
+        snapshot = YearReviewSnapshot.objects.filter(user=user, year=year).first()
+        if snapshot is None:
+            if year < current_year and year < cls.first_year(user.id):
+                return cls._empty_snapshot(user, year)
+            return cls.build(year, user_ids=[user.id])[0]
+
+        if snapshot.is_stale:
+            cls._queue_rebuild(user.id, year)
+        return snapshot
+
+    @classmethod
+    def _empty_snapshot(cls, user: User, year: int) -> YearReviewSnapshot:
+        """Unsaved snapshot of a year without trainings."""
+        return YearReviewSnapshot(
+            user=user, year=year, data=cls._empty_data(), computed_at=timezone.now()
+        )
+
+    @classmethod
+    def first_year(cls, user_id: int) -> int:
+        """Year of the first training of a user, the current one if none."""
+        first = UserTraining.objects.filter(
+            user_id=user_id, status__in=COUNTED_STATUSES
+        ).aggregate(first=Min("slot__date"))["first"]
+        return first.year if first else timezone.localdate().year
+
+    @classmethod
+    def _queue_rebuild(cls, user_id: int, year: int) -> None:
+        from neural.users.tasks import build_year_reviews
+
+        lock_key = f"year_review_rebuild_{user_id}_{year}"
+        if cache.add(lock_key, True, timeout=cls.REBUILD_LOCK_TIMEOUT):
+            build_year_reviews.delay(year=year, user_ids=[user_id])
+
+    @classmethod
+    def mark_stale(cls, user_id: int, years=None) -> int:
+        """
+        Flag the snapshots of a user as stale.
+
+        Args:
+            user_id: Owner of the snapshots
+            years: Years (or a queryset of years) to flag, all when None
+
+        Returns:
+            Number of snapshots flagged
+        """
+        snapshots = YearReviewSnapshot.objects.filter(user_id=user_id, is_stale=False)
+        if years is not None:
+            snapshots = snapshots.filter(year__in=years)
+        return snapshots.update(is_stale=True)
+
+    @classmethod
+    def mark_stale_for_slot(cls, user_id: int, slot_id: int) -> int:
+        """Flag the snapshot of the year a slot belongs to."""
+        return cls.mark_stale(
+            user_id, Slot.objects.filter(id=slot_id).values("date__year")
+        )
+
+    @classmethod
+    def build(
+        cls, year: int, user_ids: Optional[List[int]] = None
+    ) -> List[YearReviewSnapshot]:
+        """
+        Build and store the snapshots of a year.
+
+        Args:
+            year: Year to build
+            user_ids: Users to build, every user with trainings or stats
+                in the year when None
+
+        Returns:
+            The stored snapshots
+        """
+        trainings = UserTraining.objects.filter(
+            slot__date__year=year, status__in=COUNTED_STATUSES
+        )
+        stats = UserStats.objects.filter(year=year)
+        strikes = UserStrike.objects.all()
+        rankings = Ranking.objects.filter(year=year)
+        if user_ids is not None:
+            trainings = trainings.filter(user_id__in=user_ids)
+            stats = stats.filter(user_id__in=user_ids)
+            strikes = strikes.filter(user_id__in=user_ids)
+            rankings = rankings.filter(user_id__in=user_ids)
+
+        data: Dict[int, Dict[str, Any]] = {
+            user_id: cls._empty_data() for user_id in user_ids or []
+        }
+        training_types: Dict[int, Counter] = {}
+
+        # One row per user, month, weekday, hour and training type
+        rows = (
+            trainings.annotate(
+                month=ExtractMonth("slot__date"),
+                weekday=ExtractWeekDay("slot__date"),
+                hour=ExtractHour("slot__class_training__hour_init"),
+            )
+            .values(
+                "user_id",
+                "month",
+                "weekday",
+                "hour",
+                "slot__class_training__training_type__name",
+            )
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for row in rows:
+            user_data = data.setdefault(row["user_id"], cls._empty_data())
+            count = row["count"]
+            user_data["total_trainings"] += count
+            user_data["monthly"][row["month"] - 1] += count
+            # Django weekday: 1=Sunday ... 7=Saturday, stored Monday first
+            user_data["weekday"][(row["weekday"] - 2) % 7] += count
+            if row["hour"] is not None:
+                user_data["hourly"][row["hour"]] += count
+            training_type = row["slot__class_training__training_type__name"]
+            if training_type:
+                training_types.setdefault(row["user_id"], Counter())[training_type] += (
+                    count
+                )
+
+        for user_id, counter in training_types.items():
+            name, count = counter.most_common(1)[0]
+            data[user_id]["favorite_type"] = {"name": name, "count": count}
+
+        first_trainings = (
+            trainings.values("user_id").annotate(first=Min("slot__date")).order_by()
+        )
+        for row in first_trainings:
+            data[row["user_id"]]["first_training"] = row["first"].isoformat()
+
+        weekly_totals = (
+            stats.values("user_id")
+            .annotate(
+                total_trainings=Sum("trainings"),
+                total_calories=Sum("calories"),
+                total_hours=Sum("hours"),
+                active_weeks=Count("id", filter=Q(trainings__gt=0)),
+            )
+            .order_by()
+        )
+        for row in weekly_totals:
+            user_data = data.setdefault(row["user_id"], cls._empty_data())
+            user_data["stats"] = {
+                "trainings": row["total_trainings"] or 0,
+                "calories": row["total_calories"] or 0,
+                "hours": row["total_hours"] or 0,
+                "active_weeks": row["active_weeks"],
+            }
+
+        streaks = (
+            strikes.values("user_id")
+            .annotate(
+                best=Max("weeks"),
+                current=Max("weeks", filter=Q(is_current=True)),
+            )
+            .order_by()
+        )
+        for row in streaks:
+            if row["user_id"] not in data:
+                continue
+            data[row["user_id"]]["streaks"] = {
+                "best": row["best"] or 0,
+                "current": row["current"] or 0,
+            }
+
+        total_ranked = Ranking.objects.filter(year=year).count()
+        for user_id, position in rankings.values_list("user_id", "position"):
+            if user_id not in data:
+                continue
+            data[user_id]["ranking"] = {
+                "position": position,
+                "total_users": total_ranked,
+            }
+
+        now = timezone.now()
+        snapshots = [
+            YearReviewSnapshot(
+                user_id=user_id,
+                year=year,
+                data=user_data,
+                computed_at=now,
+                is_stale=False,
+                created=now,
+                modified=now,
+            )
+            for user_id, user_data in data.items()
+        ]
+        YearReviewSnapshot.objects.bulk_create(
+            snapshots,
+            batch_size=SNAPSHOT_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["user", "year"],
+            update_fields=["data", "computed_at", "is_stale", "modified"],
+        )
+        logger.info(f"Built {len(snapshots)} year review snapshots for {year}")
+        return snapshots
+
+    @classmethod
+    def rebuild_stale(cls) -> int:
+        """
+        Rebuild every stale snapshot, one batch per year.
+
+        Returns:
+            Number of snapshots rebuilt
+        """
+        stale = YearReviewSnapshot.objects.filter(is_stale=True).values_list(
+            "year", "user_id"
+        )
+        users_by_year: Dict[int, List[int]] = {}
+        for year, user_id in stale:
+            users_by_year.setdefault(year, []).append(user_id)
+
+        rebuilt = 0
+        for year, user_ids in users_by_year.items():
+            rebuilt += len(cls.build(year, user_ids=user_ids))
+        return rebuilt
+
+    @staticmethod
+    def _empty_data() -> Dict[str, Any]:
+        return {
+            "total_trainings": 0,
+            "monthly": [0] * 12,
+            "weekday": [0] * 7,
+            "hourly": [0] * 24,
+            "favorite_type": {"name": None, "count": 0},
+            "first_training": None,
+            "stats": {"trainings": 0, "calories": 0, "hours": 0, "active_weeks": 0},
+            "streaks": {"best": 0, "current": 0},
+            "ranking": {"position": None, "total_users": 0},
+        }
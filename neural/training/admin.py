@@ -3,7 +3,6 @@
 from django.contrib import admin
 from django.http import HttpResponseRedirect
 from django.urls import reverse
-from django.db import models
 from neural.training.models import (
     UserTraining,
     Slot,
@@ -11,6 +10,7 @@ from neural.training.models import (
     TrainingType,
     Classes,
 )
+from neural.services.booking import BookingService
 
 
 class UserTrainingInline(admin.TabularInline):
@@ -36,16 +36,17 @@ class SlotAdmin(admin.ModelAdmin):
     inlines = [UserTrainingInline]
 
     def get_queryset(self, request):
-        # Add new column
-        qs = (
-            super()
-            .get_queryset(request)
-            .annotate(reserved_spaces=models.Count("user_trainings"))
-        )
-        return qs
+        return super().get_queryset(request).with_availability()
 
     def reserved_spaces(self, obj):
-        return obj.reserved_spaces
+        return obj.confirmed_count
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Inline bookings bypass BookingService, rebuild the seat counter
+        BookingService.reconcile_confirmed_counts(
+            Slot.objects.filter(pk=form.instance.pk)
+        )
 
     def class_training_hour_init(self, obj):
         if obj.class_training:
@@ -66,8 +67,8 @@ class SlotAdmin(admin.ModelAdmin):
 @admin.register(TrainingType)
 class TrainingTypeAdmin(admin.ModelAdmin):
     list_filter = ["name"]
-    list_display = ["name", "slug_name", "is_group"]
-    list_editable = ["is_group"]
+    list_display = ["name", "slug_name", "is_group", "max_places"]
+    list_editable = ["is_group", "max_places"]
     readonly_fields = ["slug_name"]
 
 
@@ -75,7 +76,7 @@ class TrainingTypeAdmin(admin.ModelAdmin):
 class ClassesAdmin(admin.ModelAdmin):
     search_fields = ["training_type__name", "day"]
     list_filter = ["day"]
-    list_display = ["day", "training_type", "hour_init", "hour_end"]
+    list_display = ["day", "training_type", "hour_init", "hour_end", "max_places"]
 
     def delete_view(self, request, object_id, extra_context=None):
         obj = self.get_object(request, object_id)
@@ -109,6 +110,15 @@ class UserTrainingAdmin(admin.ModelAdmin):
             .select_related("user", "slot", "slot__class_training")
         )
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        BookingService.reconcile_confirmed_counts(Slot.objects.filter(pk=obj.slot_id))
+
+    def delete_model(self, request, obj):
+        slot_id = obj.slot_id
+        super().delete_model(request, obj)
+        BookingService.reconcile_confirmed_counts(Slot.objects.filter(pk=slot_id))
+
     def slot_info(self, obj):
         slot = obj.slot
         if slot:
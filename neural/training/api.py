@@ -16,8 +16,12 @@ from rest_framework.response import Response
 from neural.training.models import Slot, UserTraining
 from neural.users.models import UserPaymentReference
 
+# Services
+from neural.services.booking import BookingService
+from neural.services.catalog import CatalogService
+
 # Serializers
-from neural.training.serializers import SlotModelSerializer, SeatModelSerializer
+from neural.training.serializers import SlotModelSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -32,22 +36,16 @@ class TrainingViewSet(viewsets.GenericViewSet):
         gap_acceptance = now + timedelta(minutes=20)
         date = request.data.get("date")
         training_type = request.data.get("training_type")
+        slots = Slot.objects.filter(
+            date=date, class_training__training_type=training_type
+        )
         if date == now_date.strftime("%Y-%m-%d"):
-            slots = (
-                Slot.objects.filter(
-                    date=date,
-                    training_type=training_type,
-                    hour_init__gte=gap_acceptance,
-                )
-                .order_by("hour_init")
-                .distinct("hour_init")
-            )
-        else:
-            slots = (
-                Slot.objects.filter(date=date, training_type=training_type)
-                .order_by("hour_init")
-                .distinct("hour_init")
-            )
+            slots = slots.filter(class_training__hour_init__gte=gap_acceptance.time())
+        slots = (
+            slots.with_availability()
+            .order_by("class_training__hour_init")
+            .distinct("class_training__hour_init")
+        )
         if slots:
             data = SlotModelSerializer(slots, many=True).data
         else:
@@ -59,58 +57,23 @@ class TrainingViewSet(viewsets.GenericViewSet):
         slot = request.data.get("slot")
         slot = Slot.objects.get(pk=slot)
         if slot.available_places:
-            available_seats = slot.available_seats
-            data = SeatModelSerializer(available_seats, many=True).data
+            taken = set(
+                slot.user_trainings.filter(
+                    status=UserTraining.Status.CONFIRMED, space__isnull=False
+                ).values_list("space_id", flat=True)
+            )
+            data = [
+                space for space in CatalogService.spaces() if space["id"] not in taken
+            ]
         else:
             data = "No data"
         return Response({"result": data}, status=status.HTTP_200_OK)
 
-    def _update_stats(self, user, slot):
-        try:
-            year = timezone.now().year
-            slot_week_number = slot.date.isocalendar()[1]
-            stats = user.stats.filter(
-                year=year,
-                week=slot_week_number,
-            ).last()
-            if stats:
-                if stats.trainings > 0:
-                    stats.trainings -= 1
-                if stats.calories > 0:
-                    stats.calories -= 400
-                if stats.hours > 0:
-                    stats.hours -= 1
-                stats.save()
-
-            # Check streak to decrease it, if not have another training in the week
-            streak = user.strikes.filter(
-                is_current=True, last_week=slot_week_number
-            ).first()
-            if streak:
-                # Check other training in the week
-                trainings_in_week = UserTraining.objects.filter(
-                    user=user,
-                    slot__date__week=slot_week_number,
-                    slot__date__year=year,
-                    status=UserTraining.Status.CONFIRMED,
-                ).exists()
-                if not trainings_in_week:
-                    if streak.weeks > 0:
-                        streak.weeks -= 1
-                    if streak.last_week > 0:
-                        streak.last_week -= 1
-                    streak.save()
-        except Exception as e:
-            logger.error(f"Error updating stats: {e}")
-
     @action(detail=False, methods=["post"])
     def cancel_session(self, request):
         user_training = request.data.get("user_training")
         training = UserTraining.objects.get(pk=user_training)
-        training.status = UserTraining.Status.CANCELLED
-        training.space = None
-        training.save()
-        self._update_stats(training.user, training.slot)
+        BookingService.cancel(training, clear_space=True)
         return Response({"result": "OK"}, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=["post", "get"], url_path="hook")
@@ -1,158 +1,78 @@
-"""Sync Command."""
+"""Calendar Command - Sync the weekly classes with a timetable file."""
 
-# Django
-from django.core.management.base import BaseCommand
+from pathlib import Path
 
-# Models
-from neural.training.models import TrainingType, Classes
+from django.core.management.base import BaseCommand, CommandError
+
+from neural.services.schedule import ScheduleService
+from neural.services.timetable import TimetableError, TimetableService
+
+DEFAULT_TIMETABLE = Path(__file__).resolve().parents[2] / "timetable.yaml"
 
 
 class Command(BaseCommand):
+    help = "Create, update and delete Classes to match a YAML or JSON timetable"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            nargs="?",
+            default=str(DEFAULT_TIMETABLE),
+            help="Timetable file (default: neural/training/timetable.yaml)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show the changes without applying them",
+        )
+
     def handle(self, *args, **options):
         """Handle command usage."""
+        try:
+            timetable = TimetableService.load(options["path"])
+        except TimetableError as e:
+            raise CommandError(str(e))
+
+        changes = TimetableService.diff(timetable)
+        for session in changes["create"]:
+            self.stdout.write(f"+ {self._describe(session)}")
+        for session, old_places in changes["update"]:
+            self.stdout.write(
+                f"~ {self._describe(session)}: "
+                f"max_places {old_places} -> {session.max_places}"
+            )
+        for session in changes["delete"]:
+            self.stdout.write(f"- {self._describe(session)}")
+        for session in changes["kept"]:
+            self.stdout.write(
+                self.style.WARNING(f"! {self._describe(session)}: has bookings, kept")
+            )
+
+        counts = (
+            len(changes["create"]),
+            len(changes["update"]),
+            len(changes["delete"]),
+        )
+        if options["dry_run"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    "DRY RUN - {} to create, {} to update, {} to delete".format(*counts)
+                )
+            )
+            return
+
+        TimetableService.apply(changes)
+        # New classes get their slots right away
+        slots = ScheduleService.materialize()
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Created {}, updated {} and deleted {} classes".format(*counts)
+                + f", {len(slots)} new slots"
+            )
+        )
 
-        sessions = [
-            {
-                "day": "MONDAY",
-                "training_type": {
-                    "funcional-training": [
-                        {"init": "5:00", "end": "6:00"},
-                        {"init": "6:00", "end": "7:00"},
-                        {"init": "7:00", "end": "8:00"},
-                        {"init": "8:00", "end": "9:00"},
-                        {"init": "9:00", "end": "10:00"},
-                        {"init": "10:00", "end": "11:00"},
-                        {"init": "16:00", "end": "17:00"},
-                        {"init": "17:00", "end": "18:00"},
-                        {"init": "18:00", "end": "19:00"},
-                        {"init": "19:00", "end": "20:00"},
-                        {"init": "20:00", "end": "21:00"},
-                    ],
-                    "funcional-box": [
-                        {"init": "7:00", "end": "8:00"},
-                    ],
-                },
-            },
-            {
-                "day": "TUESDAY",
-                "training_type": {
-                    "funcional-training": [
-                        {"init": "5:00", "end": "6:00"},
-                        {"init": "6:00", "end": "7:00"},
-                        {"init": "7:00", "end": "8:00"},
-                        {"init": "8:00", "end": "9:00"},
-                        {"init": "9:00", "end": "10:00"},
-                        {"init": "10:00", "end": "11:00"},
-                        {"init": "16:00", "end": "17:00"},
-                        {"init": "17:00", "end": "18:00"},
-                        {"init": "18:00", "end": "19:00"},
-                        {"init": "19:00", "end": "20:00"},
-                        {"init": "20:00", "end": "21:00"},
-                    ]
-                },
-            },
-            {
-                "day": "WEDNESDAY",
-                "training_type": {
-                    "funcional-training": [
-                        {"init": "5:00", "end": "6:00"},
-                        {"init": "6:00", "end": "7:00"},
-                        {"init": "8:00", "end": "9:00"},
-                        {"init": "9:00", "end": "10:00"},
-                        {"init": "10:00", "end": "11:00"},
-                        {"init": "16:00", "end": "17:00"},
-                        {"init": "18:00", "end": "19:00"},
-                        {"init": "19:00", "end": "20:00"},
-                        {"init": "20:00", "end": "21:00"},
-                    ],
-                    "gap": [
-                        {"init": "7:00", "end": "8:00"},
-                        {"init": "17:00", "end": "18:00"},
-                    ],
-                },
-            },
-            {
-                "day": "THURSDAY",
-                "training_type": {
-                    "funcional-training": [
-                        {"init": "5:00", "end": "6:00"},
-                        {"init": "6:00", "end": "7:00"},
-                        {"init": "7:00", "end": "8:00"},
-                        {"init": "8:00", "end": "9:00"},
-                        {"init": "9:00", "end": "10:00"},
-                        {"init": "10:00", "end": "11:00"},
-                        {"init": "16:00", "end": "17:00"},
-                        {"init": "17:00", "end": "18:00"},
-                        {"init": "19:00", "end": "20:00"},
-                        {"init": "20:00", "end": "21:00"},
-                    ],
-                    "balance": [
-                        {"init": "18:00", "end": "19:00"},
-                    ],
-                },
-            },
-            {
-                "day": "FRIDAY",
-                "training_type": {
-                    "funcional-training": [
-                        {"init": "5:00", "end": "6:00"},
-                        {"init": "6:00", "end": "7:00"},
-                        {"init": "7:00", "end": "8:00"},
-                        {"init": "8:00", "end": "9:00"},
-                        {"init": "9:00", "end": "10:00"},
-                        {"init": "10:00", "end": "11:00"},
-                        {"init": "16:00", "end": "17:00"},
-                        {"init": "17:00", "end": "18:00"},
-                        {"init": "18:00", "end": "19:00"},
-                        {"init": "19:00", "end": "20:00"},
-                    ],
-                },
-            },
-            {
-                "day": "SATURDAY",
-                "training_type": {
-                    "funcional-training": [
-                        {"init": "10:00", "end": "11:00"},
-                        {"init": "11:00", "end": "12:00"},
-                    ],
-                    "solo-pernil": [
-                        {"init": "7:30", "end": "8:30"},
-                    ],
-                    "super-star": [
-                        {"init": "9:00", "end": "10:00"},
-                    ],
-                },
-            },
-            # {
-            #     "day": "SUNDAY",
-            #     "training_type": {
-            #         'funcional-training': [
-            #             {
-            #                 'init': '09:00',
-            #                 'end': '10:00'
-            #             },
-            #         ],
-            #         'aeroibic-step': [
-            #             {
-            #                 'init': '10:00',
-            #                 'end': '11:00'
-            #             },
-            #         ],
-            #     }
-            # },
-        ]
-        for session in sessions:
-            day = session.get("day")
-            training_data = session.get("training_type")
-            for training_type, training_hours in training_data.items():
-                training_instance = TrainingType.objects.get(slug_name=training_type)
-                for hour in training_hours:
-                    init = hour.get("init")
-                    end = hour.get("end")
-                    Classes.objects.create(
-                        day=day,
-                        training_type=training_instance,
-                        hour_init=init,
-                        hour_end=end,
-                    )
-        print("Finish")
+    def _describe(self, session):
+        return (
+            f"{session.day} {session.training_type.slug_name} "
+            f"{session.hour_init:%H:%M}-{session.hour_end:%H:%M}"
+        )
@@ -0,0 +1,67 @@
+"""Reconcile Slots Command - Rebuild slot seat counters from bookings."""
+
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, F, Q
+
+from neural.services.booking import BookingService
+from neural.training.models import Slot, UserTraining
+
+
+class Command(BaseCommand):
+    help = "Rebuild Slot.confirmed_count from confirmed UserTraining rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            type=str,
+            help="Only reconcile slots on or after this date (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show drifted slots without updating them",
+        )
+
+    def handle(self, *args, **options):
+        """Handle command usage."""
+        slots = Slot.objects.all()
+        if options["since"]:
+            try:
+                since = datetime.strptime(options["since"], "%Y-%m-%d").date()
+            except ValueError:
+                raise CommandError("Invalid --since date, use YYYY-MM-DD")
+            slots = slots.filter(date__gte=since)
+
+        drifted = (
+            slots.annotate(
+                actual=Count(
+                    "user_trainings",
+                    filter=Q(user_trainings__status=UserTraining.Status.CONFIRMED),
+                )
+            )
+            .exclude(confirmed_count=F("actual"))
+            .order_by("date")
+        )
+
+        drift_count = 0
+        for slot in drifted.values("id", "date", "confirmed_count", "actual"):
+            drift_count += 1
+            self.stdout.write(
+                f"Slot {slot['id']} ({slot['date']}): "
+                f"{slot['confirmed_count']} -> {slot['actual']}"
+            )
+
+        if options["dry_run"]:
+            self.stdout.write(
+                self.style.WARNING(f"DRY RUN - {drift_count} slots would be updated")
+            )
+            return
+
+        updated = BookingService.reconcile_confirmed_counts(slots)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reconciled {updated} slots, {drift_count} had drifted counters"
+            )
+        )
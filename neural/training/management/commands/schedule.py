@@ -0,0 +1,46 @@
+"""Schedule Command - Create the slots of the upcoming days."""
+
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from neural.services.schedule import ScheduleService
+
+
+class Command(BaseCommand):
+    help = "Create the missing slots from the Classes timetable"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=ScheduleService.HORIZON_DAYS,
+            help="Days ahead to fill (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--since",
+            type=str,
+            help="First day to fill (YYYY-MM-DD, default: today)",
+        )
+        parser.add_argument(
+            "--catch-up",
+            action="store_true",
+            help="Also fill the days from today to --since left without slots",
+        )
+
+    def handle(self, *args, **options):
+        """Handle command usage."""
+        since = None
+        if options["since"]:
+            try:
+                since = datetime.strptime(options["since"], "%Y-%m-%d").date()
+            except ValueError:
+                raise CommandError("Invalid --since date, use YYYY-MM-DD")
+
+        slots = ScheduleService.materialize(
+            start=since, days=options["days"], catch_up=options["catch_up"]
+        )
+        for day in sorted({slot.date for slot in slots}):
+            count = sum(1 for slot in slots if slot.date == day)
+            self.stdout.write(f"{day}: {count} slots")
+        self.stdout.write(self.style.SUCCESS(f"Created {len(slots)} slots"))
@@ -1,73 +1,89 @@
-"""Sync Command."""
+"""Stats Command - Rebuild weekly stats and streaks from trainings."""
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.functions import Lower
 from django.utils import timezone
-from neural.users.models import User, UserStrike
-from datetime import timedelta
 
+from neural.services.stats import StatsService
+from neural.users.models import User
 
-class Command(BaseCommand):
-    def handle(self, *args, **options):
-        """Handle command usage."""
-        year = timezone.now().year
-        current_week = timezone.now().isocalendar()[1]
 
-        for user in User.objects.all():
-            user.email = user.email.lower()
-            user.save()
-            current_streak_weeks = 0
-            current_strike = None
+class Command(BaseCommand):
+    help = "Rebuild UserStats and UserStrike from confirmed and done trainings"
 
-            # Iterate over all weeks in the year
-            for week in range(1, current_week + 1):
-                # Calculate the date range using your method
-                init_date = timezone.now().date().replace(year=year, month=1, day=1)
-                end_date = init_date + timedelta(days=7)
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--year",
+            type=int,
+            default=timezone.localdate().isocalendar()[0],
+            help="ISO year to rebuild (default: current year)",
+        )
+        parser.add_argument(
+            "--users",
+            nargs="+",
+            help="Only rebuild these users, by ID or email",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Compute the rebuild without writing it",
+        )
 
-                # Get trainings for this week
-                trainings_in_week = user.trainings.filter(
-                    slot__date__range=[init_date, end_date]
-                )
+    def handle(self, *args, **options):
+        """Handle command usage."""
+        year = options["year"]
+        user_ids = None
+        if options["users"]:
+            user_ids = self._resolve_users(options["users"])
 
-                # Update or create stats for this week
-                user.stats.update_or_create(
-                    year=year,
-                    week=week,
-                    defaults={
-                        "trainings": trainings_in_week.count(),
-                        "calories": trainings_in_week.count() * 400,
-                        "hours": trainings_in_week.count() * 1,
-                    },
-                )
+        if not options["dry_run"]:
+            # Emails are stored lowercase
+            lowered = (
+                User.objects.exclude(email=Lower("email"))
+                .exclude(email__isnull=True)
+                .update(email=Lower("email"))
+            )
+            if lowered:
+                self.stdout.write(f"Lowercased {lowered} emails")
 
-                # Strike logic
-                if trainings_in_week.exists():
-                    current_streak_weeks += 1
+        self.stdout.write(
+            f"Rebuilding stats for {year} "
+            f"({len(user_ids) if user_ids is not None else 'all'} users)..."
+        )
+        report = StatsService.rebuild(
+            year, user_ids=user_ids, dry_run=options["dry_run"]
+        )
 
-                    if current_strike is None:
-                        # Create new strike instance
-                        current_strike = UserStrike.objects.create(
-                            user=user,
-                            weeks=current_streak_weeks,
-                            is_current=True,
-                            last_week=week,
-                        )
-                    else:
-                        # Update existing strike
-                        current_strike.weeks = current_streak_weeks
-                        current_strike.last_week = week
-                        current_strike.save()
-                else:
-                    # No training this week - break the streak
-                    if current_strike:
-                        current_strike.is_current = False
-                        current_strike.save()
-                        current_strike = None
-                    current_streak_weeks = 0
+        timings = report["timings"]
+        self.stdout.write(
+            f"Load {timings['load']:.2f}s, compute {timings['compute']:.2f}s, "
+            f"write {timings['write']:.2f}s"
+        )
+        summary = (
+            f"{report['users']} users, {report['stats']} weekly stats, "
+            f"{report['strikes']} strikes ({report['current_strikes']} current) "
+            f"in {timings['total']:.2f}s"
+        )
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"DRY RUN - {summary}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {summary}"))
 
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"User {user}: Final streak: {current_streak_weeks} weeks, "
-                    + f'Last week: {current_strike.last_week if current_strike else "N/A"}'
-                )
+    def _resolve_users(self, values):
+        ids = {int(value) for value in values if value.isdigit()}
+        emails = {value.lower() for value in values if not value.isdigit()}
+        users = dict(User.objects.filter(id__in=ids).values_list("id", "email"))
+        if emails:
+            users.update(
+                User.objects.filter(email__in=emails).values_list("id", "email")
             )
+
+        found = set(users) | {email.lower() for email in users.values() if email}
+        missing = [
+            value
+            for value in values
+            if (int(value) if value.isdigit() else value.lower()) not in found
+        ]
+        if missing:
+            raise CommandError(f"Users not found: {', '.join(missing)}")
+        return list(users)
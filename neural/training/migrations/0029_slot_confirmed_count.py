@@ -0,0 +1,34 @@
+# Generated by Django 4.2 on 2026-10-18 09:12
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_confirmed_count(apps, schema_editor):
+    Slot = apps.get_model("training", "Slot")
+    UserTraining = apps.get_model("training", "UserTraining")
+    confirmed = (
+        UserTraining.objects.filter(slot=OuterRef("pk"), status="CONFIRMED")
+        .order_by()
+        .values("slot")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    Slot.objects.update(confirmed_count=Coalesce(Subquery(confirmed), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("training", "0028_rename_class_trainging_slot_class_training"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="slot",
+            name="confirmed_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_confirmed_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2 on 2026-10-18 19:24
+
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def merge_duplicate_slots(apps, schema_editor):
+    """Keep the oldest slot of each (date, class) and move its bookings."""
+    Slot = apps.get_model("training", "Slot")
+    UserTraining = apps.get_model("training", "UserTraining")
+    duplicates = (
+        Slot.objects.filter(class_training__isnull=False)
+        .values("date", "class_training")
+        .annotate(keep=Min("id"), total=Count("id"))
+        .filter(total__gt=1)
+        .order_by()
+    )
+    kept_ids = []
+    for row in duplicates:
+        extra = Slot.objects.filter(
+            date=row["date"], class_training=row["class_training"]
+        ).exclude(id=row["keep"])
+        UserTraining.objects.filter(slot__in=extra).update(slot_id=row["keep"])
+        extra.delete()
+        kept_ids.append(row["keep"])
+
+    confirmed = (
+        UserTraining.objects.filter(slot=OuterRef("pk"), status="CONFIRMED")
+        .order_by()
+        .values("slot")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    Slot.objects.filter(id__in=kept_ids).update(
+        confirmed_count=Coalesce(Subquery(confirmed), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("training", "0029_slot_confirmed_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="classes",
+            name="max_places",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="trainingtype",
+            name="max_places",
+            field=models.PositiveIntegerField(default=20),
+        ),
+        migrations.RunPython(merge_duplicate_slots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-18 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("training", "0030_class_capacity"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="slot",
+            constraint=models.UniqueConstraint(
+                fields=("date", "class_training"), name="unique_slot_per_class"
+            ),
+        ),
+    ]
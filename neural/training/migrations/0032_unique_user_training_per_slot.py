@@ -0,0 +1,61 @@
+# Generated by Django 4.2 on 2026-10-18 19:55
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def delete_duplicate_bookings(apps, schema_editor):
+    """
+    Keep one booking per user and slot.
+
+    A confirmed booking is kept first, then an attended one, so no
+    attendance is lost, and the newest one otherwise.
+    """
+    Slot = apps.get_model("training", "Slot")
+    UserTraining = apps.get_model("training", "UserTraining")
+    duplicated = (
+        UserTraining.objects.order_by()
+        .values("user", "slot")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+    )
+    slot_ids = set()
+    for group in duplicated:
+        bookings = UserTraining.objects.filter(
+            user=group["user"], slot=group["slot"]
+        ).order_by("-created", "-id")
+        keep = (
+            bookings.filter(status="CONFIRMED").first()
+            or bookings.filter(status="DONE").first()
+            or bookings.first()
+        )
+        bookings.exclude(pk=keep.pk).delete()
+        slot_ids.add(group["slot"])
+
+    confirmed = (
+        UserTraining.objects.filter(slot=OuterRef("pk"), status="CONFIRMED")
+        .order_by()
+        .values("slot")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    Slot.objects.filter(pk__in=slot_ids).update(
+        confirmed_count=Coalesce(Subquery(confirmed), 0)
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("training", "0031_slot_unique_slot_per_class"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_bookings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="usertraining",
+            constraint=models.UniqueConstraint(
+                fields=("user", "slot"), name="unique_user_training_per_slot"
+            ),
+        ),
+    ]
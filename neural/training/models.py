@@ -5,6 +5,7 @@ from slugify import slugify
 # Django
 from django.utils import timezone
 from django.db import models
+from django.db.models import F
 
 from neural.users.models import User
 
@@ -31,6 +32,8 @@ class TrainingType(NeuralBaseModel):
     name = models.CharField(max_length=255)
     slug_name = models.SlugField(unique=True, max_length=100)
     is_group = models.BooleanField(default=True)
+    # Places of the slots created for its classes
+    max_places = models.PositiveIntegerField(default=20)
 
     def __str__(self):
         """Return training type."""
@@ -68,11 +71,20 @@ class Classes(NeuralBaseModel):
     )
     hour_init = models.TimeField()
     hour_end = models.TimeField()
+    # Overrides the places of the training type when set
+    max_places = models.PositiveIntegerField(null=True, blank=True)
 
     def __str__(self):
         """Return training type."""
         return f"{self.training_type} - {self.day}"
 
+    @property
+    def capacity(self):
+        """Places of the slots created for this class."""
+        if self.max_places is not None:
+            return self.max_places
+        return self.training_type.max_places
+
     class Meta:
         """Meta class."""
 
@@ -86,15 +98,35 @@ class Classes(NeuralBaseModel):
         ]
 
 
+class SlotQuerySet(models.QuerySet):
+    """Slot queryset."""
+
+    def with_availability(self):
+        """Load class info and annotate remaining places in the same query."""
+        return self.select_related(
+            "class_training", "class_training__training_type"
+        ).annotate(remaining_places=F("max_places") - F("confirmed_count"))
+
+
 class Slot(NeuralBaseModel):
     date = models.DateField()
     max_places = models.IntegerField()
+    # Denormalized number of CONFIRMED bookings, maintained by BookingService
+    confirmed_count = models.PositiveIntegerField(default=0)
     class_training = models.ForeignKey(
         Classes, on_delete=models.CASCADE, related_name="slots", blank=True, null=True
     )
 
+    objects = SlotQuerySet.as_manager()
+
     class Meta:
         ordering = ["-date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "class_training"],
+                name="unique_slot_per_class",
+            )
+        ]
 
     def __str__(self):
         return f"Clase {self.date} - {self.class_training.hour_init} - {self.class_training.hour_end}"
@@ -105,7 +137,7 @@ class Slot(NeuralBaseModel):
 
     @property
     def available_places(self):
-        return self.max_places - self.users_scheduled.count()
+        return self.max_places - self.confirmed_count
 
     @property
     def users(self):
@@ -145,6 +177,13 @@ class UserTraining(NeuralBaseModel):
     def __str__(self):
         return f"Entrenamiento: {self.user.get_full_name()} - {self.user}"
 
+    class Meta(NeuralBaseModel.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "slot"], name="unique_user_training_per_slot"
+            )
+        ]
+
     @property
     def is_now(self):
         return self.slot.date == timezone.localdate()
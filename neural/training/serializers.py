@@ -4,7 +4,7 @@
 from rest_framework import serializers
 
 # Model
-from neural.training.models import Slot, Space
+from neural.training.models import Slot
 
 
 class SlotModelSerializer(serializers.ModelSerializer):
@@ -20,16 +20,15 @@ class SlotModelSerializer(serializers.ModelSerializer):
             "available_places",
         )
 
-    hour_init = serializers.TimeField(format="%I:%M %p")
-    hour_end = serializers.TimeField(format="%I:%M %p")
-
-
-class SeatModelSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Space
-        fields = (
-            "id",
-            "slug_name",
-            "name",
-            "description",
-        )
+    hour_init = serializers.TimeField(
+        source="class_training.hour_init", format="%I:%M %p"
+    )
+    hour_end = serializers.TimeField(
+        source="class_training.hour_end", format="%I:%M %p"
+    )
+    training_type = serializers.IntegerField(
+        source="class_training.training_type_id", read_only=True
+    )
+    available_places = serializers.IntegerField(
+        source="remaining_places", read_only=True
+    )
@@ -1,11 +1,12 @@
-from datetime import datetime, timedelta
+from datetime import date
 
 # Celery
 from config import celery_app
 from celery.schedules import crontab
 
-# Models
-from neural.training.models import Classes, Slot
+# Services
+from neural.services.schedule import ScheduleService
+from neural.services.stats import StatsService
 
 
 @celery_app.on_after_finalize.connect
@@ -18,23 +19,13 @@ def setup_periodic_tasks(sender, **kwargs):
 
 
 @celery_app.task
-def create_schedule_day():
-    """Create slot available with delta 7 days"""
-    wrapper_days = {
-        0: "MONDAY",
-        1: "TUESDAY",
-        2: "WEDNESDAY",
-        3: "THURSDAY",
-        4: "FRIDAY",
-        5: "SATURDAY",
-        6: "SUNDAY",
-    }
-    now = datetime.now().date()
-    delta_day = now + timedelta(days=7)
-    day_name = wrapper_days.get(delta_day.weekday())
-    classes = Classes.objects.filter(day=day_name)
-    for session in classes:
-        Slot.objects.update_or_create(
-            date=delta_day, class_training=session, defaults={"max_places": 20}
-        )
-    print("Finish")
+def create_schedule_day(days=ScheduleService.HORIZON_DAYS, catch_up=False):
+    """Create the missing slots of the next days"""
+    slots = ScheduleService.materialize(days=days, catch_up=catch_up)
+    return len(slots)
+
+
+@celery_app.task
+def refresh_training_stats(user_id: int, day: str):
+    """Refresh the weekly stats and streaks after a booking change"""
+    StatsService.refresh_user_week(user_id, date.fromisoformat(day))
@@ -4,32 +4,23 @@ from django import template
 
 register = template.Library()
 
+ICONS = {
+    "funcional-training": "bx bx-dumbbell  text-danger",
+    "gap": "mdi mdi-transit-transfer text-dark",
+    "aeroibic-step": "bx bx-run text-info",
+    "senior": "mdi mdi-biathlon text-success",
+    "rtg": "mdi mdi-dolly text-dark",
+    "pilates": "mdi mdi-karate text-info",
+    "funcional-box": "mdi mdi-boxing-glove text-warning",
+    "balance": "mdi mdi-nature-people text-warning",
+    "super-star": "bx bx-star text-warning",
+    "cardio-hit": "mdi mdi-run-fast text-info",
+    "a-fuego": "bx bxs-flame  text-warning",
+    "rumba": "mdi mdi-music-circle-outline text-info",
+}
+DEFAULT_ICON = "bx bxs-flame  text-warning"
+
 
 @register.filter(name="get_icon")
 def get_icon(value):
-    if value.slug_name in ["funcional-training"]:
-        return "bx bx-dumbbell  text-danger"
-    if value.slug_name in ["gap"]:
-        return "mdi mdi-transit-transfer text-dark"
-    if value.slug_name in ["aeroibic-step"]:
-        return "bx bx-run text-info"
-    if value.slug_name in ["senior"]:
-        return "mdi mdi-biathlon text-success"
-    if value.slug_name in ["rtg"]:
-        return "mdi mdi-dolly text-dark"
-    if value.slug_name in ["pilates"]:
-        return "mdi mdi-karate text-info"
-    if value.slug_name in ["funcional-box"]:
-        return "mdi mdi-boxing-glove text-warning"
-    if value.slug_name in ["balance"]:
-        return "mdi mdi-nature-people text-warning"
-    if value.slug_name in ["super-star"]:
-        return "bx bx-star text-warning"
-    if value.slug_name in ["cardio-hit"]:
-        return "mdi mdi-run-fast text-info"
-    if value.slug_name in ["a-fuego"]:
-        return "bx bxs-flame  text-warning"
-    if value.slug_name in ["rumba"]:
-        return "mdi mdi-music-circle-outline text-info"
-    else:
-        return "bx bxs-flame  text-warning"
+    return ICONS.get(value.slug_name, DEFAULT_ICON)
@@ -0,0 +1,41 @@
+from datetime import time, timedelta
+
+from django.utils import timezone
+from factory import LazyFunction, Sequence, SubFactory
+from factory.django import DjangoModelFactory
+
+from neural.training.models import Classes, Slot, Space, TrainingType
+
+
+class TrainingTypeFactory(DjangoModelFactory):
+    name = Sequence(lambda n: f"Training {n}")
+    slug_name = Sequence(lambda n: f"training-{n}")
+    max_places = 20
+
+    class Meta:
+        model = TrainingType
+
+
+class ClassesFactory(DjangoModelFactory):
+    training_type = SubFactory(TrainingTypeFactory)
+    hour_init = time(7, 0)
+    hour_end = time(8, 0)
+
+    class Meta:
+        model = Classes
+
+
+class SlotFactory(DjangoModelFactory):
+    date = LazyFunction(lambda: timezone.localdate() + timedelta(days=1))
+    max_places = 20
+    class_training = SubFactory(ClassesFactory)
+
+    class Meta:
+        model = Slot
+
+
+class SpaceFactory(DjangoModelFactory):
+    name = Sequence(lambda n: f"Space {n}")
+
+    class Meta:
+        model = Space
@@ -0,0 +1,131 @@
+import threading
+from unittest import mock
+
+import pytest
+from django.db import connection
+
+from neural.services.booking import BookingError, BookingService
+from neural.training.models import Slot, UserTraining
+from neural.training.tests.factories import SlotFactory
+from neural.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_book_takes_one_seat(user, slot):
+    booking = BookingService.book(user, slot)
+
+    assert booking.status == UserTraining.Status.CONFIRMED
+    slot.refresh_from_db()
+    assert slot.confirmed_count == 1
+
+
+def test_book_twice_is_rejected(user, slot):
+    BookingService.book(user, slot)
+
+    with pytest.raises(BookingError, match=BookingService.ALREADY_BOOKED_MESSAGE):
+        BookingService.book(user, slot)
+
+    slot.refresh_from_db()
+    assert slot.confirmed_count == 1
+
+
+def test_book_full_slot_is_rejected(user):
+    slot = SlotFactory(max_places=1)
+    BookingService.book(UserFactory(), slot)
+
+    with pytest.raises(BookingError, match=BookingService.SLOT_FULL_MESSAGE):
+        BookingService.book(user, slot)
+
+
+def test_rebook_confirms_the_cancelled_booking(user, slot):
+    booking = BookingService.book(user, slot)
+    BookingService.cancel(booking)
+
+    rebooked = BookingService.book(user, slot)
+
+    assert rebooked.pk == booking.pk
+    assert rebooked.status == UserTraining.Status.CONFIRMED
+    slot.refresh_from_db()
+    assert slot.confirmed_count == 1
+
+
+def test_book_losing_the_insert_race_releases_its_seat(user, slot):
+    """The booking of a concurrent request commits after the guard read."""
+    UserTraining.objects.create(user=user, slot=slot)
+    Slot.objects.filter(pk=slot.pk).update(confirmed_count=1)
+    guard = mock.Mock()
+    guard.filter.return_value.first.return_value = None
+
+    with mock.patch.object(
+        UserTraining.objects, "select_for_update", return_value=guard
+    ):
+        with pytest.raises(BookingError, match=BookingService.ALREADY_BOOKED_MESSAGE):
+            BookingService.book(user, slot)
+
+    assert UserTraining.objects.filter(user=user, slot=slot).count() == 1
+    slot.refresh_from_db()
+    assert slot.confirmed_count == 1
+
+
+# Concurrent writers need a database with row locks
+requires_postgres = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="Needs PostgreSQL row locks"
+)
+
+
+def book_in_parallel(users, slot):
+    """Book the slot for each user from its own thread and connection."""
+    barrier = threading.Barrier(len(users))
+    results = []
+
+    def book(user):
+        barrier.wait()
+        try:
+            BookingService.book(user, Slot.objects.get(pk=slot.pk))
+            results.append("booked")
+        except BookingError as error:
+            results.append(str(error))
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=book, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.mark.django_db(transaction=True)
+@requires_postgres
+def test_concurrent_bookings_of_a_user_take_one_seat():
+    user = UserFactory()
+    slot = SlotFactory()
+
+    results = book_in_parallel([user] * 4, slot)
+
+    assert results.count("booked") == 1
+    assert UserTraining.objects.filter(user=user, slot=slot).count() == 1
+    slot.refresh_from_db()
+    assert slot.confirmed_count == 1
+
+
+@pytest.mark.django_db(transaction=True)
+@requires_postgres
+def test_concurrent_bookings_never_overbook_a_slot():
+    slot = SlotFactory(max_places=5)
+    users = UserFactory.create_batch(20)
+
+    results = book_in_parallel(users, slot)
+
+    assert results.count("booked") == slot.max_places
+    assert results.count(BookingService.SLOT_FULL_MESSAGE) == 15
+    slot.refresh_from_db()
+    assert slot.confirmed_count == slot.max_places
+    assert (
+        UserTraining.objects.filter(
+            slot=slot, status=UserTraining.Status.CONFIRMED
+        ).count()
+        == slot.max_places
+    )
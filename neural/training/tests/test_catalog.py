@@ -0,0 +1,71 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from neural.services.booking import BookingService
+from neural.services.catalog import CatalogService
+from neural.training.api import TrainingViewSet
+from neural.training.tests.factories import SpaceFactory
+from neural.users.models import NeuralPlan, UserMembership
+
+pytestmark = pytest.mark.django_db
+
+
+def get_seats(slot):
+    request = APIRequestFactory().post(
+        "/training/api/training/get_seats/", {"slot": slot.id}, format="json"
+    )
+    return TrainingViewSet.as_view({"post": "get_seats"})(request)
+
+
+def test_get_seats_lists_the_spaces_not_taken(user, slot):
+    taken, kept = SpaceFactory.create_batch(2)
+    training = BookingService.book(user, slot)
+    training.space = taken
+    training.save()
+    free = [space["id"] for space in CatalogService.spaces() if space["id"] != taken.id]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = get_seats(slot)
+
+    assert response.status_code == 200
+    assert [space["id"] for space in response.data["result"]] == free
+    assert kept.id in free
+    # The slot and its taken spaces, the spaces come from the catalog
+    assert len(queries) == 2
+
+
+def test_saving_a_space_retires_the_catalog(django_capture_on_commit_callbacks):
+    space = SpaceFactory(name="Rack")
+
+    def name():
+        return next(
+            row["name"] for row in CatalogService.spaces() if row["id"] == space.id
+        )
+
+    assert name() == "Rack"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        space.name = "Barra"
+        space.save()
+
+    assert name() == "Barra"
+
+
+def test_membership_plan_comes_from_the_catalog(user, django_assert_num_queries):
+    plan = NeuralPlan.objects.create(
+        name="Mensualidad", description="", price=100000, duration=30
+    )
+    CatalogService.plans()
+    membership = UserMembership(
+        user=user,
+        membership_type=UserMembership.MembershipType.MENSUAL,
+        init_date="2026-01-01",
+    )
+
+    # Only the INSERT
+    with django_assert_num_queries(1):
+        membership.save()
+
+    assert membership.plan_id == plan.id
@@ -0,0 +1,54 @@
+from datetime import date, time
+
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+BEFORE = [("training", "0031_slot_unique_slot_per_class")]
+AFTER = [("training", "0032_unique_user_training_per_slot")]
+
+
+def migrate(targets):
+    executor = MigrationExecutor(connection)
+    executor.loader.build_graph()
+    executor.migrate(targets)
+    return executor.loader.project_state(targets).apps
+
+
+@pytest.fixture
+def old_apps(transactional_db):
+    apps = migrate(BEFORE)
+    yield apps
+    # Back to the latest state for the next tests
+    migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+
+def test_dedup_keeps_the_attended_booking_over_a_cancelled_one(old_apps):
+    User = old_apps.get_model("users", "User")
+    TrainingType = old_apps.get_model("training", "TrainingType")
+    Classes = old_apps.get_model("training", "Classes")
+    Slot = old_apps.get_model("training", "Slot")
+    UserTraining = old_apps.get_model("training", "UserTraining")
+    user = User.objects.create(
+        username="dup", email="dup@example.com", phone_number="+573009999999"
+    )
+    session = Classes.objects.create(
+        training_type=TrainingType.objects.create(name="Dup", slug_name="dup"),
+        hour_init=time(7, 0),
+        hour_end=time(8, 0),
+    )
+    slot = Slot.objects.create(
+        date=date(2026, 1, 5), max_places=20, class_training=session
+    )
+    UserTraining.objects.create(user=user, slot=slot, status="CANCELLED")
+    done = UserTraining.objects.create(user=user, slot=slot, status="DONE")
+    other = Slot.objects.create(date=date(2026, 1, 6), max_places=20)
+    UserTraining.objects.create(user=user, slot=other, status="CANCELLED")
+    newest = UserTraining.objects.create(user=user, slot=other, status="CANCELLED")
+
+    apps = migrate(AFTER)
+
+    UserTraining = apps.get_model("training", "UserTraining")
+    assert list(
+        UserTraining.objects.order_by("slot_id").values_list("id", flat=True)
+    ) == [done.id, newest.id]
@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from neural.services.schedule import ScheduleService
+from neural.training.models import Slot
+from neural.training.tests.factories import ClassesFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def daily_classes():
+    return [ClassesFactory(day=day) for day in ScheduleService.WEEKDAYS]
+
+
+def test_materialize_fills_the_horizon_once(daily_classes):
+    today = timezone.localdate()
+
+    created = ScheduleService.materialize(days=3)
+    again = ScheduleService.materialize(days=3)
+
+    assert sorted(slot.date for slot in created) == [
+        today + timedelta(days=offset) for offset in range(4)
+    ]
+    assert again == []
+
+
+def test_materialize_never_creates_past_slots(daily_classes):
+    today = timezone.localdate()
+
+    ScheduleService.materialize(start=today - timedelta(days=10), days=12)
+
+    assert min(Slot.objects.values_list("date", flat=True)) == today
+    assert Slot.objects.count() == 3
+
+
+def test_catch_up_fills_the_days_before_start(daily_classes):
+    today = timezone.localdate()
+
+    ScheduleService.materialize(start=today + timedelta(days=5), days=1, catch_up=True)
+
+    assert Slot.objects.filter(date__lt=today).count() == 0
+    assert Slot.objects.count() == 7
@@ -0,0 +1,54 @@
+import threading
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from neural.services.booking import BookingService
+from neural.services.stats import StatsService
+from neural.training.tests.factories import SlotFactory
+from neural.users.models import UserStrike
+from neural.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_refresh_streaks_is_idempotent(user):
+    BookingService.book(user, SlotFactory(date=timezone.localdate()))
+
+    StatsService.refresh_streaks(user.id)
+    StatsService.refresh_streaks(user.id)
+
+    strike = UserStrike.objects.get(user=user)
+    assert strike.is_current
+    assert strike.weeks == 1
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="Needs PostgreSQL row locks"
+)
+def test_concurrent_streak_refreshes_of_a_user_run_one_at_a_time():
+    user = UserFactory()
+    BookingService.book(user, SlotFactory(date=timezone.localdate()))
+    attempts = 4
+    barrier = threading.Barrier(attempts)
+    errors = []
+
+    def refresh():
+        barrier.wait()
+        try:
+            StatsService.refresh_streaks(user.id)
+        except Exception as error:
+            errors.append(error)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=refresh) for _ in range(attempts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert UserStrike.objects.filter(user=user, is_current=True).count() == 1
@@ -0,0 +1,95 @@
+from datetime import time, timedelta
+
+import pytest
+from django.contrib import admin
+from django.db import connection
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from neural.services.booking import BookingService
+from neural.training.api import TrainingViewSet
+from neural.training.models import Slot
+from neural.training.tests.factories import (
+    ClassesFactory,
+    SlotFactory,
+    TrainingTypeFactory,
+)
+from neural.training.views import TrainingByDateView
+from neural.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+requires_postgres = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="Needs PostgreSQL DISTINCT ON"
+)
+
+
+def booked_slots(size, date, **kwargs):
+    slots = SlotFactory.create_batch(size, date=date, **kwargs)
+    for slot in slots:
+        BookingService.book(UserFactory(), slot)
+    return slots
+
+
+@pytest.mark.parametrize("size", [1, 15])
+def test_sessions_by_date_query_count_does_not_grow_with_slots(
+    user, django_assert_num_queries, size
+):
+    date = timezone.localdate() + timedelta(days=1)
+    booked_slots(size, date)
+    request = RequestFactory().get(f"/training/{date.isoformat()}/")
+    request.user = user
+
+    # The user's booking check, the sessions and the user's membership
+    with django_assert_num_queries(3):
+        response = TrainingByDateView.as_view()(request, date=date.isoformat())
+        response.render()
+
+    assert len(response.context_data["sessions"]) == size
+
+
+@requires_postgres
+@pytest.mark.parametrize("size", [1, 15])
+def test_get_slots_query_count_does_not_grow_with_slots(
+    django_assert_num_queries, size
+):
+    date = timezone.localdate() + timedelta(days=1)
+    training_type = TrainingTypeFactory()
+    for hour in range(5, 5 + size):
+        slot = SlotFactory(
+            date=date,
+            class_training=ClassesFactory(
+                training_type=training_type,
+                hour_init=time(hour, 0),
+                hour_end=time(hour + 1, 0),
+            ),
+        )
+        BookingService.book(UserFactory(), slot)
+    request = APIRequestFactory().post(
+        "/api/training/get_slots/",
+        {"date": date.isoformat(), "training_type": training_type.pk},
+        format="json",
+    )
+
+    with django_assert_num_queries(1):
+        response = TrainingViewSet.as_view({"post": "get_slots"})(request)
+
+    assert len(response.data["result"]) == size
+
+
+@pytest.mark.parametrize("size", [1, 15])
+def test_slot_changelist_query_count_does_not_grow_with_slots(
+    django_assert_num_queries, size
+):
+    booked_slots(size, timezone.localdate() + timedelta(days=1))
+    request = RequestFactory().get("/admin/training/slot/")
+    request.user = UserFactory(is_staff=True, is_superuser=True)
+
+    # Filters, counts, the page of slots, the user's membership and the
+    # date hierarchy
+    with django_assert_num_queries(7):
+        response = admin.site._registry[Slot].changelist_view(request)
+        response.render()
+
+    assert response.context_data["cl"].result_count == size
@@ -3,8 +3,6 @@
 # Django
 from django.contrib import messages
 from datetime import timedelta
-from django.db import IntegrityError
-from django.db.models import F
 from django.http import HttpResponseRedirect
 from django.utils import timezone
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -17,6 +15,9 @@ from django.utils.translation import gettext as _
 
 # Models
 from neural.training.models import Slot, UserTraining
+
+# Services
+from neural.services.booking import BookingError, BookingService
 from datetime import datetime
 
 
@@ -98,10 +99,7 @@ class TrainingByDateView(LoginRequiredMixin, TemplateView):
             filter_dict["class_training__hour_init__gte"] = now
         context["sessions"] = (
             Slot.objects.filter(**filter_dict)
-            .select_related(
-                "class_training",
-                "class_training__training_type",
-            )
+            .with_availability()
             .order_by("class_training__hour_init")
         )
         activate("es")
@@ -124,49 +122,15 @@ class TrainingSlotView(LoginRequiredMixin, DetailView):
         context["date"] = slot_date
         return context
 
-    def _update_stats(self, user, slot):
-        year = timezone.now().year
-        slot_week_number = slot.date.isocalendar()[1]
-        try:
-            stats, created = user.stats.get_or_create(
-                year=year,
-                week=slot_week_number,
-            )
-        except IntegrityError:
-            # Race condition: another request created the record first
-            stats = user.stats.get(year=year, week=slot_week_number)
-        # Use F() expressions for atomic updates to avoid race conditions
-        user.stats.filter(pk=stats.pk).update(
-            trainings=F("trainings") + 1,
-            calories=F("calories") + 400,
-            hours=F("hours") + 1,
-        )
-
     def post(self, request, *args, **kwargs):
         # Create User training session
         user = self.request.user
         slot = self.get_object()
-        self._update_stats(user, slot)
-        # Get week day of the slot
-        slot_week_day = slot.date.isocalendar()[1]
-        # Check streak
-        streak = user.strikes.filter(is_current=True).first()
-        if streak:
-            # Different to this week day
-            if streak.last_week != int(slot_week_day):
-                # Add a strike
-                streak.weeks += 1
-                streak.last_week = int(slot_week_day)
-                streak.save()
-        else:
-            # Create a new strike
-            user.strikes.create(weeks=1, last_week=int(slot_week_day), is_current=True)
-        # Check again spaces
-        if not slot.available_places:
-            messages.error(
-                self.request,
-                "Este espacio de entreno se ha llenado, intenta seleccionando otro horario.",
-            )
+        # Reserve a seat
+        try:
+            schedule = BookingService.book(user, slot)
+        except BookingError as e:
+            messages.error(self.request, str(e))
             return render(
                 self.request,
                 self.template_name,
@@ -174,9 +138,6 @@ class TrainingSlotView(LoginRequiredMixin, DetailView):
                     "slot": slot,
                 },
             )
-        schedule, _ = UserTraining.objects.update_or_create(
-            slot=slot, user=self.request.user, defaults={"status": "CONFIRMED"}
-        )
         return HttpResponseRedirect(
             reverse_lazy("training:schedule-done", kwargs={"pk": schedule.pk})
         )
@@ -14,8 +14,10 @@ from neural.users.models import (
     NeuralPlan,
     UserPaymentReference,
     Device,
+    NotificationCounter,
     PushNotification,
     PushNotificationLog,
+    YearReviewSnapshot,
 )
 
 # Forms
@@ -110,10 +112,20 @@ class UserAdmin(auth_admin.UserAdmin):
 
 @admin.register(Ranking)
 class RankingAdmin(admin.ModelAdmin):
-    list_display = ["user", "position", "trainings"]
+    list_display = ["user", "year", "position", "trainings"]
+    list_filter = ["year"]
     search_fields = ["user__email", "user__first_name", "user__last_name"]
     readonly_fields = ["user"]
-    ordering = ["position"]
+    ordering = ["-year", "position"]
+
+
+@admin.register(YearReviewSnapshot)
+class YearReviewSnapshotAdmin(admin.ModelAdmin):
+    list_display = ["user", "year", "computed_at", "is_stale"]
+    list_filter = ["year", "is_stale"]
+    search_fields = ["user__email", "user__first_name", "user__last_name"]
+    readonly_fields = ["user", "year", "data", "computed_at", "is_stale"]
+    ordering = ["-year", "user"]
 
 
 # Push Notifications Admin
@@ -180,6 +192,21 @@ class PushNotificationAdmin(admin.ModelAdmin):
     def title_short(self, obj):
         return obj.title[:50] + "..." if len(obj.title) > 50 else obj.title
 
+    # Admin edits bypass the counters, rebuild the ones of the users touched
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        NotificationCounter.reconcile([obj.user_id])
+
+    def delete_model(self, request, obj):
+        user_id = obj.user_id
+        super().delete_model(request, obj)
+        NotificationCounter.reconcile([user_id])
+
+    def delete_queryset(self, request, queryset):
+        user_ids = set(queryset.values_list("user_id", flat=True))
+        super().delete_queryset(request, queryset)
+        NotificationCounter.reconcile(user_ids)
+
 
 @admin.register(PushNotificationLog)
 class PushNotificationLogAdmin(admin.ModelAdmin):
@@ -205,6 +232,7 @@ class PushNotificationLogAdmin(admin.ModelAdmin):
         "response_payload",
         "status",
         "expo_receipt_id",
+        "receipt_checked_at",
         "error_message",
         "created",
         "modified",
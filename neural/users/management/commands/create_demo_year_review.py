@@ -18,6 +18,7 @@ from neural.users.models import (
     NeuralPlan,
 )
 from neural.training.models import TrainingType, Classes, Slot, UserTraining, Space
+from neural.services.year_review import YearReviewService
 
 
 class Command(BaseCommand):
@@ -226,20 +227,13 @@ class Command(BaseCommand):
         self.stdout.write("Strikes created")
 
         # 8. Create ranking
-        Ranking.objects.filter(user=user).delete()
-
-        # Get a position that makes sense
         total_users = User.objects.filter(is_verified=True, is_client=True).count()
         position = random.randint(1, max(1, min(10, total_users)))
 
-        # Make sure position is unique
-        while Ranking.objects.filter(position=position).exists():
-            position += 1
-
-        Ranking.objects.create(
+        Ranking.objects.update_or_create(
             user=user,
-            position=position,
-            trainings=total_trainings,
+            year=year,
+            defaults={"position": position, "trainings": total_trainings},
         )
         self.stdout.write(f"Ranking created: position #{position}")
 
@@ -266,6 +260,10 @@ class Command(BaseCommand):
         )
         self.stdout.write("Membership created")
 
+        # 10. Build the year in review snapshot
+        YearReviewService.build(year, user_ids=[user.id])
+        self.stdout.write("Year in review snapshot built")
+
         # Summary
         self.stdout.write("")
         self.stdout.write(self.style.SUCCESS("=" * 50))
@@ -0,0 +1,61 @@
+"""Purge Notifications Command - Delete notifications past their retention."""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from neural.services.retention import RetentionService
+
+
+class Command(BaseCommand):
+    help = "Delete the notifications and Expo logs older than their retention"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show what would be deleted without actually deleting",
+        )
+        parser.add_argument(
+            "--export",
+            action="store_true",
+            default=None,
+            help="Save the deleted rows as JSONL.gz files on the media storage",
+        )
+        parser.add_argument(
+            "--no-export",
+            action="store_false",
+            dest="export",
+            help="Do not export, whatever NOTIFICATION_RETENTION_EXPORT says",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.NOTIFICATION_RETENTION_BATCH_SIZE,
+            help="Rows deleted per transaction",
+        )
+
+    def handle(self, *args, **options):
+        """Handle command usage."""
+        dry_run = options["dry_run"]
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING("DRY RUN - No changes will be made"))
+
+        report = RetentionService.purge(
+            dry_run=dry_run,
+            export=options["export"],
+            batch_size=options["batch_size"],
+        )
+
+        for notification_type, count in sorted(report["notifications"].items()):
+            self.stdout.write(f"{notification_type}: {count} notifications")
+        for name in report["files"]:
+            self.stdout.write(f"Exported {name}")
+
+        action = "Would delete" if dry_run else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{action} {sum(report['notifications'].values())} notifications "
+                f"and {report['logs']} logs"
+            )
+        )
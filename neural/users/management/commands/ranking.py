@@ -1,10 +1,10 @@
 """Ranking Command - Generate yearly rankings for Year in Review."""
 
 from django.core.management.base import BaseCommand
-from django.db.models import Count
 from django.utils import timezone
-from neural.users.models import User, Ranking
-from neural.training.models import UserTraining
+from neural.users.models import User
+from neural.services.ranking import RankingService
+from neural.services.year_review import YearReviewService
 
 
 class Command(BaseCommand):
@@ -23,35 +23,24 @@ class Command(BaseCommand):
         year = options["year"]
         self.stdout.write(f"Generating rankings for {year}...")
 
-        # Clear existing rankings
-        Ranking.objects.all().delete()
+        rankings = RankingService.generate(year)
 
-        # Get all user trainings for the year
-        all_user_training = (
-            UserTraining.objects.filter(
-                slot__date__year=year,
-                status__in=[UserTraining.Status.CONFIRMED, UserTraining.Status.DONE],
+        if options["verbosity"] > 1:
+            emails = dict(
+                User.objects.filter(
+                    id__in=[ranking.user_id for ranking in rankings]
+                ).values_list("id", "email")
             )
-            .values("user")
-            .annotate(
-                training_count=Count("user"),
-            )
-            .order_by("-training_count")
-            .distinct()
-        )
-
-        index = 1
-        for user_data in all_user_training:
-            user = User.objects.get(pk=user_data["user"])
-            user.rankings.update_or_create(
-                position=index,
-                defaults={"trainings": user_data.get("training_count", 0)},
-            )
-            self.stdout.write(
-                f"#{index} - {user.email}: {user_data.get('training_count', 0)} trainings"
-            )
-            index += 1
+            for ranking in rankings:
+                self.stdout.write(
+                    f"#{ranking.position} - {emails.get(ranking.user_id)}: "
+                    f"{ranking.trainings} trainings"
+                )
 
         self.stdout.write(
-            self.style.SUCCESS(f"Rankings generated for {index - 1} users")
+            self.style.SUCCESS(f"Rankings generated for {len(rankings)} users")
         )
+
+        # Positions are part of the year in review snapshots
+        snapshots = YearReviewService.build(year)
+        self.stdout.write(f"Year in review snapshots built: {len(snapshots)}")
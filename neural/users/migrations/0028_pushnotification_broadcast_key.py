@@ -0,0 +1,26 @@
+# Generated by Django 4.2 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0027_remove_userstats_unique_stats_alter_userstats_year_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pushnotification",
+            name="broadcast_key",
+            field=models.CharField(blank=True, max_length=32, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="pushnotification",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("broadcast_key__isnull", False)),
+                fields=("broadcast_key", "user"),
+                name="unique_broadcast_notification",
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2 on 2026-10-18 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0028_pushnotification_broadcast_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pushnotificationlog",
+            name="receipt_checked_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="pushnotificationlog",
+            index=models.Index(
+                condition=models.Q(
+                    ("expo_receipt_id__isnull", False),
+                    ("receipt_checked_at__isnull", True),
+                ),
+                fields=["created"],
+                name="pending_receipt_idx",
+            ),
+        ),
+    ]
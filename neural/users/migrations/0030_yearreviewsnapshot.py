@@ -0,0 +1,67 @@
+# Generated by Django 4.2 on 2026-10-18 19:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0029_pushnotificationlog_receipt_checked_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="YearReviewSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="Date time on which the object was created.",
+                        verbose_name="created at",
+                    ),
+                ),
+                (
+                    "modified",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Date time on which the object was last modified.",
+                        verbose_name="modified at",
+                    ),
+                ),
+                ("year", models.PositiveIntegerField()),
+                ("data", models.JSONField(default=dict)),
+                ("computed_at", models.DateTimeField()),
+                ("is_stale", models.BooleanField(default=False)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="year_reviews",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Resumen del año",
+                "verbose_name_plural": "Resúmenes del año",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="yearreviewsnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("user", "year"), name="unique_year_review_snapshot"
+            ),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2 on 2026-10-18 19:19
+
+from django.db import migrations, models
+
+
+def drop_yearless_rankings(apps, schema_editor):
+    """Rankings generated in January belong to the year before, so the
+    year of the existing rows cannot be told from created."""
+    Ranking = apps.get_model("users", "Ranking")
+    Ranking.objects.all().delete()
+
+
+def regenerate_rankings(apps, schema_editor):
+    """Rank every year with counted trainings again."""
+    from neural.services.ranking import RankingService
+
+    Slot = apps.get_model("training", "Slot")
+    years = Slot.objects.filter(
+        user_trainings__status__in=RankingService.COUNTED_STATUSES
+    ).dates("date", "year")
+    for day in years:
+        RankingService.generate(day.year)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0030_yearreviewsnapshot"),
+        ("training", "0032_unique_user_training_per_slot"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="ranking",
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name="ranking",
+            name="year",
+            field=models.PositiveIntegerField(db_index=True, null=True),
+        ),
+        migrations.RunPython(drop_yearless_rankings, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="ranking",
+            name="year",
+            field=models.PositiveIntegerField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="ranking",
+            name="position",
+            field=models.PositiveIntegerField(),
+        ),
+        migrations.AddIndex(
+            model_name="ranking",
+            index=models.Index(
+                fields=["year", "position"], name="users_ranki_year_3a8e5f_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="ranking",
+            constraint=models.UniqueConstraint(
+                fields=("user", "year"), name="unique_ranking_per_year"
+            ),
+        ),
+        # Last, so the inserts do not block the ALTER TABLEs above on
+        # PostgreSQL (pending deferred foreign key checks)
+        migrations.RunPython(regenerate_rankings, migrations.RunPython.noop),
+    ]
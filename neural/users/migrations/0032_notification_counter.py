@@ -0,0 +1,65 @@
+# Generated by Django 4.2 on 2026-10-18 19:33
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0031_ranking_per_year"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="Date time on which the object was created.",
+                        verbose_name="created at",
+                    ),
+                ),
+                (
+                    "modified",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Date time on which the object was last modified.",
+                        verbose_name="modified at",
+                    ),
+                ),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("unread", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Contador de notificaciones",
+                "verbose_name_plural": "Contadores de notificaciones",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="pushnotification",
+            index=models.Index(
+                fields=["user", "status", "-created"], name="notification_inbox_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="notificationcounter",
+            name="user",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="notification_counter",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-18 19:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0032_notification_counter"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="pushnotification",
+            index=models.Index(
+                fields=["notification_type", "created"],
+                name="notification_type_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pushnotificationlog",
+            index=models.Index(fields=["created"], name="notification_log_created_idx"),
+        ),
+    ]
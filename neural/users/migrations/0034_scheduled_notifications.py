@@ -0,0 +1,36 @@
+# Generated by Django 4.2 on 2026-10-18 19:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0033_notification_retention_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="pushnotification",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("scheduled", "Programada"),
+                    ("pending", "Pendiente"),
+                    ("sent", "Enviada"),
+                    ("delivered", "Entregada"),
+                    ("failed", "Fallida"),
+                    ("read", "Leída"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pushnotification",
+            index=models.Index(
+                condition=models.Q(("status", "scheduled")),
+                fields=["scheduled_for"],
+                name="scheduled_notification_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-18 20:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0034_scheduled_notifications"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="pushnotification",
+            index=models.Index(
+                condition=models.Q(
+                    ("scheduled_for__isnull", False), ("status", "pending")
+                ),
+                fields=["modified"],
+                name="claimed_notification_idx",
+            ),
+        ),
+    ]
@@ -4,16 +4,21 @@ from slugify import slugify
 
 # Django
 from django.core.cache import cache
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
-from django.db.models import Q
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
 from django.utils import timezone
+from collections import Counter
 from datetime import timedelta
 
 # Utils
 from neural.utils.models import NeuralBaseModel
 
+# Services
+from neural.services.catalog import CatalogService
+
 
 class User(NeuralBaseModel, AbstractUser):
     """User model.
@@ -126,20 +131,50 @@ class UserMembership(NeuralBaseModel):
         date_now = timezone.localdate()
         return (self.expiration_date - date_now).days + 1
 
+    @staticmethod
+    def cache_key(user_id, day):
+        """Cache key of the active membership of a user on a day."""
+        return f"membership_state_{user_id}_{day}"
+
+    @classmethod
+    def invalidate_cache(cls, user_ids):
+        """Drop today's cached active membership of some users."""
+        day = timezone.localdate()
+        cache.delete_many([cls.cache_key(user_id, day) for user_id in user_ids])
+
+    @classmethod
+    def expire(cls, today=None):
+        """
+        Deactivate the memberships that expired before today.
+
+        The expired rows are locked and deactivated with a single UPDATE,
+        ``save`` is skipped since their plan is already set.
+
+        Returns:
+            IDs of the users whose membership expired
+        """
+        today = today or timezone.localdate()
+        with transaction.atomic():
+            expired = dict(
+                cls.objects.select_for_update()
+                .filter(is_active=True, expiration_date__lt=today)
+                .values_list("id", "user_id")
+            )
+            cls.objects.filter(id__in=expired).update(
+                is_active=False, modified=timezone.now()
+            )
+        user_ids = list(expired.values())
+        # Queryset updates do not send post_save
+        cls.invalidate_cache(user_ids)
+        return user_ids
+
     def save(self, *args, **kwargs):
-        # Reset cache membership
-        now = timezone.localtime()
-        cache_key = f"user_membership_{self.user.id}_{now.date()}"
-        # Reset cache membership
-        cache.delete(cache_key)
         dict_plans = {
             "MENSUAL": "Mensualidad",
             "QUARTER": "Trimestre",
             "SEMESTER": "Semestre",
         }
-        self.plan = NeuralPlan.objects.filter(
-            name=dict_plans.get(self.membership_type)
-        ).last()
+        self.plan_id = CatalogService.plan_id(dict_plans.get(self.membership_type))
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -224,14 +259,21 @@ class Ranking(NeuralBaseModel):
     user = models.ForeignKey(
         "users.User", on_delete=models.CASCADE, related_name="rankings"
     )
-    position = models.PositiveIntegerField(unique=True)
+    year = models.PositiveIntegerField(db_index=True)
+    # Users with the same trainings share a position (RANK)
+    position = models.PositiveIntegerField()
     trainings = models.PositiveIntegerField(default=0)
 
     def __str__(self):
-        return f"{self.user} - {self.position}"
+        return f"{self.user} - {self.year} - {self.position}"
 
     class Meta:
-        unique_together = ("user", "position")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "year"], name="unique_ranking_per_year"
+            )
+        ]
+        indexes = [models.Index(fields=["year", "position"])]
 
 
 class UserStrike(NeuralBaseModel):
@@ -291,6 +333,35 @@ class UserStats(NeuralBaseModel):
         return f"{self.user} - {self.week} - {self.trainings} trainings"
 
 
+class YearReviewSnapshot(NeuralBaseModel):
+    """Year in review snapshot.
+
+    Precomputed year in review data of a user, built in batch by
+    YearReviewService and read by the API and web views.
+    """
+
+    user = models.ForeignKey(
+        "users.User", on_delete=models.CASCADE, related_name="year_reviews"
+    )
+    year = models.PositiveIntegerField()
+    data = models.JSONField(default=dict)
+    computed_at = models.DateTimeField()
+    # Set when trainings or stats of the year change after computed_at
+    is_stale = models.BooleanField(default=False)
+
+    class Meta:
+        verbose_name = "Resumen del año"
+        verbose_name_plural = "Resúmenes del año"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "year"], name="unique_year_review_snapshot"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.year}"
+
+
 class UserPaymentReference(NeuralBaseModel):
     """User payment reference model.
 
@@ -373,6 +444,7 @@ class PushNotification(NeuralBaseModel):
         COMMUNITY = "community", "Comunidad"
 
     class Status(models.TextChoices):
+        SCHEDULED = "scheduled", "Programada"
         PENDING = "pending", "Pendiente"
         SENT = "sent", "Enviada"
         DELIVERED = "delivered", "Entregada"
@@ -396,22 +468,240 @@ class PushNotification(NeuralBaseModel):
     sent_at = models.DateTimeField(blank=True, null=True)
     read_at = models.DateTimeField(blank=True, null=True)
 
-    # For scheduled notifications
+    # Due time of the scheduled notifications, sent once it has passed
     scheduled_for = models.DateTimeField(blank=True, null=True)
 
+    # Groups the notifications of one broadcast, one per user, also keys
+    # the single reminder of each booking
+    broadcast_key = models.CharField(max_length=32, blank=True, null=True)
+
+    # Statuses shown in the inbox, and the ones that count as unread
+    VISIBLE_STATUSES = [
+        Status.PENDING,
+        Status.SENT,
+        Status.DELIVERED,
+        Status.READ,
+    ]
+    UNREAD_STATUSES = [Status.PENDING, Status.SENT, Status.DELIVERED]
+
     class Meta:
         verbose_name = "Notificación"
         verbose_name_plural = "Notificaciones"
         ordering = ["-created"]
+        indexes = [
+            # Inbox and unread counts of a user
+            models.Index(
+                fields=["user", "status", "-created"], name="notification_inbox_idx"
+            ),
+            # Retention purge
+            models.Index(
+                fields=["notification_type", "created"],
+                name="notification_type_created_idx",
+            ),
+            # Due-time queue of the scheduled notifications
+            models.Index(
+                fields=["scheduled_for"],
+                condition=Q(status="scheduled"),
+                name="scheduled_notification_idx",
+            ),
+            # Lease of the claimed scheduled notifications
+            models.Index(
+                fields=["modified"],
+                condition=Q(status="pending", scheduled_for__isnull=False),
+                name="claimed_notification_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["broadcast_key", "user"],
+                condition=Q(broadcast_key__isnull=False),
+                name="unique_broadcast_notification",
+            )
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.title[:50]}"
 
     def mark_as_read(self):
-        if self.status != self.Status.READ:
-            self.status = self.Status.READ
-            self.read_at = timezone.now()
-            self.save(update_fields=["status", "read_at", "modified"])
+        """
+        Mark the notification as read.
+
+        The UPDATE is conditional on the status that was read, so of
+        several concurrent calls only the one that changed the row moves
+        the counters.
+        """
+        if self.status == self.Status.READ:
+            return
+        previous = self.status
+        now = timezone.now()
+        updated = PushNotification.objects.filter(pk=self.pk, status=previous).update(
+            status=self.Status.READ, read_at=now, modified=now
+        )
+        self.status, self.read_at, self.modified = self.Status.READ, now, now
+        if updated:
+            NotificationCounter.track(self.user_id, previous, self.status)
+
+
+class NotificationCounter(NeuralBaseModel):
+    """Denormalized inbox counts of a user.
+
+    Kept up to date with atomic increments wherever notifications are
+    created, change status or are deleted, so the badge is one lookup.
+    ``reconcile`` rebuilds them from the notifications.
+    """
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name="notification_counter"
+    )
+    # Notifications shown in the inbox
+    total = models.PositiveIntegerField(default=0)
+    unread = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Contador de notificaciones"
+        verbose_name_plural = "Contadores de notificaciones"
+
+    def __str__(self):
+        return f"{self.user} - {self.unread}/{self.total}"
+
+    @staticmethod
+    def weight(status):
+        """``(total, unread)`` contribution of a notification status."""
+        return (
+            int(status in PushNotification.VISIBLE_STATUSES),
+            int(status in PushNotification.UNREAD_STATUSES),
+        )
+
+    @classmethod
+    def track(cls, user_ids, old_status=None, new_status=None):
+        """
+        Apply a status change of notifications to their users' counters.
+
+        Args:
+            user_ids: Owner of each changed notification, a user listed
+                twice had two notifications changed
+            old_status: Status before the change, None when created
+            new_status: Status after the change, None when deleted
+        """
+        if isinstance(user_ids, int):
+            user_ids = [user_ids]
+        old_total, old_unread = cls.weight(old_status)
+        new_total, new_unread = cls.weight(new_status)
+        cls.adjust(
+            user_ids, total=new_total - old_total, unread=new_unread - old_unread
+        )
+
+    @classmethod
+    def adjust(cls, user_ids, total=0, unread=0):
+        """
+        Atomically add the deltas to the counters of some users.
+
+        Users without a counter get one rebuilt from their notifications,
+        which already include the change.
+        """
+        if not user_ids or not (total or unread):
+            return
+
+        def delta(field, value):
+            if value > 0:
+                return F(field) + value
+            return Greatest(F(field) + value, 0)
+
+        # One UPDATE per number of changed notifications per user
+        by_times = {}
+        for user_id, times in Counter(user_ids).items():
+            by_times.setdefault(times, []).append(user_id)
+
+        now = timezone.now()
+        updated = 0
+        for times, ids in by_times.items():
+            values = {
+                field: delta(field, value * times)
+                for field, value in (("total", total), ("unread", unread))
+                if value
+            }
+            updated += cls.objects.filter(user_id__in=ids).update(
+                modified=now, **values
+            )
+
+        if updated < len(set(user_ids)):
+            existing = cls.objects.filter(user_id__in=user_ids).values_list(
+                "user_id", flat=True
+            )
+            cls.reconcile(set(user_ids) - set(existing))
+
+    @classmethod
+    def for_user(cls, user_id):
+        """Get the counter of a user, building it when missing."""
+        counter = cls.objects.filter(user_id=user_id).first()
+        if counter is None:
+            cls.reconcile([user_id])
+            counter = cls.objects.get(user_id=user_id)
+        return counter
+
+    @classmethod
+    def reconcile(cls, user_ids=None):
+        """
+        Rebuild counters from the notifications.
+
+        Args:
+            user_ids: Users to rebuild, every user with notifications or a
+                counter when None
+
+        Returns:
+            Number of counters that were missing or had drifted
+        """
+        notifications = PushNotification.objects.all()
+        counters = cls.objects.all()
+        if user_ids is not None:
+            user_ids = list(user_ids)
+            notifications = notifications.filter(user_id__in=user_ids)
+            counters = counters.filter(user_id__in=user_ids)
+
+        actual = {
+            row["user"]: (row["visible"], row["not_read"])
+            for row in notifications.order_by()
+            .values("user")
+            .annotate(
+                visible=Count(
+                    "id", filter=Q(status__in=PushNotification.VISIBLE_STATUSES)
+                ),
+                not_read=Count(
+                    "id", filter=Q(status__in=PushNotification.UNREAD_STATUSES)
+                ),
+            )
+        }
+        stored = {
+            user_id: (total, unread)
+            for user_id, total, unread in counters.values_list(
+                "user_id", "total", "unread"
+            )
+        }
+        for user_id in user_ids or []:
+            actual.setdefault(user_id, (0, 0))
+        for user_id in stored:
+            actual.setdefault(user_id, (0, 0))
+
+        now = timezone.now()
+        drifted = [
+            cls(
+                user_id=user_id,
+                total=total,
+                unread=unread,
+                created=now,
+                modified=now,
+            )
+            for user_id, (total, unread) in actual.items()
+            if stored.get(user_id) != (total, unread)
+        ]
+        cls.objects.bulk_create(
+            drifted,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=["total", "unread", "modified"],
+        )
+        return len(drifted)
 
 
 class PushNotificationLog(NeuralBaseModel):
@@ -449,9 +739,22 @@ class PushNotificationLog(NeuralBaseModel):
     expo_receipt_id = models.CharField(max_length=100, blank=True, null=True)
     error_message = models.TextField(blank=True, null=True)
 
+    # Set once the Expo receipt for the ticket has been processed
+    receipt_checked_at = models.DateTimeField(blank=True, null=True)
+
     class Meta:
         verbose_name = "Log de notificación"
         verbose_name_plural = "Logs de notificaciones"
+        indexes = [
+            models.Index(
+                fields=["created"],
+                condition=Q(
+                    expo_receipt_id__isnull=False, receipt_checked_at__isnull=True
+                ),
+                name="pending_receipt_idx",
+            ),
+            models.Index(fields=["created"], name="notification_log_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.notification} - {self.status}"
@@ -0,0 +1,49 @@
+"""Users signals."""
+
+# Django
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# Models
+from neural.training.models import Space, TrainingType, UserTraining
+from neural.users.models import NeuralPlan, UserMembership, UserStats, UserStrike
+
+# Services
+from neural.services.catalog import CatalogService
+from neural.services.dashboard import DashboardService
+from neural.services.year_review import YearReviewService
+
+
+@receiver([post_save, post_delete], sender=UserTraining)
+@receiver([post_save, post_delete], sender=UserStats)
+@receiver([post_save, post_delete], sender=UserStrike)
+def invalidate_dashboard(sender, instance, **kwargs):
+    """Drop the dashboard snapshot of the user that owns the changed row."""
+    DashboardService.invalidate(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=UserMembership)
+def invalidate_membership(sender, instance, **kwargs):
+    """Drop the cached membership of the user that owns the changed row."""
+    UserMembership.invalidate_cache([instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=TrainingType)
+@receiver([post_save, post_delete], sender=NeuralPlan)
+@receiver([post_save, post_delete], sender=Space)
+def bump_catalog(sender, instance, **kwargs):
+    """Retire the cached catalogs when their reference data changes."""
+    CatalogService.bump()
+
+
+@receiver([post_save, post_delete], sender=UserTraining)
+def mark_year_review_stale_for_training(sender, instance, **kwargs):
+    """Flag the year in review of the year the training belongs to."""
+    if instance.slot_id:
+        YearReviewService.mark_stale_for_slot(instance.user_id, instance.slot_id)
+
+
+@receiver([post_save, post_delete], sender=UserStats)
+def mark_year_review_stale_for_stats(sender, instance, **kwargs):
+    """Flag the year in review of the year of the changed stats."""
+    YearReviewService.mark_stale(instance.user_id, [instance.year])
@@ -1,18 +1,34 @@
 # Celery
 from config import celery_app
+from celery import chord
 from celery.schedules import crontab
 from django.utils import timezone
 from datetime import timedelta
+import json
 import logging
+import math
+import uuid
 
 # Models
-from neural.users.models import UserMembership
+from neural.users.models import NotificationCounter, UserMembership
 
 # Services
-from neural.services.push_notifications import PushNotificationService
+from neural.services.push_notifications import (
+    SCHEDULED_BATCH_SIZE,
+    PushNotificationService,
+)
+from neural.services.ranking import RankingService
+from neural.services.reminders import ReminderService
+from neural.services.retention import RetentionService
+from neural.services.year_review import YearReviewService
 
 logger = logging.getLogger(__name__)
 
+# Recipients per broadcast subtask
+BROADCAST_SHARD_SIZE = 500
+# Dispatchers started at most per minute for the scheduled notifications
+SCHEDULED_DISPATCHERS = 4
+
 
 @celery_app.on_after_finalize.connect
 def setup_periodic_tasks(sender, **kwargs):
@@ -30,115 +46,169 @@ def setup_periodic_tasks(sender, **kwargs):
         name="send_membership_expiring_notifications",
     )
 
-    # Send training reminders - every 30 minutes
+    # Send the scheduled notifications that are due - every minute
+    sender.add_periodic_task(
+        crontab(minute="*"),
+        send_scheduled_notifications.s(),
+        name="send_scheduled_notifications",
+    )
+
+    # Schedule missing and revoke stale training reminders - every 30 minutes
     sender.add_periodic_task(
         crontab(minute="*/30"),
-        send_training_reminders.s(),
-        name="send_training_reminders",
+        sync_training_reminders.s(),
+        name="sync_training_reminders",
     )
 
+    # Generate the current year's ranking - daily at 1:30am
+    sender.add_periodic_task(
+        crontab(day_of_week="*", hour=1, minute=30),
+        generate_rankings.s(),
+        name="generate_rankings",
+    )
 
-@celery_app.task
-def check_user_memberships():
-    """Check and expire user memberships, send notification."""
-    today = timezone.localdate()
-    user_memberships = UserMembership.objects.filter(
-        is_active=True, expiration_date__lt=today
+    # Build year in review snapshots - daily at 2am
+    sender.add_periodic_task(
+        crontab(day_of_week="*", hour=2, minute=0),
+        build_year_reviews.s(),
+        name="build_year_reviews",
     )
 
-    for membership in user_memberships:
-        membership.is_active = False
-        membership.save()
+    # Apply Expo push receipts - every 15 minutes
+    sender.add_periodic_task(
+        crontab(minute="*/15"),
+        process_push_receipts.s(),
+        name="process_push_receipts",
+    )
 
-        # Send expired notification
-        try:
-            PushNotificationService.send_membership_expired(membership.user)
-            logger.info(
-                f"Sent membership expired notification to {membership.user.email}"
-            )
-        except Exception as e:
-            logger.error(f"Error sending membership expired notification: {e}")
+    # Purge expired notifications and logs - daily at 3am
+    sender.add_periodic_task(
+        crontab(day_of_week="*", hour=3, minute=0),
+        purge_old_notifications.s(),
+        name="purge_old_notifications",
+    )
+
+    # Rebuild drifted notification counters - daily at 4am
+    sender.add_periodic_task(
+        crontab(day_of_week="*", hour=4, minute=0),
+        reconcile_notification_counters.s(),
+        name="reconcile_notification_counters",
+    )
+
+
+@celery_app.task
+def check_user_memberships():
+    """Expire the memberships that ended and notify their users."""
+    user_ids = UserMembership.expire()
+    logger.info(f"Expired {len(user_ids)} memberships")
+    if not user_ids:
+        return 0
+
+    try:
+        PushNotificationService.send_membership_expired(user_ids)
+    except Exception as e:
+        logger.error(f"Error sending membership expired notifications: {e}")
+    return len(user_ids)
 
 
 @celery_app.task
 def send_membership_expiring_notifications():
     """Send notifications for memberships expiring in 3 days and 1 day."""
     today = timezone.localdate()
+    days_left_by_date = {today + timedelta(days=days): days for days in (3, 1)}
 
-    # Check memberships expiring in 3 days
-    expiring_3_days = today + timedelta(days=3)
-    memberships_3_days = UserMembership.objects.filter(
-        is_active=True, expiration_date=expiring_3_days
-    )
+    user_ids_by_days = {}
+    for user_id, expiration_date in UserMembership.objects.filter(
+        is_active=True, expiration_date__in=days_left_by_date
+    ).values_list("user_id", "expiration_date"):
+        days_left = days_left_by_date[expiration_date]
+        user_ids_by_days.setdefault(days_left, []).append(user_id)
 
-    for membership in memberships_3_days:
+    for days_left, user_ids in user_ids_by_days.items():
         try:
-            PushNotificationService.send_membership_expiring(
-                membership.user, days_left=3
+            PushNotificationService.send_membership_expiring(user_ids, days_left)
+            logger.info(
+                f"Sent {days_left}-day expiring notification to {len(user_ids)} users"
             )
-            logger.info(f"Sent 3-day expiring notification to {membership.user.email}")
         except Exception as e:
-            logger.error(f"Error sending 3-day expiring notification: {e}")
+            logger.error(f"Error sending {days_left}-day expiring notifications: {e}")
+
+
+@celery_app.task
+def send_scheduled_notifications():
+    """
+    Report the scheduled notifications backlog and start enough
+    dispatchers to drain the due ones.
+    """
+    backlog = PushNotificationService.scheduled_backlog()
+    logger.info(f"scheduled_backlog {json.dumps(backlog)}")
 
-    # Check memberships expiring tomorrow
-    expiring_1_day = today + timedelta(days=1)
-    memberships_1_day = UserMembership.objects.filter(
-        is_active=True, expiration_date=expiring_1_day
+    dispatchers = min(
+        SCHEDULED_DISPATCHERS,
+        math.ceil((backlog["due"] + backlog["expired"]) / SCHEDULED_BATCH_SIZE),
     )
+    for _ in range(dispatchers):
+        dispatch_scheduled_notifications.delay()
+    return backlog
 
-    for membership in memberships_1_day:
-        try:
-            PushNotificationService.send_membership_expiring(
-                membership.user, days_left=1
-            )
-            logger.info(f"Sent 1-day expiring notification to {membership.user.email}")
-        except Exception as e:
-            logger.error(f"Error sending 1-day expiring notification: {e}")
+
+@celery_app.task
+def dispatch_scheduled_notifications():
+    """Claim and send due scheduled notifications until none is left."""
+    return PushNotificationService.send_due()
+
+
+@celery_app.task
+def sync_training_reminders():
+    """Match the training reminders with the upcoming bookings."""
+    return ReminderService.sync()
+
+
+@celery_app.task
+def generate_rankings(year: int = None):
+    """Replace the rankings of a year, the current one by default."""
+    year = year or timezone.localdate().year
+    return len(RankingService.generate(year))
+
+
+@celery_app.task
+def build_year_reviews(year: int = None, user_ids: list = None):
+    """
+    Build year in review snapshots.
+
+    Without arguments it rebuilds the current year for every user, plus
+    the stale snapshots of previous years.
+    """
+    if year is not None or user_ids is not None:
+        year = year or timezone.localdate().year
+        return len(YearReviewService.build(year, user_ids=user_ids))
+
+    built = len(YearReviewService.build(timezone.localdate().year))
+    built += YearReviewService.rebuild_stale()
+    logger.info(f"Built {built} year review snapshots")
+    return built
+
+
+@celery_app.task
+def process_push_receipts():
+    """Update notification delivery and deactivate dead devices from receipts."""
+    return PushNotificationService.process_receipts()
 
 
 @celery_app.task
-def send_training_reminders():
-    """Send reminders for trainings starting in 1 hour."""
-    from neural.training.models import UserTraining, Slot
-
-    now = timezone.localtime()
-    today = now.date()
-    (now + timedelta(hours=1)).time()
-
-    # Find slots for today where the training starts within the next hour
-    # We check for trainings starting between now+55min and now+65min
-    time_start = (now + timedelta(minutes=55)).time()
-    time_end = (now + timedelta(minutes=65)).time()
-
-    # Get slots for today
-    slots = Slot.objects.filter(
-        date=today,
-        class_training__hour_init__gte=time_start,
-        class_training__hour_init__lte=time_end,
-    ).select_related("class_training", "class_training__training_type")
-
-    for slot in slots:
-        # Get confirmed trainings for this slot
-        user_trainings = UserTraining.objects.filter(
-            slot=slot,
-            status=UserTraining.Status.CONFIRMED,
-        ).select_related("user")
-
-        for training in user_trainings:
-            try:
-                training_type = slot.class_training.training_type.name
-                time_str = slot.class_training.hour_init.strftime("%H:%M")
-
-                PushNotificationService.send_training_reminder(
-                    user=training.user,
-                    training_type=training_type,
-                    time=time_str,
-                )
-                logger.info(
-                    f"Sent training reminder to {training.user.email} for {training_type} at {time_str}"
-                )
-            except Exception as e:
-                logger.error(f"Error sending training reminder: {e}")
+def reconcile_notification_counters():
+    """Rebuild the notification counters that drifted from the notifications."""
+    drifted = NotificationCounter.reconcile()
+    if drifted:
+        logger.warning(f"Reconciled {drifted} notification counters")
+    return drifted
+
+
+@celery_app.task
+def purge_old_notifications():
+    """Delete the notifications and Expo logs past their retention."""
+    report = RetentionService.purge()
+    return {"logs": report["logs"], "notifications": report["notifications"]}
 
 
 @celery_app.task
@@ -174,6 +244,115 @@ def send_push_notification_to_user(
         return None
 
 
+def _dispatch_broadcast(
+    title: str,
+    body: str,
+    notification_type: str,
+    data: dict = None,
+    exclude_user_ids: list = None,
+):
+    """
+    Split the recipients of a broadcast into ID-range shards and send
+    them as a chord, the counts are aggregated by broadcast_completed.
+    """
+    from neural.users.models import User
+
+    recipients = User.objects.filter(devices__is_active=True)
+    if exclude_user_ids:
+        recipients = recipients.exclude(id__in=exclude_user_ids)
+    user_ids = list(recipients.order_by("id").values_list("id", flat=True).distinct())
+
+    if not user_ids:
+        logger.info(f"No recipients for broadcast: {title}")
+        return None
+
+    broadcast_key = uuid.uuid4().hex
+    shards = [
+        send_broadcast_shard.s(
+            broadcast_key=broadcast_key,
+            first_user_id=chunk[0],
+            last_user_id=chunk[-1],
+            title=title,
+            body=body,
+            notification_type=notification_type,
+            data=data,
+            exclude_user_ids=exclude_user_ids,
+        )
+        for chunk in (
+            user_ids[start : start + BROADCAST_SHARD_SIZE]
+            for start in range(0, len(user_ids), BROADCAST_SHARD_SIZE)
+        )
+    ]
+    chord(shards)(broadcast_completed.s(broadcast_key=broadcast_key, title=title))
+    logger.info(
+        f"Broadcast {broadcast_key} queued in {len(shards)} shards "
+        f"for {len(user_ids)} users: {title}"
+    )
+    return broadcast_key
+
+
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=30)
+def send_broadcast_shard(
+    self,
+    broadcast_key: str,
+    first_user_id: int,
+    last_user_id: int,
+    title: str,
+    body: str,
+    notification_type: str = "general",
+    data: dict = None,
+    exclude_user_ids: list = None,
+):
+    """
+    Send a broadcast to the users with active devices in an ID range.
+
+    Users whose notification for the broadcast was already sent or failed
+    are skipped, so retrying a shard does not send them twice. The ones
+    left PENDING by an attempt that died mid-send are sent again.
+    """
+    from neural.users.models import PushNotification, User
+    from neural.services.push_notifications import NotificationPayload
+
+    recipients = User.objects.filter(
+        id__range=(first_user_id, last_user_id), devices__is_active=True
+    )
+    if exclude_user_ids:
+        recipients = recipients.exclude(id__in=exclude_user_ids)
+    user_ids = list(recipients.order_by("id").values_list("id", flat=True).distinct())
+
+    payload = NotificationPayload(
+        title=title,
+        body=body,
+        notification_type=notification_type,
+        data=data,
+    )
+    try:
+        notifications = PushNotificationService.send_bulk(
+            user_ids, payload, broadcast_key=broadcast_key
+        )
+    except Exception as e:
+        if self.request.retries >= self.max_retries:
+            logger.error(
+                f"Broadcast {broadcast_key} shard {first_user_id}-{last_user_id} failed: {e}"
+            )
+            return {"sent": 0, "failed": len(user_ids)}
+        raise self.retry(exc=e)
+
+    sent = sum(1 for n in notifications if n.status == PushNotification.Status.SENT)
+    return {"sent": sent, "failed": len(notifications) - sent}
+
+
+@celery_app.task
+def broadcast_completed(results, broadcast_key: str, title: str):
+    """Aggregate the sent/failed counts of all shards of a broadcast."""
+    sent = sum(result.get("sent", 0) for result in results)
+    failed = sum(result.get("failed", 0) for result in results)
+    logger.info(
+        f"Broadcast {broadcast_key} finished: {sent} sent, {failed} failed: {title}"
+    )
+    return {"sent": sent, "failed": failed}
+
+
 @celery_app.task
 def send_push_notification_to_all(
     title: str, body: str, notification_type: str = "general"
@@ -181,20 +360,15 @@ def send_push_notification_to_all(
     """
     Task to send a push notification to all users with active devices.
     """
-    from neural.services.push_notifications import NotificationPayload
-
     try:
-        payload = NotificationPayload(
+        return _dispatch_broadcast(
             title=title,
             body=body,
             notification_type=notification_type,
         )
-        count = PushNotificationService.send_to_all_users(payload)
-        logger.info(f"Sent notification to {count} users: {title}")
-        return count
     except Exception as e:
         logger.error(f"Error sending notification to all users: {e}")
-        return 0
+        return None
 
 
 @celery_app.task
@@ -209,21 +383,15 @@ def send_community_notification_to_all(
     Used for new post notifications.
     """
     from neural.users.models import PushNotification
-    from neural.services.push_notifications import NotificationPayload
 
     try:
-        payload = NotificationPayload(
+        return _dispatch_broadcast(
             title=title,
             body=body,
             notification_type=PushNotification.NotificationType.COMMUNITY,
             data=data,
+            exclude_user_ids=exclude_user_ids,
         )
-        count = PushNotificationService.send_to_all_users(
-            payload,
-            exclude_users=exclude_user_ids,
-        )
-        logger.info(f"Sent community notification to {count} users: {title}")
-        return count
     except Exception as e:
         logger.error(f"Error sending community notification to all users: {e}")
-        return 0
+        return None
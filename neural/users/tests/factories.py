@@ -0,0 +1,26 @@
+from factory import Faker, Sequence, SubFactory
+from factory.django import DjangoModelFactory
+
+from neural.users.models import Device, User
+
+
+class UserFactory(DjangoModelFactory):
+    username = Sequence(lambda n: f"user{n}")
+    email = Sequence(lambda n: f"user{n}@example.com")
+    phone_number = Sequence(lambda n: f"+57300{n:07d}")
+    first_name = Faker("first_name")
+    last_name = Faker("last_name")
+    is_verified = True
+
+    class Meta:
+        model = User
+
+
+class DeviceFactory(DjangoModelFactory):
+    user = SubFactory(UserFactory)
+    token = Sequence(lambda n: f"ExponentPushToken[{n}]")
+    platform = Device.Platform.IOS
+    device_id = Sequence(lambda n: f"device-{n}")
+
+    class Meta:
+        model = Device
@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from neural.services.membership import MembershipService
+from neural.users.models import UserMembership
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def membership(user):
+    today = timezone.localdate()
+    return UserMembership.objects.create(
+        user=user,
+        init_date=today - timedelta(days=30),
+        expiration_date=today + timedelta(days=1),
+        is_active=True,
+    )
+
+
+def test_saving_a_membership_drops_the_cached_state(user, membership):
+    assert MembershipService.get_state(user.id).expiration_date == (
+        membership.expiration_date
+    )
+
+    membership.expiration_date += timedelta(days=30)
+    membership.save()
+
+    assert MembershipService.get_state(user.id).expiration_date == (
+        membership.expiration_date
+    )
+
+
+def test_expire_drops_the_cached_state(user, membership):
+    assert MembershipService.get_state(user.id) is not None
+
+    user_ids = UserMembership.expire(today=timezone.localdate() + timedelta(days=2))
+
+    assert user_ids == [user.id]
+    assert MembershipService.get_state(user.id) is None
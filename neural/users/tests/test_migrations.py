@@ -0,0 +1,59 @@
+from datetime import date, datetime, time, timezone
+
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+BEFORE = [
+    ("users", "0030_yearreviewsnapshot"),
+    ("training", "0032_unique_user_training_per_slot"),
+]
+AFTER = [("users", "0031_ranking_per_year")]
+
+
+def migrate(targets):
+    executor = MigrationExecutor(connection)
+    executor.loader.build_graph()
+    executor.migrate(targets)
+    return executor.loader.project_state(targets).apps
+
+
+@pytest.fixture
+def old_apps(transactional_db):
+    apps = migrate(BEFORE)
+    yield apps
+    # Back to the latest state for the next tests
+    migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+
+def test_rankings_are_regenerated_for_the_year_of_their_trainings(old_apps):
+    User = old_apps.get_model("users", "User")
+    Ranking = old_apps.get_model("users", "Ranking")
+    Slot = old_apps.get_model("training", "Slot")
+    UserTraining = old_apps.get_model("training", "UserTraining")
+    first, second = (
+        User.objects.create(
+            username=name, email=f"{name}@example.com", phone_number=phone
+        )
+        for name, phone in [("first", "+573009999998"), ("second", "+573009999999")]
+    )
+    for day in (date(2025, 3, 3), date(2025, 3, 4)):
+        slot = Slot.objects.create(date=day, max_places=20)
+        UserTraining.objects.create(user=second, slot=slot, status="DONE")
+    for day, status in [(date(2025, 3, 5), "DONE"), (date(2025, 3, 6), "CANCELLED")]:
+        slot = Slot.objects.create(date=day, max_places=20)
+        UserTraining.objects.create(user=first, slot=slot, status=status)
+    # The ranking of 2025 was generated in January 2026
+    ranking = Ranking.objects.create(user=first, position=1, trainings=3)
+    Ranking.objects.filter(pk=ranking.pk).update(
+        created=datetime.combine(date(2026, 1, 2), time(), tzinfo=timezone.utc)
+    )
+
+    apps = migrate(AFTER)
+
+    Ranking = apps.get_model("users", "Ranking")
+    assert list(
+        Ranking.objects.order_by("position").values_list(
+            "user_id", "year", "position", "trainings"
+        )
+    ) == [(second.id, 2025, 1, 2), (first.id, 2025, 2, 1)]
@@ -0,0 +1,182 @@
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from neural.api.views.notifications import MarkNotificationReadView
+from neural.services.push_notifications import (
+    SCHEDULED_LEASE,
+    NotificationPayload,
+    PushNotificationService,
+)
+from neural.users.models import NotificationCounter, PushNotification
+from neural.users.tests.factories import DeviceFactory
+
+pytestmark = pytest.mark.django_db
+
+BROADCAST_KEY = "broadcast"
+
+
+def expo_ok(messages):
+    tickets = [{"status": "ok", "id": f"receipt-{i}"} for i in range(len(messages))]
+    return tickets, {"data": tickets}, None
+
+
+@pytest.fixture
+def expo():
+    with mock.patch.object(
+        PushNotificationService, "_post_messages", side_effect=expo_ok
+    ) as post:
+        yield post
+
+
+@pytest.fixture
+def payload():
+    return NotificationPayload(title="Hola", body="Nueva clase disponible")
+
+
+def test_broadcast_retry_resends_the_pending_notifications(expo, payload):
+    devices = DeviceFactory.create_batch(3)
+    user_ids = [device.user_id for device in devices]
+    with mock.patch.object(
+        PushNotificationService, "_dispatch", side_effect=TimeoutError
+    ):
+        with pytest.raises(TimeoutError):
+            PushNotificationService.send_bulk(
+                user_ids, payload, broadcast_key=BROADCAST_KEY
+            )
+    sent = PushNotification.objects.get(user_id=user_ids[0])
+    sent.status = PushNotification.Status.SENT
+    sent.save()
+
+    notifications = PushNotificationService.send_bulk(
+        user_ids, payload, broadcast_key=BROADCAST_KEY
+    )
+
+    assert sorted(n.user_id for n in notifications) == user_ids[1:]
+    sent_to = [message["to"] for message in expo.call_args.args[0]]
+    assert sent_to == [device.token for device in devices[1:]]
+    assert PushNotification.objects.filter(broadcast_key=BROADCAST_KEY).count() == 3
+    assert not PushNotification.objects.filter(
+        status=PushNotification.Status.PENDING
+    ).exists()
+
+
+def test_broadcast_retry_fails_pending_users_without_devices(expo, payload):
+    device = DeviceFactory()
+    with mock.patch.object(
+        PushNotificationService, "_dispatch", side_effect=TimeoutError
+    ):
+        with pytest.raises(TimeoutError):
+            PushNotificationService.send_bulk(
+                [device.user_id], payload, broadcast_key=BROADCAST_KEY
+            )
+    device.is_active = False
+    device.save()
+
+    PushNotificationService.send_bulk(
+        [device.user_id], payload, broadcast_key=BROADCAST_KEY
+    )
+
+    notification = PushNotification.objects.get(user_id=device.user_id)
+    assert notification.status == PushNotification.Status.FAILED
+    expo.assert_not_called()
+
+
+def counts(user_id):
+    counter = NotificationCounter.objects.get(user_id=user_id)
+    return counter.total, counter.unread
+
+
+def test_pending_notifications_are_counted(expo, payload):
+    device = DeviceFactory()
+    NotificationCounter.reconcile([device.user_id])
+    with mock.patch.object(
+        PushNotificationService, "_dispatch", side_effect=TimeoutError
+    ):
+        with pytest.raises(TimeoutError):
+            PushNotificationService.send_bulk([device.user_id], payload)
+
+    assert counts(device.user_id) == (1, 1)
+    assert NotificationCounter.reconcile([device.user_id]) == 0
+
+
+def test_failed_notifications_leave_the_counters(payload):
+    device = DeviceFactory()
+    NotificationCounter.reconcile([device.user_id])
+    with mock.patch.object(
+        PushNotificationService,
+        "_post_messages",
+        return_value=(None, None, "Expo is down"),
+    ):
+        (notification,) = PushNotificationService.send_bulk([device.user_id], payload)
+
+    assert notification.status == PushNotification.Status.FAILED
+    assert counts(device.user_id) == (0, 0)
+
+
+def test_scheduled_notifications_are_counted_once_sent(expo, payload):
+    device = DeviceFactory()
+    NotificationCounter.reconcile([device.user_id])
+    PushNotificationService.schedule([device.user_id], payload, timezone.now())
+    assert counts(device.user_id) == (0, 0)
+
+    assert PushNotificationService.send_due() == 1
+
+    assert counts(device.user_id) == (1, 1)
+
+
+def test_read_all_after_a_send_keeps_the_counters_in_sync(expo, payload):
+    device = DeviceFactory()
+    PushNotificationService.send_bulk([device.user_id], payload)
+    request = APIRequestFactory().post("/api/v1/notifications/read-all/")
+    force_authenticate(request, user=device.user)
+
+    response = MarkNotificationReadView.as_view()(request)
+
+    assert response.status_code == 200
+    assert counts(device.user_id) == (1, 0)
+    assert NotificationCounter.reconcile([device.user_id]) == 0
+
+
+def test_mark_as_read_moves_the_counters_once(expo, payload):
+    device = DeviceFactory()
+    (notification,) = PushNotificationService.send_bulk([device.user_id], payload)
+    stale = PushNotification.objects.get(pk=notification.pk)
+
+    notification.mark_as_read()
+    stale.mark_as_read()
+
+    assert PushNotification.objects.get(pk=notification.pk).read_at is not None
+    assert counts(device.user_id) == (1, 0)
+
+
+def test_send_due_reclaims_the_claims_of_a_dead_dispatcher(expo, payload):
+    devices = DeviceFactory.create_batch(2)
+    PushNotificationService.schedule(
+        [device.user_id for device in devices], payload, timezone.now()
+    )
+    with mock.patch.object(
+        PushNotificationService, "send_stored", side_effect=TimeoutError
+    ):
+        with pytest.raises(TimeoutError):
+            PushNotificationService.send_due(batch_size=1)
+    claimed = PushNotification.objects.filter(status=PushNotification.Status.PENDING)
+    assert claimed.count() == 1
+
+    # Still leased, only the unclaimed one is sent
+    assert PushNotificationService.send_due() == 1
+    assert PushNotificationService.scheduled_backlog()["expired"] == 0
+
+    claimed.update(modified=timezone.now() - SCHEDULED_LEASE)
+    assert PushNotificationService.scheduled_backlog()["expired"] == 1
+    assert PushNotificationService.send_due() == 1
+
+    assert set(PushNotification.objects.values_list("status", flat=True)) == {
+        PushNotification.Status.SENT
+    }
+    assert expo.call_count == 2
+    for device in devices:
+        counter = NotificationCounter.objects.get(user_id=device.user_id)
+        assert (counter.total, counter.unread) == (1, 1)
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from neural.services.retention import RetentionService
+from neural.users.models import NotificationCounter, PushNotification
+
+pytestmark = pytest.mark.django_db
+
+
+def notification(user, status, age_days, **kwargs):
+    notification = PushNotification.objects.create(
+        user=user, title="Hola", body="Nueva clase disponible", status=status, **kwargs
+    )
+    # created is set on insert, age it afterwards
+    PushNotification.objects.filter(pk=notification.pk).update(
+        created=timezone.now() - timedelta(days=age_days)
+    )
+    return notification
+
+
+def test_purge_takes_deleted_notifications_out_of_the_counters(user):
+    notification(user, PushNotification.Status.SENT, age_days=400)
+    notification(user, PushNotification.Status.READ, age_days=400)
+    notification(user, PushNotification.Status.SENT, age_days=1)
+    NotificationCounter.reconcile([user.id])
+
+    report = RetentionService.purge()
+
+    assert report["notifications"] == {PushNotification.NotificationType.GENERAL: 2}
+    counter = NotificationCounter.objects.get(user=user)
+    assert (counter.total, counter.unread) == (1, 1)
+
+
+def test_purge_uses_the_status_at_delete_time(user, monkeypatch):
+    expired = notification(user, PushNotification.Status.SENT, age_days=400)
+    kept = notification(user, PushNotification.Status.SENT, age_days=1)
+    NotificationCounter.reconcile([user.id])
+    chunks = RetentionService._chunks
+
+    def read_while_purging(*args, **kwargs):
+        for rows in chunks(*args, **kwargs):
+            PushNotification.objects.get(pk=expired.pk).mark_as_read()
+            yield rows
+
+    monkeypatch.setattr(RetentionService, "_chunks", read_while_purging)
+
+    RetentionService.purge()
+
+    assert list(PushNotification.objects.all()) == [kept]
+    counter = NotificationCounter.objects.get(user=user)
+    assert (counter.total, counter.unread) == (1, 1)
+
+
+def test_purge_keeps_scheduled_notifications(user):
+    scheduled = notification(
+        user,
+        PushNotification.Status.SCHEDULED,
+        age_days=400,
+        scheduled_for=timezone.now() + timedelta(days=1),
+    )
+
+    report = RetentionService.purge()
+
+    assert report["notifications"] == {}
+    assert list(PushNotification.objects.all()) == [scheduled]
+
+
+def test_purge_ages_scheduled_notifications_from_their_due_time(user):
+    kept = notification(
+        user,
+        PushNotification.Status.SENT,
+        age_days=400,
+        scheduled_for=timezone.now() - timedelta(days=1),
+    )
+    notification(
+        user,
+        PushNotification.Status.SENT,
+        age_days=400,
+        scheduled_for=timezone.now() - timedelta(days=300),
+    )
+
+    RetentionService.purge()
+
+    assert list(PushNotification.objects.all()) == [kept]
@@ -4,14 +4,12 @@ import hashlib
 import random
 import string
 
-from datetime import timedelta
+from datetime import date, timedelta
 
 # Django
 from django.contrib.auth import login
 from django.conf import settings
 from django.contrib import messages
-from django.db.models import Sum, Count, Max
-from django.db.models.functions import ExtractMonth, ExtractWeekDay, ExtractHour
 from django.http import HttpResponseRedirect
 from django.utils import timezone
 from django.contrib.auth import views as auth_views
@@ -33,6 +31,10 @@ from neural.users.forms import (
 from neural.training.models import UserTraining
 from neural.users.models import User, NeuralPlan
 
+# Services
+from neural.services.membership import MembershipService
+from neural.services.year_review import YearReviewService
+
 
 class LoginView(auth_views.LoginView):
     """Login view."""
@@ -86,15 +88,13 @@ class IndexView(LoginRequiredMixin, TemplateView):
                 "message": f"Recuerda:  Tu proximo entrenamiento es {training_name} {day_name} a las {hour}",
             }
         # Strike logic
-        week_number = now_date.isocalendar()[1]
-        year = now_date.year
+        year, week_number = now_date.isocalendar()[:2]
         strike = user.strikes.filter(is_current=True).first()
         context["strike"] = strike
         stats = user.stats.filter(year=year, week=week_number).first()
         context["stats"] = stats
         # Membership
-        membership = user.memberships.filter(is_active=True).first()
-        context["membership"] = membership
+        context["membership"] = MembershipService.get_state(user.id)
         return context
 
 
@@ -234,35 +234,20 @@ class YearInReviewView(LoginRequiredMixin, TemplateView):
         user = self.request.user
         year = self.kwargs.get("year", timezone.localdate().year)
 
-        # Basic aggregated stats from UserStats
-        yearly_stats = user.stats.filter(year=year).aggregate(
-            total_trainings=Sum("trainings"),
-            total_calories=Sum("calories"),
-            total_hours=Sum("hours"),
-            active_weeks=Count("id"),
-        )
+        snapshot = YearReviewService.get_snapshot(user, year)
+        data = snapshot.data
 
         context["year"] = year
-        context["total_trainings"] = yearly_stats["total_trainings"] or 0
-        context["total_calories"] = yearly_stats["total_calories"] or 0
-        context["total_hours"] = yearly_stats["total_hours"] or 0
-        context["active_weeks"] = yearly_stats["active_weeks"] or 0
-
-        # Get all confirmed trainings for the year
-        user_trainings = UserTraining.objects.filter(
-            user=user,
-            slot__date__year=year,
-            status__in=[UserTraining.Status.CONFIRMED, UserTraining.Status.DONE],
-        ).select_related("slot__class_training__training_type")
+        context["year_review_computed_at"] = snapshot.computed_at
+        context["year_review_is_stale"] = snapshot.is_stale
+
+        # Basic aggregated stats from UserStats
+        context["total_trainings"] = data["stats"]["trainings"]
+        context["total_calories"] = data["stats"]["calories"]
+        context["total_hours"] = data["stats"]["hours"]
+        context["active_weeks"] = data["stats"]["active_weeks"]
 
         # Monthly breakdown for chart
-        monthly_data = (
-            user_trainings.annotate(month=ExtractMonth("slot__date"))
-            .values("month")
-            .annotate(count=Count("id"))
-            .order_by("month")
-        )
-        months_dict = {m["month"]: m["count"] for m in monthly_data}
         month_names = [
             "Ene",
             "Feb",
@@ -277,72 +262,50 @@ class YearInReviewView(LoginRequiredMixin, TemplateView):
             "Nov",
             "Dic",
         ]
+        monthly_data = data["monthly"]
         context["monthly_labels"] = month_names
-        context["monthly_data"] = [months_dict.get(i, 0) for i in range(1, 13)]
+        context["monthly_data"] = monthly_data
 
         # Best month
-        if months_dict:
-            best_month_num = max(months_dict, key=months_dict.get)
-            context["best_month"] = month_names[best_month_num - 1]
-            context["best_month_trainings"] = months_dict[best_month_num]
+        if data["total_trainings"]:
+            best_month_idx = monthly_data.index(max(monthly_data))
+            context["best_month"] = month_names[best_month_idx]
+            context["best_month_trainings"] = monthly_data[best_month_idx]
         else:
             context["best_month"] = None
             context["best_month_trainings"] = 0
 
         # Favorite training type
-        training_types = (
-            user_trainings.values("slot__class_training__training_type__name")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
-        if training_types:
-            context["favorite_training_type"] = training_types[0][
-                "slot__class_training__training_type__name"
-            ]
-            context["favorite_training_count"] = training_types[0]["count"]
-        else:
-            context["favorite_training_type"] = None
-            context["favorite_training_count"] = 0
+        context["favorite_training_type"] = data["favorite_type"]["name"]
+        context["favorite_training_count"] = data["favorite_type"]["count"]
+
+        # Weekday distribution for chart, Sunday first
+        weekday_data = data["weekday"][6:] + data["weekday"][:6]
+        context["weekday_labels"] = ["Dom", "Lun", "Mar", "Mié", "Jue", "Vie", "Sáb"]
+        context["weekday_data"] = weekday_data
 
         # Favorite day of week
-        day_names = {
-            1: "Domingo",
-            2: "Lunes",
-            3: "Martes",
-            4: "Miércoles",
-            5: "Jueves",
-            6: "Viernes",
-            7: "Sábado",
-        }
-        weekday_data = (
-            user_trainings.annotate(weekday=ExtractWeekDay("slot__date"))
-            .values("weekday")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
-        if weekday_data:
-            favorite_day_num = weekday_data[0]["weekday"]
-            context["favorite_day"] = day_names.get(favorite_day_num, "")
-            context["favorite_day_count"] = weekday_data[0]["count"]
+        day_names = [
+            "Domingo",
+            "Lunes",
+            "Martes",
+            "Miércoles",
+            "Jueves",
+            "Viernes",
+            "Sábado",
+        ]
+        if data["total_trainings"]:
+            favorite_day_idx = weekday_data.index(max(weekday_data))
+            context["favorite_day"] = day_names[favorite_day_idx]
+            context["favorite_day_count"] = weekday_data[favorite_day_idx]
         else:
             context["favorite_day"] = None
             context["favorite_day_count"] = 0
 
-        # Weekday distribution for chart
-        weekday_labels = ["Dom", "Lun", "Mar", "Mié", "Jue", "Vie", "Sáb"]
-        weekday_dict = {w["weekday"]: w["count"] for w in weekday_data}
-        context["weekday_labels"] = weekday_labels
-        context["weekday_data"] = [weekday_dict.get(i, 0) for i in range(1, 8)]
-
         # Favorite time slot
-        time_data = (
-            user_trainings.annotate(hour=ExtractHour("slot__class_training__hour_init"))
-            .values("hour")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
-        if time_data:
-            favorite_hour = time_data[0]["hour"]
+        hourly = data["hourly"]
+        if any(hourly):
+            favorite_hour = hourly.index(max(hourly))
             if favorite_hour < 12:
                 context["favorite_time"] = "Mañana"
                 context["favorite_time_emoji"] = "🌅"
@@ -352,26 +315,19 @@ class YearInReviewView(LoginRequiredMixin, TemplateView):
             else:
                 context["favorite_time"] = "Noche"
                 context["favorite_time_emoji"] = "🌙"
-            context["favorite_time_count"] = time_data[0]["count"]
+            context["favorite_time_count"] = hourly[favorite_hour]
         else:
             context["favorite_time"] = None
             context["favorite_time_emoji"] = ""
             context["favorite_time_count"] = 0
 
-        # Best streak
-        best_strike = user.strikes.aggregate(max_weeks=Max("weeks"))
-        context["best_streak"] = best_strike["max_weeks"] or 0
-
-        # Current streak
-        current_strike = user.strikes.filter(is_current=True).first()
-        context["current_streak"] = current_strike.weeks if current_strike else 0
+        # Streaks
+        context["best_streak"] = data["streaks"]["best"]
+        context["current_streak"] = data["streaks"]["current"]
 
         # Ranking
-        ranking = user.rankings.first()
-        context["ranking_position"] = ranking.position if ranking else None
-        context["ranking_total"] = User.objects.filter(
-            is_verified=True, is_client=True
-        ).count()
+        context["ranking_position"] = data["ranking"]["position"]
+        context["ranking_total"] = data["ranking"]["total_users"]
 
         # Fun metrics
         # Average trainings per week
@@ -390,10 +346,9 @@ class YearInReviewView(LoginRequiredMixin, TemplateView):
         )  # ~2600 cal per marathon
 
         # Days since first training
-        first_training = user_trainings.order_by("slot__date").first()
-        if first_training:
-            days_as_member = (timezone.localdate() - first_training.slot.date).days
-            context["days_as_member"] = days_as_member
+        if data["first_training"]:
+            first_training = date.fromisoformat(data["first_training"])
+            context["days_as_member"] = (timezone.localdate() - first_training).days
         else:
             context["days_as_member"] = 0
 
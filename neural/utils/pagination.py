@@ -0,0 +1,76 @@
+"""Keyset pagination utilities."""
+
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+
+
+class InvalidCursor(ValueError):
+    """The pagination cursor could not be decoded."""
+
+
+def encode_cursor(obj) -> str:
+    """Build the opaque cursor pointing right after ``obj``."""
+    raw = f"{obj.created.isoformat()}|{obj.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor into its ``(created, id)`` key."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created, pk = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created), int(pk)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(cursor) from e
+
+
+def keyset_paginate(
+    queryset: QuerySet,
+    page_size: int,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    offset: int = 0,
+) -> Tuple[List, Optional[str]]:
+    """
+    Paginate a queryset on ``(created, id)``.
+
+    Rows are read from the position the cursor points to instead of
+    skipping ``OFFSET`` rows, so deep pages stay cheap and new rows do
+    not shift the pages that follow. ``offset`` is only kept for the
+    legacy page parameter and is ignored when a cursor is given.
+
+    Args:
+        queryset: The rows to paginate
+        page_size: Number of rows per page
+        cursor: Cursor returned with the previous page
+        descending: Newest rows first when True
+        offset: Rows to skip when no cursor is given
+
+    Returns:
+        Tuple of (rows, next cursor or None on the last page)
+
+    Raises:
+        InvalidCursor: If the cursor can not be decoded
+    """
+    if descending:
+        queryset = queryset.order_by("-created", "-id")
+    else:
+        queryset = queryset.order_by("created", "id")
+
+    if cursor:
+        created, pk = decode_cursor(cursor)
+        if descending:
+            after = Q(created__lt=created) | Q(created=created, id__lt=pk)
+        else:
+            after = Q(created__gt=created) | Q(created=created, id__gt=pk)
+        rows = list(queryset.filter(after)[: page_size + 1])
+    else:
+        rows = list(queryset[offset : offset + page_size + 1])
+
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, encode_cursor(rows[-1])
+    return rows, None